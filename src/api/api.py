@@ -1,17 +1,59 @@
+import asyncio
+import hashlib
+import json
+import os
 from pathlib import Path
 
-import joblib
+import numpy as np
 import pandas as pd
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, FastAPI, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
+from src.api import columnar
+from src.api.inference import (
+    DEFAULT_WORKERS,
+    InferenceExecutor,
+    InferenceInputError,
+    InferenceOverloaded,
+    InferenceUnavailable,
+    RequestCoalescer,
+)
+from src.api.request_log import RequestLogWriter
+from src.model import neighbors
+from src.model.calibration import CALIBRATION_PATH, CalibrationTable
+from src.model.registry import ModelRegistry, ModelRouter, load_model, parse_routes
+from src.model.score_table import ScoreTable
+from src.monitoring.drift import DriftMonitor, load_reference
+from src.monitoring.profiler import (
+    DEFAULT_INTERVAL,
+    MAX_DURATION,
+    MAX_FILES,
+    PROFILE_DIR,
+    ProfilerBusy,
+    SamplingProfiler,
+)
 from src.processing.preprocessing import preprocess
 
+# scikit-learn só é importado quando o modelo é carregado no startup
+
 tags_metadata = [
     {
         "name": "Predição",
         "description": "Endpoints para realizar predições de sobrevivência.",
     },
+    {
+        "name": "Modelos",
+        "description": "Versões do registro de modelos e roteamento entre elas.",
+    },
+    {
+        "name": "Monitoramento",
+        "description": "Endpoints de observabilidade do tráfego de produção.",
+    },
+    {
+        "name": "Administração",
+        "description": "Ferramentas de diagnóstico, como o profiler por amostragem (habilitadas com `TITANIC_ENABLE_PROFILER=1`).",
+    },
     {
         "name": "Geral",
         "description": "Endpoints gerais da API.",
@@ -35,8 +77,74 @@ API para prever a probabilidade de sobrevivência de um passageiro no Titanic. 
     },
 )
 
-model_path = Path("models/logreg_titanic.joblib")
+# "joblib" carrega o Pipeline completo; "compact" carrega o formato compacto via
+# memory-map, compartilhado entre os workers e sem depender do scikit-learn.
+model_format = os.environ.get("TITANIC_MODEL_FORMAT", "joblib")
+model_path = Path(
+    "models/logreg_titanic.compact"
+    if model_format == "compact"
+    else "models/logreg_titanic.joblib"
+)
 model = None
+# Identificador do artefato carregado; permite que clientes invalidem seus caches
+# quando o modelo é re-treinado.
+model_version = None
+
+# Registro de modelos versionados (ver src/model/registry.py). Se houver versões,
+# o modelo padrão é TITANIC_MODEL_VERSION ("latest" por padrão) em vez de
+# `model_path`. TITANIC_MODEL_ROUTES ("v3=90,v4=10") divide as requisições sem
+# `?model=` entre versões e TITANIC_SHADOW_MODELS ("v5") lista as versões
+# avaliadas em modo sombra, fora do caminho da resposta.
+registry = ModelRegistry(os.environ.get("TITANIC_REGISTRY_DIR", "models/registry"))
+default_model_name = os.environ.get("TITANIC_MODEL_VERSION", "latest")
+router = ModelRouter()
+# Referências às tarefas sombra em andamento (evita que sejam coletadas)
+_shadow_tasks = set()
+# Limiar de decisão e calibração por versão (as versões são imutáveis)
+_version_settings = {}
+
+# Artefatos derivados do modelo: escores pré-computados de passageiros conhecidos
+# (src/model/score_table.py), índice de vizinhos (src/model/neighbors.py) e
+# referência de drift (src/monitoring/drift.py). Versões do registro usam os
+# arquivos do próprio diretório; o modelo fora do registro, os caminhos abaixo.
+score_table_path = Path("models/score_table.npy")
+threshold_path = Path("models/decision_threshold.json")
+neighbor_index_path = Path("models/knn_index.joblib")
+drift_reference_path = Path("models/drift_reference.json")
+# Tabelas de escores e índices de vizinhos já abertos, por versão
+_score_tables = {}
+_neighbor_indexes = {}
+drift_monitor = None
+
+# Log assíncrono dos passageiros avaliados, usado para re-treinar com tráfego real
+request_log = RequestLogWriter("data/requests")
+
+# Inferência de todos os endpoints de predição fora do event loop. Com
+# TITANIC_INFERENCE_WORKERS processos no pool (0 usa threads no processo da API);
+# acima de TITANIC_MAX_PENDING predições em andamento a API responde 429.
+# /predict/sweep, /predict/similar e o lote colunar usam o threadpool sob o mesmo
+# limite.
+inference = InferenceExecutor(
+    workers=int(os.environ.get("TITANIC_INFERENCE_WORKERS", DEFAULT_WORKERS)),
+    max_pending=int(os.environ.get("TITANIC_MAX_PENDING", "64")),
+    timeout=float(os.environ.get("TITANIC_INFERENCE_TIMEOUT", "10")),
+    max_resident=int(os.environ.get("TITANIC_MAX_RESIDENT_MODELS", "3")),
+)
+# Segundos sugeridos no cabeçalho Retry-After das respostas 429/503
+retry_after = os.environ.get("TITANIC_RETRY_AFTER", "1")
+# Tamanho máximo do lote colunar (corpo em bytes e linhas); acima disso, 413
+max_columnar_bytes = int(os.environ.get("TITANIC_MAX_COLUMNAR_BYTES", 32 * 2**20))
+max_columnar_rows = int(os.environ.get("TITANIC_MAX_COLUMNAR_ROWS", "100000"))
+# Predições idênticas simultâneas em /predict compartilham uma única inferência
+coalescer = RequestCoalescer()
+# Profiler por amostragem. As rotas /admin/profile, que gravam arquivos no
+# servidor, só existem com TITANIC_ENABLE_PROFILER=1; TITANIC_PROFILE=<segundos>
+# captura um perfil a partir da inicialização.
+profiler_enabled = os.environ.get("TITANIC_ENABLE_PROFILER", "0") == "1"
+profiler = SamplingProfiler(
+    os.environ.get("TITANIC_PROFILE_DIR", PROFILE_DIR),
+    max_files=int(os.environ.get("TITANIC_PROFILE_MAX_FILES", MAX_FILES)),
+)
 
 
 # --- Modelos Pydantic ---
@@ -73,15 +181,119 @@ class PredictionResponse(BaseModel):
     survival_probability: float = Field(
         ..., example=0.87, description="Probabilidade de sobrevivência (0.0 a 1.0)"
     )
+    model_version: str | None = Field(
+        None, example="v3", description="Versão do modelo que respondeu"
+    )
+    survival_prediction: bool | None = Field(
+        None,
+        example=True,
+        description="Sobrevivência prevista com o limiar de decisão do modelo",
+    )
+    decision_threshold: float | None = Field(
+        None, example=0.42, description="Limiar de decisão escolhido no treino"
+    )
+
+
+class BatchPredictionResponse(BaseModel):
+    survival_probabilities: list[float] = Field(
+        ...,
+        example=[0.87, 0.12],
+        description="Probabilidades de sobrevivência, na mesma ordem da requisição",
+    )
+    model_version: str | None = Field(
+        None, example="v3", description="Versão do modelo que respondeu"
+    )
+    survival_predictions: list[bool] | None = Field(
+        None,
+        example=[True, False],
+        description="Sobrevivência prevista com o limiar de decisão do modelo",
+    )
+    decision_threshold: float | None = Field(
+        None, example=0.42, description="Limiar de decisão escolhido no treino"
+    )
+
+
+class SimilarPassenger(BaseModel):
+    passenger_id: int | None = Field(
+        None, example=42, description="PassengerId no conjunto de treino"
+    )
+    distance: float = Field(
+        ..., description="Distância no espaço de features do modelo"
+    )
+    survived: int = Field(..., example=1, description="Desfecho real (1 = sobreviveu)")
+    passenger: Passenger
+
+
+class SimilarPassengersResponse(BaseModel):
+    survival_probability: float = Field(
+        ..., example=0.87, description="Probabilidade de sobrevivência (0.0 a 1.0)"
+    )
+    neighbors: list[SimilarPassenger] = Field(
+        ..., description="Passageiros de treino mais semelhantes, do mais próximo"
+    )
+    model_version: str | None = Field(
+        None, example="v3", description="Versão do modelo que respondeu"
+    )
+
+
+class SweepRequest(BaseModel):
+    passenger: Passenger = Field(
+        ..., description="Passageiro base; Age e Fare são substituídos pela grade"
+    )
+    age_min: float = Field(0.0, ge=0, description="Idade mínima da grade")
+    age_max: float = Field(80.0, ge=0, description="Idade máxima da grade")
+    age_steps: int = Field(100, ge=2, le=500, description="Número de pontos de idade")
+    fare_min: float = Field(0.0, ge=0, description="Tarifa mínima da grade")
+    fare_max: float = Field(300.0, ge=0, description="Tarifa máxima da grade")
+    fare_steps: int = Field(100, ge=2, le=500, description="Número de pontos de tarifa")
+
+
+class SweepResponse(BaseModel):
+    ages: list[float] = Field(..., description="Valores de idade da grade (linhas)")
+    fares: list[float] = Field(..., description="Valores de tarifa da grade (colunas)")
+    survival_probabilities: list[list[float]] = Field(
+        ...,
+        description="Matriz len(ages) x len(fares) de probabilidades de sobrevivência",
+    )
+    model_version: str | None = Field(
+        None, example="v3", description="Versão do modelo que respondeu"
+    )
 
 
 # --- Eventos da API ---
 @app.on_event("startup")
 async def startup_event():
     """Carrega o modelo durante a inicialização da API."""
-    global model
+    global model, model_path, model_version, drift_monitor, router
+    if os.environ.get("TITANIC_PROFILE"):
+        profiler.start(duration=float(os.environ["TITANIC_PROFILE"]))
+    request_log.start()
+
+    registered = None
+    try:
+        registered = registry.resolve(default_model_name)
+    except KeyError:
+        if registry.versions():
+            print(
+                f"AVISO: Versão '{default_model_name}' não encontrada no registro. Usando '{model_path}'."
+            )
+    if registered is not None:
+        model_path = registry.artifact_path(registered, model_format)
+    router = _build_router()
+
     if model_path.exists():
-        model = joblib.load(model_path)
+        model = load_model(model_path, model_format)
+        model_version = (
+            registered or hashlib.sha256(model_path.read_bytes()).hexdigest()[:12]
+        )
+        inference.start(model_path)
+        # O tráfego é comparado com os dados de treino do modelo padrão
+        reference = load_reference(
+            _version_file(model_version, "drift_reference", drift_reference_path)
+        )
+        if reference is not None:
+            drift_monitor = DriftMonitor(reference)
+        _neighbor_index(model_version)
     else:
         # A API pode rodar, mas o endpoint de predição retornará erro.
         print(
@@ -89,13 +301,247 @@ async def startup_event():
         )
 
 
+def _build_router() -> ModelRouter:
+    """Monta o roteador a partir das variáveis de ambiente, ignorando versões inexistentes."""
+    resolved = {}
+    routes = parse_routes(os.environ.get("TITANIC_MODEL_ROUTES", ""))
+    shadow = parse_routes(os.environ.get("TITANIC_SHADOW_MODELS", ""))
+    for name in [*routes, *shadow]:
+        try:
+            resolved[name] = registry.resolve(name)
+        except KeyError:
+            print(f"AVISO: Versão '{name}' não encontrada no registro; ignorada.")
+    return ModelRouter(
+        routes={resolved[n]: w for n, w in routes.items() if n in resolved},
+        shadow=[resolved[n] for n in shadow if n in resolved],
+    )
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Grava as entradas pendentes do log de requisições e encerra o pool."""
+    request_log.stop()
+    inference.stop()
+    profiler.stop()
+
+
 # --- Endpoints da API ---
 @app.get("/", tags=["Geral"], summary="Endpoint de Boas-Vindas")
 def read_root():
     """
     Retorna uma mensagem de boas-vindas. Útil para verificar se a API está online.
     """
-    return {"message": "Bem-vindo à API de Predição de Sobrevivência do Titanic"}
+    return {
+        "message": "Bem-vindo à API de Predição de Sobrevivência do Titanic",
+        "model_version": model_version,
+    }
+
+
+def _ensure_model():
+    """Interrompe a requisição com 503 se o modelo não estiver carregado."""
+    if model is None:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Modelo não disponível. Verifique se o arquivo '{model_path}' existe.",
+        )
+
+
+def _select_version(requested: str | None) -> str:
+    """Versão que responde à requisição: a pedida em `?model=`, a sorteada pelas
+    rotas ou a padrão (aceita em `?model=` mesmo fora do registro)."""
+    if requested is None:
+        return router.choose() or model_version
+    if requested == model_version:
+        return model_version
+    try:
+        return registry.resolve(requested)
+    except KeyError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Modelo '{requested}' não encontrado no registro.",
+        )
+
+
+def _artifact(version: str):
+    """Artefato da versão; None para o modelo padrão, já carregado."""
+    if version == model_version:
+        return None
+    return registry.artifact_path(version, model_format)
+
+
+def _model(version: str):
+    """
+    Modelo da versão no processo da API, para os endpoints que o chamam
+    diretamente (sem o executor de inferência).
+    """
+    path = _artifact(version)
+    if path is None:
+        return model
+    try:
+        return inference.load_model(path)
+    except OSError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Não foi possível carregar o modelo '{version}': {e}",
+        )
+
+
+def _version_file(version: str, artifact: str, fallback: Path) -> Path:
+    """
+    Arquivo de um artefato derivado (`artifact` = 'score_table', 'neighbor_index'
+    ou 'drift_reference') da versão; `fallback` para o modelo fora do registro
+    ou quando nenhum modelo foi carregado (`version` None).
+    """
+    if version is None:
+        return fallback
+    path = getattr(registry, f"{artifact}_path")(version)
+    return path if path.parent.is_dir() else fallback
+
+
+def _score_table(version: str) -> ScoreTable:
+    if version not in _score_tables:
+        _score_tables[version] = ScoreTable(
+            _version_file(version, "score_table", score_table_path)
+        )
+    return _score_tables[version]
+
+
+def _neighbor_index(version: str) -> dict | None:
+    """Índice de vizinhos construído com o modelo da versão (None se ausente)."""
+    if version not in _neighbor_indexes:
+        _neighbor_indexes[version] = neighbors.load_index(
+            _version_file(version, "neighbor_index", neighbor_index_path)
+        )
+    return _neighbor_indexes[version]
+
+
+def _settings(version: str) -> tuple:
+    """
+    Limiar de decisão (0.5 se ausente) e calibração (ou None) salvos com o
+    modelo no treino.
+    """
+    if version not in _version_settings:
+        try:
+            metadata = None if version is None else registry.metadata(version)
+        except FileNotFoundError:
+            metadata = None
+        if metadata is None:
+            # Modelo fora do registro ou nenhum modelo carregado
+            metadata = _unregistered_metadata()
+            calibrator = CalibrationTable.load(CALIBRATION_PATH)
+        else:
+            calibrator = CalibrationTable.load(registry.calibration_path(version))
+        _version_settings[version] = (
+            metadata.get("decision_threshold", 0.5),
+            calibrator,
+        )
+    return _version_settings[version]
+
+
+def _unregistered_metadata() -> dict:
+    """
+    Limiar do modelo fora do registro: o JSON salvo pelo treino ao lado do
+    artefato ou, sem ele, o cabeçalho do formato compacto.
+    """
+    try:
+        with open(threshold_path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return getattr(model, "metadata", {})
+
+
+def _decision_threshold(version: str) -> float:
+    return _settings(version)[0]
+
+
+def _calibrate(version: str, probs):
+    """Aplica a tabela de calibração da versão, se houver, a um array."""
+    calibrator = _settings(version)[1]
+    return probs if calibrator is None else calibrator.apply(probs)
+
+
+async def _run_inference(records: list[dict], version: str) -> list[float]:
+    probs = await _bounded(inference.run(records, model, model_path=_artifact(version)))
+    calibrator = _settings(version)[1]
+    return probs if calibrator is None else calibrator.apply(probs).tolist()
+
+
+async def _bounded(inference_call):
+    """Aguarda uma chamada do executor convertendo sobrecarga em 429 e falhas em 503."""
+    try:
+        return await inference_call
+    except InferenceOverloaded as e:
+        raise HTTPException(
+            status_code=429,
+            detail=f"API sobrecarregada: {e}",
+            headers={"Retry-After": retry_after},
+        )
+    except InferenceUnavailable as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Inferência indisponível: {e}",
+            headers={"Retry-After": retry_after},
+        )
+    except InferenceInputError as e:
+        raise HTTPException(
+            status_code=422, detail=f"Não foi possível avaliar os passageiros: {e}"
+        )
+
+
+def _schedule_shadow(records: list[dict], probs: list[float], served: str):
+    """Agenda a avaliação das versões sombra sem aguardar o resultado."""
+    for version in router.shadow:
+        if version != served:
+            task = asyncio.create_task(_shadow_score(version, records, probs, served))
+            _shadow_tasks.add(task)
+            task.add_done_callback(_shadow_tasks.discard)
+
+
+async def _shadow_score(
+    version: str, records: list[dict], primary: list[float], served: str
+):
+    stats = router.shadow_stats[version]
+    try:
+        # Usa no máximo metade da fila, para não causar 429 no tráfego real
+        probs = await inference.run(
+            records,
+            model,
+            model_path=_artifact(version),
+            limit=inference.max_pending // 2,
+        )
+    except (InferenceOverloaded, InferenceUnavailable):
+        stats["dropped"] += 1
+        return
+    except Exception:
+        stats["errors"] += 1
+        return
+    threshold, calibrator = _settings(version)
+    if calibrator is not None:
+        probs = calibrator.apply(probs).tolist()
+    # Cada versão decide com o próprio limiar, como faria ao responder
+    router.record_shadow(
+        version, primary, probs, _decision_threshold(served), threshold
+    )
+
+
+def _coalescing_key(record: dict, version: str) -> str:
+    """Hash canônico do passageiro validado e da versão do modelo."""
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{version}:{canonical}".encode()).hexdigest()
+
+
+async def _predict_one(record: dict, version: str) -> list[float]:
+    probs = await _run_inference([record], version)
+    _schedule_shadow([record], probs, version)
+    return probs
+
+
+# Parâmetro `?model=` dos endpoints de predição
+ModelQuery = Query(
+    None,
+    alias="model",
+    description="Versão do registro (ex.: 'v3' ou 'latest'). Se omitida, usa a divisão configurada ou o modelo padrão.",
+)
 
 
 @app.post(
@@ -111,24 +557,437 @@ def read_root():
                 "application/json": {"example": {"survival_probability": 0.87}}
             },
         },
-        503: {"description": "Modelo não disponível"},
+        404: {"description": "Versão do modelo não encontrada"},
+        429: {"description": "Fila de inferência cheia (ver Retry-After)"},
+        503: {"description": "Modelo ou inferência não disponível"},
     },
 )
-def predict(passenger: Passenger) -> PredictionResponse:
+async def predict(
+    passenger: Passenger, model_name: str | None = ModelQuery
+) -> PredictionResponse:
     """
     Realiza a predição de sobrevivência para um único passageiro.
 
     - **passenger**: um objeto com os dados do passageiro.
+    - **model**: versão do modelo (opcional).
     """
-    if model is None:
+    _ensure_model()
+    version = _select_version(model_name)
+    record = passenger.dict()
+    if drift_monitor is not None:
+        drift_monitor.update(record)
+
+    probs = await coalescer.run(
+        _coalescing_key(record, version), lambda: _predict_one(record, version)
+    )
+    request_log.log(record, probs[0], version)
+    threshold = _decision_threshold(version)
+    return PredictionResponse(
+        survival_probability=probs[0],
+        model_version=version,
+        survival_prediction=probs[0] >= threshold,
+        decision_threshold=threshold,
+    )
+
+
+@app.post(
+    "/predict/batch",
+    response_model=BatchPredictionResponse,
+    tags=["Predição"],
+    summary="Prevê a probabilidade de sobrevivência de vários passageiros",
+    description="Recebe uma lista de passageiros e retorna as probabilidades em uma única chamada ao modelo.",
+    responses={
+        200: {
+            "description": "Predição bem-sucedida",
+            "content": {
+                "application/json": {
+                    "example": {"survival_probabilities": [0.87, 0.12]}
+                }
+            },
+        },
+        404: {"description": "Versão do modelo não encontrada"},
+        429: {"description": "Fila de inferência cheia (ver Retry-After)"},
+        503: {"description": "Modelo ou inferência não disponível"},
+    },
+)
+async def predict_batch(
+    passengers: list[Passenger], model_name: str | None = ModelQuery
+) -> BatchPredictionResponse:
+    """
+    Realiza a predição de sobrevivência para vários passageiros de uma vez.
+
+    - **passengers**: lista de objetos com os dados dos passageiros.
+    - **model**: versão do modelo (opcional).
+    """
+    _ensure_model()
+    version = _select_version(model_name)
+    if not passengers:
+        return BatchPredictionResponse(survival_probabilities=[], model_version=version)
+
+    records = [p.dict() for p in passengers]
+    if drift_monitor is not None:
+        for record in records:
+            drift_monitor.update(record)
+
+    probs = await _run_inference(records, version)
+    for record, prob in zip(records, probs):
+        request_log.log(record, prob, version)
+    _schedule_shadow(records, probs, version)
+    threshold = _decision_threshold(version)
+    return BatchPredictionResponse(
+        survival_probabilities=probs,
+        model_version=version,
+        survival_predictions=[prob >= threshold for prob in probs],
+        decision_threshold=threshold,
+    )
+
+
+@app.post(
+    "/predict/sweep",
+    response_model=SweepResponse,
+    tags=["Predição"],
+    summary="Sensibilidade da sobrevivência a Idade × Tarifa",
+    description="Avalia o passageiro base em uma grade de idades e tarifas com uma única chamada vetorizada ao modelo.",
+    responses={
+        404: {"description": "Versão do modelo não encontrada"},
+        422: {"description": "Intervalos da grade inválidos"},
+        429: {"description": "Fila de inferência cheia (ver Retry-After)"},
+        503: {"description": "Modelo ou inferência não disponível"},
+    },
+)
+async def predict_sweep(
+    request: SweepRequest, model_name: str | None = ModelQuery
+) -> SweepResponse:
+    """
+    Gera a grade Idade × Tarifa para o passageiro informado e retorna a matriz de
+    probabilidades de sobrevivência.
+
+    - **request**: passageiro base e limites/resolução da grade.
+    - **model**: versão do modelo (opcional).
+    """
+    _ensure_model()
+    version = _select_version(model_name)
+    if request.age_max < request.age_min or request.fare_max < request.fare_min:
         raise HTTPException(
-            status_code=503,
-            detail=f"Modelo não disponível. Verifique se o arquivo '{model_path}' existe.",
+            status_code=422, detail="Os valores máximos devem ser >= aos mínimos."
         )
 
-    df = pd.DataFrame([passenger.dict()])
+    ages = np.linspace(request.age_min, request.age_max, request.age_steps)
+    fares = np.linspace(request.fare_min, request.fare_max, request.fare_steps)
+    probs = await _bounded(inference.call(_score_sweep, request, ages, fares, version))
+    return SweepResponse(
+        ages=ages.tolist(),
+        fares=fares.tolist(),
+        survival_probabilities=probs.tolist(),
+        model_version=version,
+    )
+
+
+def _score_sweep(request: SweepRequest, ages, fares, version: str) -> np.ndarray:
+    age_grid, fare_grid = np.meshgrid(ages, fares, indexing="ij")
+
+    # Replica o passageiro base para todos os pontos e substitui as colunas da grade
+    df = pd.DataFrame(request.passenger.dict(), index=range(age_grid.size))
+    df["Age"] = age_grid.ravel()
+    df["Fare"] = fare_grid.ravel()
     df_processed = preprocess(df)
 
-    # [:, 1] para obter a probabilidade da classe positiva (sobreviveu)
-    prob = model.predict_proba(df_processed)[0, 1]
-    return PredictionResponse(survival_probability=prob)
+    probs = _calibrate(version, _model(version).predict_proba(df_processed)[:, 1])
+    return probs.reshape(age_grid.shape)
+
+
+@app.get(
+    "/models",
+    tags=["Modelos"],
+    summary="Versões registradas e roteamento",
+    description="Lista as versões do registro com seus metadados (perfil de treino, métricas e schema de features), a versão padrão, os modelos residentes em memória, a divisão canário e as estatísticas dos modelos sombra.",
+)
+def list_models():
+    """
+    Retorna o estado do registro e do roteamento de modelos.
+    """
+    return {
+        "default": model_version,
+        "versions": [registry.metadata(v) for v in registry.versions()],
+        "resident": inference.resident_models(),
+        **router.stats(),
+    }
+
+
+@app.get(
+    "/monitoring/drift",
+    tags=["Monitoramento"],
+    summary="Drift das entradas em relação ao treino",
+    description="Compara os resumos do tráfego recebido em /predict com os resumos de referência salvos no treinamento (PSI e KS por campo).",
+    responses={503: {"description": "Referência de drift não disponível"}},
+)
+def drift_report():
+    """
+    Retorna os escores de drift de cada campo do `Passenger`.
+    """
+    if drift_monitor is None:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Referência de drift não disponível para o modelo '{model_version}'.",
+        )
+    return drift_monitor.report()
+
+
+@app.get(
+    "/monitoring/request-log",
+    tags=["Monitoramento"],
+    summary="Estado do log de requisições",
+    description="Contadores do gravador em segundo plano: entradas enfileiradas, descartadas por sobrecarga, linhas e arquivos gravados.",
+)
+def request_log_stats():
+    """
+    Retorna os contadores do log de requisições.
+    """
+    return request_log.stats()
+
+
+@app.get(
+    "/monitoring/inference",
+    tags=["Monitoramento"],
+    summary="Estado da fila de inferência",
+    description="Contadores do executor de inferência: predições enviadas, concluídas, rejeitadas por sobrecarga (429), expiradas e reinícios do pool de processos, e das requisições idênticas de /predict agrupadas em uma única inferência.",
+)
+def inference_stats():
+    """
+    Retorna os contadores do executor de inferência e do agrupamento de
+    requisições.
+    """
+    return {**inference.stats(), "coalescing": coalescer.stats()}
+
+
+admin_router = APIRouter(prefix="/admin", tags=["Administração"])
+
+
+@admin_router.get(
+    "/profile",
+    summary="Estado do profiler",
+    description="Indica se há uma captura em andamento e onde a última foi gravada.",
+)
+def profile_status():
+    """
+    Retorna o estado da captura atual e da última concluída.
+    """
+    return profiler.status()
+
+
+@admin_router.post(
+    "/profile",
+    summary="Inicia uma captura de perfil",
+    description="Amostra as pilhas das threads da API durante `duration` segundos e grava as pilhas no formato collapsed (flamegraph) no servidor.",
+    responses={409: {"description": "Já existe uma captura em andamento"}},
+)
+def start_profile(
+    duration: float = Query(30.0, gt=0, le=MAX_DURATION),
+    interval: float = Query(DEFAULT_INTERVAL, ge=0.001, le=1.0),
+):
+    """
+    Inicia uma captura limitada no tempo; ela termina sozinha ao fim de
+    `duration` ou com `DELETE /admin/profile`.
+    """
+    try:
+        return profiler.start(duration=duration, interval=interval)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@admin_router.delete(
+    "/profile",
+    summary="Encerra a captura de perfil",
+    description="Interrompe a captura em andamento, grava as pilhas e retorna o caminho do arquivo.",
+)
+def stop_profile():
+    """
+    Encerra a captura em andamento e retorna o resultado da última captura.
+    """
+    return {"last": profiler.stop()}
+
+
+if profiler_enabled:
+    app.include_router(admin_router)
+
+
+def _score_columnar(body: bytes, media_type: str, version: str) -> bytes:
+    try:
+        df = columnar.to_frame(columnar.read_payload(body, media_type))
+    except columnar.ColumnarPayloadError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if len(df) > max_columnar_rows:
+        raise HTTPException(
+            status_code=413,
+            detail=f"O lote tem {len(df)} linhas (máximo {max_columnar_rows}).",
+        )
+
+    if drift_monitor is not None:
+        drift_monitor.update_many(df)
+    columns = {name: df[name].to_numpy() for name in df.columns}
+
+    probs = _calibrate(version, _model(version).predict_proba(preprocess(df))[:, 1])
+    request_log.log_batch(columns, probs, version)
+    return columnar.write_probabilities(probs, media_type)
+
+
+def _payload_too_large() -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail=f"O corpo excede {max_columnar_bytes} bytes.",
+    )
+
+
+@app.post(
+    "/predict/batch/columnar",
+    tags=["Predição"],
+    summary="Predição em lote com payload binário colunar",
+    description=(
+        "Recebe um array por campo do passageiro, em `.npz` (`application/x-npz`) "
+        "ou Arrow IPC (`application/vnd.apache.arrow.stream` / `.file`), e retorna "
+        "a coluna `survival_probability` no mesmo formato. A validação é feita por "
+        "coluna, sem criar objetos por passageiro. O corpo e o número de linhas "
+        "são limitados por TITANIC_MAX_COLUMNAR_BYTES e TITANIC_MAX_COLUMNAR_ROWS."
+    ),
+    responses={
+        200: {
+            "description": "Predição bem-sucedida",
+            "content": {media_type: {} for media_type in columnar.MEDIA_TYPES},
+            "headers": {
+                "X-Model-Version": {"description": "Versão do modelo que respondeu"}
+            },
+        },
+        404: {"description": "Versão do modelo não encontrada"},
+        413: {"description": "Lote acima do tamanho máximo"},
+        415: {"description": "Formato de payload não suportado"},
+        422: {"description": "Payload inválido"},
+        429: {"description": "Fila de inferência cheia (ver Retry-After)"},
+        503: {"description": "Modelo ou inferência não disponível"},
+    },
+)
+async def predict_batch_columnar(
+    request: Request, model_name: str | None = ModelQuery
+) -> Response:
+    """
+    Realiza a predição de sobrevivência para um lote em formato colunar.
+
+    - **model**: versão do modelo (opcional).
+    """
+    _ensure_model()
+    version = _select_version(model_name)
+    media_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if media_type not in columnar.MEDIA_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Content-Type deve ser um de {columnar.MEDIA_TYPES}.",
+        )
+
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > max_columnar_bytes:
+        raise _payload_too_large()
+    body = await request.body()
+    if len(body) > max_columnar_bytes:
+        raise _payload_too_large()
+    content = await _bounded(inference.call(_score_columnar, body, media_type, version))
+    return Response(
+        content=content, media_type=media_type, headers={"X-Model-Version": version}
+    )
+
+
+@app.get(
+    "/predict/{passenger_id}",
+    response_model=PredictionResponse,
+    tags=["Predição"],
+    summary="Probabilidade pré-computada de um passageiro conhecido",
+    description="Consulta a tabela de escores materializada após o treino, sem pré-processamento nem chamada ao modelo.",
+    responses={
+        404: {
+            "description": "Passageiro não encontrado na tabela de escores ou versão do modelo não encontrada"
+        },
+        503: {"description": "Tabela de escores não disponível"},
+    },
+)
+def predict_by_id(
+    passenger_id: int, model_name: str | None = ModelQuery
+) -> PredictionResponse:
+    """
+    Retorna a probabilidade de sobrevivência pré-computada.
+
+    - **passenger_id**: PassengerId do dataset materializado.
+    - **model**: versão do modelo (opcional).
+    """
+    version = _select_version(model_name)
+    score_table = _score_table(version)
+    if not score_table.available:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Tabela de escores não disponível. Verifique se o arquivo '{score_table.path}' existe.",
+        )
+    prob = score_table.lookup(passenger_id)
+    if prob is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Passageiro {passenger_id} não encontrado na tabela de escores.",
+        )
+    threshold = _decision_threshold(version)
+    return PredictionResponse(
+        survival_probability=prob,
+        model_version=version,
+        survival_prediction=prob >= threshold,
+        decision_threshold=threshold,
+    )
+
+
+@app.post(
+    "/predict/similar",
+    response_model=list[SimilarPassengersResponse],
+    tags=["Predição"],
+    summary="Probabilidade e passageiros de treino semelhantes",
+    description="Para cada passageiro, retorna a probabilidade de sobrevivência e os k passageiros de treino mais próximos no espaço de features do modelo, com seus desfechos.",
+    responses={
+        404: {"description": "Versão do modelo não encontrada"},
+        429: {"description": "Fila de inferência cheia (ver Retry-After)"},
+        503: {"description": "Modelo, inferência ou índice de vizinhos não disponível"},
+    },
+)
+async def predict_similar(
+    passengers: list[Passenger],
+    k: int = Query(5, ge=1, le=50, description="Número de vizinhos por passageiro"),
+    model_name: str | None = ModelQuery,
+) -> list[SimilarPassengersResponse]:
+    """
+    Busca, em lote, os passageiros de treino mais semelhantes.
+
+    - **passengers**: lista de objetos com os dados dos passageiros.
+    - **k**: número de vizinhos por passageiro.
+    - **model**: versão do modelo (opcional).
+    """
+    _ensure_model()
+    version = _select_version(model_name)
+    # A primeira consulta da versão lê o índice do disco
+    neighbor_index = await run_in_threadpool(_neighbor_index, version)
+    if neighbor_index is None:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Índice de vizinhos não disponível para o modelo '{version}'.",
+        )
+    if not passengers:
+        return []
+
+    records = [p.dict() for p in passengers]
+    probs, similar = await _bounded(
+        inference.call(_score_similar, records, neighbor_index, k, version)
+    )
+    return [
+        SimilarPassengersResponse(
+            survival_probability=prob, neighbors=found, model_version=version
+        )
+        for prob, found in zip(probs, similar)
+    ]
+
+
+def _score_similar(records: list[dict], neighbor_index: dict, k: int, version: str):
+    version_model = _model(version)
+    df_processed = preprocess(pd.DataFrame(records))
+    probs = _calibrate(version, version_model.predict_proba(df_processed)[:, 1])
+    return probs, neighbors.query(neighbor_index, version_model, df_processed, k=k)
@@ -0,0 +1,144 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+NPZ_MEDIA_TYPE = "application/x-npz"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+ARROW_FILE_MEDIA_TYPE = "application/vnd.apache.arrow.file"
+MEDIA_TYPES = [NPZ_MEDIA_TYPE, ARROW_STREAM_MEDIA_TYPE, ARROW_FILE_MEDIA_TYPE]
+
+# Mesmos campos e obrigatoriedade do modelo `Passenger`
+PASSENGER_FIELDS = ["Pclass", "Sex", "Age", "SibSp", "Parch", "Fare", "Embarked"]
+INT_FIELDS = ["Pclass", "SibSp", "Parch"]
+FLOAT_FIELDS = ["Age", "Fare"]
+STR_FIELDS = ["Sex", "Embarked"]
+REQUIRED_FIELDS = ["Pclass", "Sex", "SibSp", "Parch"]
+
+
+class ColumnarPayloadError(ValueError):
+    """Payload colunar malformado ou com tipos inválidos."""
+
+
+def read_payload(body: bytes, media_type: str) -> dict:
+    """
+    Decodifica o corpo da requisição em um dicionário campo -> array NumPy.
+
+    Parâmetros:
+    body (bytes): Corpo bruto da requisição.
+    media_type (str): Um dos tipos em `MEDIA_TYPES`.
+
+    Retorna:
+    dict: Um array por campo presente no payload.
+    """
+    if media_type not in MEDIA_TYPES:
+        raise ColumnarPayloadError(
+            f"Formato '{media_type}' não suportado; use um de {MEDIA_TYPES}."
+        )
+    try:
+        if media_type == NPZ_MEDIA_TYPE:
+            # allow_pickle=False: arrays de objetos não são aceitos
+            with np.load(io.BytesIO(body), allow_pickle=False) as npz:
+                return {name: npz[name] for name in npz.files}
+        return _read_arrow(body, media_type)
+    except ColumnarPayloadError:
+        raise
+    except Exception as e:
+        raise ColumnarPayloadError(f"Não foi possível decodificar o payload: {e}")
+
+
+def _read_arrow(body: bytes, media_type: str) -> dict:
+    import pyarrow as pa
+
+    source = pa.BufferReader(body)
+    if media_type == ARROW_STREAM_MEDIA_TYPE:
+        table = pa.ipc.open_stream(source).read_all()
+    else:
+        table = pa.ipc.open_file(source).read_all()
+
+    columns = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if name in INT_FIELDS and column.null_count:
+            raise ColumnarPayloadError(f"Coluna '{name}' não aceita valores nulos.")
+        # Strings viram arrays de objetos com None nos nulos; numéricos, NaN
+        columns[name] = column.to_numpy()
+    return columns
+
+
+def to_frame(columns: dict) -> pd.DataFrame:
+    """
+    Valida as colunas de forma vetorizada e monta o DataFrame de entrada do modelo.
+
+    Campos opcionais ausentes são preenchidos com nulos; em arrays `.npz`, strings
+    vazias em `Embarked` representam valores ausentes.
+
+    Retorna:
+    pd.DataFrame: Colunas na ordem do `Passenger`.
+    """
+    missing = [f for f in REQUIRED_FIELDS if f not in columns]
+    if missing:
+        raise ColumnarPayloadError(f"Campos obrigatórios ausentes: {missing}")
+
+    arrays = {name: np.asarray(columns[name]) for name in columns}
+    unknown = set(arrays) - set(PASSENGER_FIELDS)
+    if unknown:
+        raise ColumnarPayloadError(f"Campos desconhecidos: {sorted(unknown)}")
+    lengths = {a.shape for a in arrays.values()}
+    if len(lengths) != 1 or len(next(iter(lengths))) != 1:
+        raise ColumnarPayloadError("Todas as colunas devem ser 1-D e do mesmo tamanho.")
+    n = len(arrays["Pclass"])
+    if n == 0:
+        raise ColumnarPayloadError("O payload não contém linhas.")
+
+    data = {}
+    for field in INT_FIELDS:
+        values = arrays[field]
+        if values.dtype.kind not in "iu":
+            raise ColumnarPayloadError(f"Coluna '{field}' deve ser inteira.")
+        data[field] = values.astype(np.int64, copy=False)
+
+    for field in FLOAT_FIELDS:
+        values = arrays.get(field)
+        if values is None:
+            data[field] = np.full(n, np.nan)
+        elif values.dtype.kind not in "iuf":
+            raise ColumnarPayloadError(f"Coluna '{field}' deve ser numérica.")
+        else:
+            data[field] = values.astype(np.float64, copy=False)
+
+    for field in STR_FIELDS:
+        values = arrays.get(field)
+        if values is None:
+            data[field] = np.full(n, None, dtype=object)
+            continue
+        if values.dtype.kind == "U":
+            values = np.where(values == "", None, values.astype(object))
+        elif values.dtype.kind != "O":
+            raise ColumnarPayloadError(f"Coluna '{field}' deve ser texto.")
+        data[field] = values
+
+    if pd.isna(data["Sex"]).any():
+        raise ColumnarPayloadError("Coluna 'Sex' não aceita valores ausentes.")
+
+    return pd.DataFrame({f: data[f] for f in PASSENGER_FIELDS})
+
+
+def write_probabilities(probabilities: np.ndarray, media_type: str) -> bytes:
+    """Serializa as probabilidades no mesmo formato binário da requisição."""
+    probabilities = np.asarray(probabilities, dtype=np.float64)
+    buffer = io.BytesIO()
+    if media_type == NPZ_MEDIA_TYPE:
+        np.savez(buffer, survival_probability=probabilities)
+        return buffer.getvalue()
+
+    import pyarrow as pa
+
+    table = pa.table({"survival_probability": probabilities})
+    if media_type == ARROW_STREAM_MEDIA_TYPE:
+        writer = pa.ipc.new_stream(buffer, table.schema)
+    else:
+        writer = pa.ipc.new_file(buffer, table.schema)
+    with writer:
+        writer.write_table(table)
+    return buffer.getvalue()
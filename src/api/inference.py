@@ -0,0 +1,295 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.model.registry import ModelCache
+
+# Modelos carregados no processo: o padrão (carregado pelo `_init_worker` nos
+# processos do pool) e as demais versões do registro, com descarte LRU
+_models = ModelCache()
+_default_model_path = None
+
+# Poucos processos bastam para tirar a inferência do GIL da API sem multiplicar
+# a memória dos modelos carregados
+DEFAULT_WORKERS = min(2, os.cpu_count() or 1)
+
+
+class InferenceOverloaded(Exception):
+    """A fila de inferência está cheia; a requisição deve ser rejeitada (429)."""
+
+
+class InferenceUnavailable(Exception):
+    """A inferência não concluiu a tempo ou o pool falhou (503)."""
+
+
+class InferenceInputError(Exception):
+    """Os passageiros não puderam ser pré-processados ou avaliados (422)."""
+
+
+def _init_worker(model_path, max_resident):
+    global _default_model_path
+    _models.capacity = max_resident
+    _default_model_path = model_path
+    _models.get(model_path)
+
+
+def _warm_up():
+    return _default_model_path is not None
+
+
+def score_records(records: list[dict], model=None, model_path=None) -> list[float]:
+    """
+    Pré-processa os passageiros e retorna as probabilidades de sobrevivência.
+
+    Sem `model`, usa o artefato `model_path` (ou o modelo padrão do processo do
+    pool), carregado sob demanda no cache de modelos residentes.
+    """
+    import pandas as pd
+
+    from src.processing.preprocessing import preprocess
+
+    if model is None:
+        model = _models.get(model_path or _default_model_path)
+    df_processed = preprocess(pd.DataFrame(records))
+    # [:, 1] para obter a probabilidade da classe positiva (sobreviveu)
+    return model.predict_proba(df_processed)[:, 1].tolist()
+
+
+class InferenceExecutor:
+    """
+    Executa a inferência fora do event loop com concorrência limitada.
+
+    Com `workers` > 0 (padrão: `DEFAULT_WORKERS`), o pré-processamento e o
+    `predict_proba` rodam em um `ProcessPoolExecutor` cujos processos carregam o
+    modelo na inicialização, evitando a disputa pelo GIL. Com `workers` = 0,
+    rodam no threadpool padrão do event loop usando o modelo do processo da API.
+
+    Além do modelo padrão, cada processo mantém até `max_resident` versões do
+    registro (src/model/registry.py) carregadas sob demanda, com descarte LRU.
+
+    `call` executa no threadpool, sob os mesmos limites, a inferência dos
+    endpoints que chamam o modelo diretamente.
+
+    No máximo `max_pending` requisições ficam em execução ou aguardando um worker;
+    acima disso `run` falha imediatamente com `InferenceOverloaded`. Requisições que
+    não concluem em `timeout` segundos falham com `InferenceUnavailable` (o
+    trabalho já enviado continua ocupando a fila até terminar), assim como as que
+    encontram o pool quebrado (reiniciado em seguida) ou um modelo que não pôde
+    ser lido. Erros do pré-processamento ou do modelo com os dados recebidos
+    falham com `InferenceInputError`.
+
+    Parâmetros:
+    workers (int): Processos do pool (0 para usar threads).
+    max_pending (int): Limite de requisições em execução ou na fila.
+    timeout (float): Tempo máximo, em segundos, de espera por uma predição.
+    max_resident (int): Modelos mantidos em memória por processo.
+    """
+
+    def __init__(
+        self, workers=DEFAULT_WORKERS, max_pending=64, timeout=10.0, max_resident=3
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.max_resident = max_resident
+        self._executor = None
+        self._model_args = None
+        self._pending = 0
+        self.counters = {
+            "submitted": 0,
+            "completed": 0,
+            "rejected": 0,
+            "timed_out": 0,
+            "failed": 0,
+            "pool_restarts": 0,
+        }
+
+    def start(self, model_path):
+        """Cria o pool de processos (se `workers` > 0) para o modelo padrão."""
+        global _default_model_path
+        self._model_args = (str(model_path), self.max_resident)
+        _default_model_path = str(model_path)
+        _models.capacity = self.max_resident
+        if self.workers > 0 and self._executor is None:
+            self._executor = self._new_pool()
+
+    def stop(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _new_pool(self):
+        # "spawn" evita herdar, via fork, as threads da API (ex.: o log de requisições)
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=self._model_args,
+        )
+        # Os processos são criados sob demanda; uma tarefa vazia por worker faz
+        # com que carreguem o modelo antes da primeira requisição
+        for _ in range(self.workers):
+            pool.submit(_warm_up)
+        return pool
+
+    async def run(
+        self, records: list[dict], model=None, model_path=None, limit=None
+    ) -> list[float]:
+        """
+        Calcula as probabilidades de `records` sem bloquear o event loop.
+
+        Parâmetros:
+        records (list[dict]): Passageiros já validados.
+        model: Modelo usado no modo com threads (ignorado com o pool).
+        model_path (str, opcional): Artefato de outra versão do registro; se
+        omitido, usa o modelo padrão.
+        limit (int, opcional): Limite de predições em andamento abaixo de
+        `max_pending`, para trabalho de menor prioridade (ex.: modelos sombra).
+
+        Retorna:
+        list[float]: Probabilidades de sobrevivência, na ordem de `records`.
+        """
+        self._admit(limit)
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        model_path = None if model_path is None else str(model_path)
+        if executor is not None:
+            future = loop.run_in_executor(
+                executor, score_records, records, None, model_path
+            )
+        else:
+            if model_path is not None:
+                model = None
+            future = loop.run_in_executor(
+                None, score_records, records, model, model_path
+            )
+        return await self._wait(future, executor)
+
+    async def call(self, func, *args, limit=None):
+        """
+        Executa `func(*args)` no threadpool do processo da API sob o mesmo limite
+        de `max_pending`, o mesmo `timeout` e os mesmos erros de `run`.
+
+        Para os endpoints que chamam o modelo diretamente, com objetos que não
+        podem ir ao pool de processos (grade de sensibilidade, payload colunar,
+        índice de vizinhos).
+
+        Parâmetros:
+        func (callable): Função síncrona que faz a inferência.
+        limit (int, opcional): Limite de predições em andamento, como em `run`.
+
+        Retorna:
+        O valor de `func(*args)`.
+        """
+        self._admit(limit)
+        future = asyncio.get_running_loop().run_in_executor(None, func, *args)
+        return await self._wait(future, None)
+
+    def _admit(self, limit):
+        limit = self.max_pending if limit is None else min(limit, self.max_pending)
+        if self._pending >= limit:
+            self.counters["rejected"] += 1
+            raise InferenceOverloaded(
+                f"{self._pending} predições em andamento (limite {limit})."
+            )
+
+    async def _wait(self, future, executor):
+        self._pending += 1
+        self.counters["submitted"] += 1
+        future.add_done_callback(self._release)
+
+        try:
+            # `shield` mantém o future vivo após o timeout para liberar a vaga
+            # somente quando o worker realmente terminar
+            result = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except TimeoutError:
+            self.counters["timed_out"] += 1
+            raise InferenceUnavailable(f"A predição não concluiu em {self.timeout:g}s.")
+        except BrokenProcessPool:
+            self.counters["failed"] += 1
+            self._restart_pool(executor)
+            raise InferenceUnavailable("O pool de inferência foi reiniciado.")
+        except OSError as e:
+            # Artefato da versão ausente ou ilegível
+            self.counters["failed"] += 1
+            raise InferenceUnavailable(f"Não foi possível carregar o modelo: {e}")
+        except (ValueError, TypeError, KeyError) as e:
+            self.counters["failed"] += 1
+            raise InferenceInputError(str(e))
+        self.counters["completed"] += 1
+        return result
+
+    def _release(self, future):
+        self._pending -= 1
+        if not future.cancelled():
+            # Evita o aviso de exceção não lida quando o cliente já desistiu
+            future.exception()
+
+    def _restart_pool(self, broken):
+        # Várias requisições podem falhar com o mesmo pool; reinicia apenas uma vez
+        if broken is not None and broken is self._executor:
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._new_pool()
+            self.counters["pool_restarts"] += 1
+
+    def load_model(self, model_path):
+        """
+        Modelo de outra versão no processo da API, para os endpoints que chamam
+        o modelo diretamente; usa o mesmo cache LRU do modo com threads.
+        """
+        return _models.get(str(model_path))
+
+    def resident_models(self) -> list[str]:
+        """Artefatos carregados no processo da API (modo com threads)."""
+        return _models.resident()
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "pending": self._pending,
+            "max_pending": self.max_pending,
+            "workers": self.workers,
+        }
+
+
+class RequestCoalescer:
+    """
+    Agrupa requisições idênticas em andamento em uma única computação.
+
+    A primeira requisição de uma chave inicia a computação como uma task; as que
+    chegam com a mesma chave antes dela terminar aguardam a mesma task e recebem
+    o mesmo resultado (ou a mesma exceção). Ao terminar, a chave é liberada: não
+    é um cache de resultados, apenas evita a corrida de misses idênticos.
+
+    A task é protegida com `asyncio.shield`, de modo que o cancelamento de uma
+    requisição não cancela a computação das demais.
+    """
+
+    def __init__(self):
+        self._in_flight = {}
+        self.counters = {"requests": 0, "computed": 0, "coalesced": 0}
+
+    async def run(self, key, compute):
+        """
+        Retorna o resultado de `compute()` para `key`, compartilhando a
+        computação com as requisições idênticas em andamento.
+
+        Parâmetros:
+        key (str): Chave canônica da requisição.
+        compute (callable): Função assíncrona sem argumentos.
+        """
+        self.counters["requests"] += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.counters["computed"] += 1
+            task = asyncio.ensure_future(compute())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.counters["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {**self.counters, "in_flight": len(self._in_flight)}
@@ -0,0 +1,201 @@
+import asyncio
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# Um nível só é considerado ganho de capacidade se aumentar o throughput em 5%
+SATURATION_GAIN = 0.05
+SERVER_LOG_PATH = "reports/bench-api-server.log"
+
+
+def _payloads(n: int, seed: int = 7) -> list[dict]:
+    from src.data.synthetic import synthetic_payloads
+
+    # Inclui passageiros com campos ausentes (None), como no tráfego real; seus
+    # erros são reportados à parte em `incomplete_error_rate`.
+    return synthetic_payloads(n, seed=seed)
+
+
+def _is_incomplete(body) -> bool:
+    passengers = body if isinstance(body, list) else [body]
+    return any(None in passenger.values() for passenger in passengers)
+
+
+async def _client_loop(client, path, bodies, deadline, samples):
+    i = 0
+    while time.perf_counter() < deadline:
+        body, incomplete = bodies[i % len(bodies)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            status = (await client.post(path, json=body)).status_code
+        except Exception as e:
+            status = type(e).__name__
+        samples.append((time.perf_counter() - start, incomplete, status))
+
+
+async def run_level(
+    base_url: str,
+    concurrency: int,
+    duration: float = 5.0,
+    batch_size: int = 1,
+    payloads: list[dict] | None = None,
+) -> dict:
+    """
+    Dispara `concurrency` clientes assíncronos contra a API durante `duration`
+    segundos.
+
+    Com `batch_size` 1 usa `/predict`; acima disso, `/predict/batch` com
+    `batch_size` passageiros por requisição.
+
+    O throughput e as latências contam apenas as respostas 200: respostas 429
+    rápidas durante a saturação não inflam o throughput nem reduzem os
+    percentis. Os erros são reportados à parte, por status.
+
+    Retorna:
+    dict: Requisições, erros (total, por status e por segundo), throughput das
+    respostas 200 (req/s e passageiros/s), suas latências p50/p95/p99 em ms e a
+    taxa de erro das requisições com campos ausentes.
+    """
+    import httpx
+    import numpy as np
+
+    payloads = payloads or _payloads(1000)
+    if batch_size == 1:
+        path, bodies = "/predict", payloads
+    else:
+        path = "/predict/batch"
+        bodies = [
+            payloads[i : i + batch_size]
+            for i in range(0, len(payloads) - batch_size + 1, batch_size)
+        ]
+    bodies = [(body, _is_incomplete(body)) for body in bodies]
+
+    samples = []
+    limits = httpx.Limits(
+        max_connections=concurrency, max_keepalive_connections=concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=30
+    ) as client:
+        deadline = time.perf_counter() + duration
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _client_loop(client, path, bodies, deadline, samples)
+                for _ in range(concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - started
+
+    requests = len(samples)
+    latencies = [t for t, _, status in samples if status == 200]
+    errors = [(flag, status) for _, flag, status in samples if status != 200]
+    incomplete = sum(flag for _, flag, _ in samples)
+    incomplete_errors = sum(flag for flag, _ in errors)
+    p50, p95, p99 = (
+        np.percentile(latencies, [50, 95, 99]) * 1000 if latencies else (0, 0, 0)
+    )
+    return {
+        "concurrency": concurrency,
+        "batch_size": batch_size,
+        "requests": requests,
+        "errors": len(errors),
+        "error_rate": len(errors) / requests if requests else 0.0,
+        "errors_by_status": dict(Counter(str(status) for _, status in errors)),
+        "errors_per_s": len(errors) / elapsed,
+        "incomplete_requests": incomplete,
+        "incomplete_errors": incomplete_errors,
+        "incomplete_error_rate": incomplete_errors / incomplete if incomplete else 0.0,
+        "throughput_rps": len(latencies) / elapsed,
+        "passengers_per_s": len(latencies) * batch_size / elapsed,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+    }
+
+
+def sweep(
+    base_url: str,
+    levels: list[int],
+    duration: float = 5.0,
+    batch_size: int = 1,
+) -> tuple[list[dict], int | None]:
+    """
+    Executa `run_level` para cada nível de concorrência e encontra a saturação.
+
+    O ponto de saturação é o último nível que ainda aumentou o throughput em pelo
+    menos `SATURATION_GAIN` em relação ao melhor nível anterior; a partir dele, mais
+    clientes só aumentam a latência.
+
+    Retorna:
+    tuple: (resultados por nível, concorrência de saturação ou None se o
+    throughput continuou crescendo até o último nível).
+    """
+    payloads = _payloads(1000)
+    results, best, saturation = [], 0.0, None
+    for level in levels:
+        result = asyncio.run(run_level(base_url, level, duration, batch_size, payloads))
+        results.append(result)
+        if result["throughput_rps"] >= best * (1 + SATURATION_GAIN):
+            best = result["throughput_rps"]
+            saturation = None
+        elif saturation is None:
+            saturation = results[-2]["concurrency"]
+    return results, saturation
+
+
+def start_local_api(
+    host: str = "127.0.0.1",
+    port: int = 8001,
+    workers: int = 1,
+    log_path=SERVER_LOG_PATH,
+):
+    """
+    Sobe a API com uvicorn em segundo plano e aguarda o health check.
+
+    A saída de erro do servidor vai para `log_path`, e não para um pipe que
+    ninguém lê (o que bloquearia o servidor quando o buffer enchesse).
+
+    Retorna:
+    subprocess.Popen: Processo do servidor (encerre com `terminate`).
+    """
+    import httpx
+
+    log_path = Path(log_path)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_path, "wb") as log:
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "uvicorn",
+                "src.api.api:app",
+                "--host",
+                host,
+                "--port",
+                str(port),
+                "--workers",
+                str(workers),
+                "--log-level",
+                "warning",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=log,
+        )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(log_path.read_text(errors="replace"))
+        try:
+            if httpx.get(f"http://{host}:{port}/", timeout=1).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(
+        f"A API não respondeu ao health check em 60s (log em {log_path})."
+    )
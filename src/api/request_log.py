@@ -0,0 +1,248 @@
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+PASSENGER_FIELDS = ["Pclass", "Sex", "Age", "SibSp", "Parch", "Fare", "Embarked"]
+
+
+class RequestLogWriter:
+    """
+    Registra os passageiros avaliados pela API em arquivos Parquet, sem bloquear
+    o caminho da requisição.
+
+    `log` apenas enfileira a entrada em uma fila limitada; uma thread em segundo
+    plano esvazia a fila periodicamente e acrescenta as linhas, como um novo row
+    group, ao arquivo aberto da partição (data e hora no formato Hive,
+    `date=AAAA-MM-DD/hour=HH/part-*.parquet`). O arquivo é fechado e publicado
+    quando passa de `max_file_bytes`, quando fica aberto por mais de
+    `max_file_age` segundos, quando a hora da partição termina ou no `stop`. Se a
+    fila estiver cheia, a entrada é descartada e contabilizada em `dropped`.
+
+    O diretório pode ser lido diretamente com `pd.read_parquet(root)`; arquivos
+    ainda abertos têm nome iniciado por "_" e são ignorados pelos leitores.
+
+    Parâmetros:
+    root (str | Path): Diretório raiz do log.
+    flush_interval (float): Intervalo, em segundos, entre gravações.
+    max_file_bytes (int): Tamanho a partir do qual o arquivo é fechado.
+    max_file_age (float): Tempo máximo, em segundos, de um arquivo aberto.
+    max_queue (int): Capacidade da fila em memória.
+    """
+
+    def __init__(
+        self,
+        root="data/requests",
+        flush_interval=5.0,
+        max_file_bytes=64 * 1024 * 1024,
+        max_file_age=300.0,
+        max_queue=100_000,
+    ):
+        self.root = Path(root)
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.max_file_age = max_file_age
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = None
+        # Protege os contadores, atualizados pelas threads das requisições
+        self._lock = threading.Lock()
+        self._seq = 0
+        # Arquivo aberto por partição; usado só pela thread de gravação
+        self._files = {}
+        self.counters = {
+            "enqueued": 0,
+            "dropped": 0,
+            "written_rows": 0,
+            "files_written": 0,
+            "write_errors": 0,
+        }
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="request-log-writer", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Encerra a thread, grava o que ainda estiver na fila e fecha os arquivos."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._flush()
+        for key in list(self._files):
+            self._close(key)
+
+    def log(self, record: dict, probability: float, model_version=None):
+        """Enfileira um passageiro avaliado. Nunca bloqueia."""
+        self._put((time.time(), record, float(probability), model_version), 1)
+
+    def log_batch(self, columns: dict, probabilities, model_version=None):
+        """
+        Enfileira um lote colunar (um array por campo do `Passenger`) como uma
+        única entrada, sem criar objetos por linha.
+        """
+        entry = (time.time(), columns, probabilities, model_version)
+        self._put(entry, len(probabilities))
+
+    def _put(self, entry, rows: int):
+        try:
+            self._queue.put_nowait(entry)
+            counter = "enqueued"
+        except queue.Full:
+            counter = "dropped"
+        with self._lock:
+            self.counters[counter] += rows
+
+    def _count(self, counter: str, value=1):
+        with self._lock:
+            self.counters[counter] += value
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            **counters,
+            "queued": self._queue.qsize(),
+            "open_files": len(self._files),
+        }
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self._flush()
+
+    def _drain(self) -> list:
+        entries = []
+        while True:
+            try:
+                entries.append(self._queue.get_nowait())
+            except queue.Empty:
+                return entries
+
+    def _flush(self):
+        entries = self._drain()
+
+        # Agrupa por partição (hora UTC) para que cada arquivo caia em uma só pasta
+        partitions = {}
+        for entry in entries:
+            hour = datetime.fromtimestamp(entry[0], tz=timezone.utc)
+            partitions.setdefault(hour.strftime("%Y-%m-%d/%H"), []).append(entry)
+
+        for key, group in partitions.items():
+            try:
+                table = _to_table(group)
+                self._append(key, table, group[0][0])
+                self._count("written_rows", table.num_rows)
+            except Exception as e:
+                self._count("write_errors")
+                print(f"AVISO: Falha ao gravar o log de requisições: {e}")
+
+        # Fecha arquivos grandes, antigos ou de horas que já terminaram
+        now = time.monotonic()
+        current = datetime.now(timezone.utc).strftime("%Y-%m-%d/%H")
+        for key, file in list(self._files.items()):
+            if (
+                file["bytes"] >= self.max_file_bytes
+                or now - file["opened_at"] >= self.max_file_age
+                or (key < current and key not in partitions)
+            ):
+                self._close(key)
+
+    def _append(self, key: str, table, timestamp: float):
+        import pyarrow.parquet as pq
+
+        file = self._files.get(key)
+        if file is None:
+            date, hour = key.split("/")
+            directory = self.root / f"date={date}" / f"hour={hour}"
+            directory.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                self._seq += 1
+                seq = self._seq
+            name = f"part-{int(timestamp * 1000)}-{os.getpid()}-{seq:06d}.parquet"
+            # Arquivos iniciados por "_" são ignorados pelos leitores de datasets;
+            # o rename atômico no fechamento publica o arquivo completo.
+            tmp_path = directory / f"_{name}.tmp"
+            file = {
+                "writer": pq.ParquetWriter(tmp_path, _schema()),
+                "tmp_path": tmp_path,
+                "path": directory / name,
+                "opened_at": time.monotonic(),
+                "bytes": 0,
+            }
+            self._files[key] = file
+
+        file["writer"].write_table(table)
+        file["bytes"] = file["tmp_path"].stat().st_size
+
+    def _close(self, key: str):
+        file = self._files.pop(key)
+        try:
+            file["writer"].close()
+            os.replace(file["tmp_path"], file["path"])
+            self._count("files_written")
+        except Exception as e:
+            self._count("write_errors")
+            print(f"AVISO: Falha ao fechar o arquivo do log de requisições: {e}")
+
+
+def _schema():
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("timestamp", pa.float64()),
+            ("Pclass", pa.int64()),
+            ("Sex", pa.string()),
+            ("Age", pa.float64()),
+            ("SibSp", pa.int64()),
+            ("Parch", pa.int64()),
+            ("Fare", pa.float64()),
+            ("Embarked", pa.string()),
+            ("survival_probability", pa.float64()),
+            ("model_version", pa.string()),
+        ]
+    )
+
+
+def _to_table(entries: list):
+    """Converte entradas individuais e lotes colunares em uma única tabela Arrow."""
+    import numpy as np
+    import pyarrow as pa
+
+    schema = _schema()
+    singles = [e for e in entries if not _is_batch(e)]
+    tables = []
+    if singles:
+        columns = {
+            "timestamp": [e[0] for e in singles],
+            **{f: [e[1].get(f) for e in singles] for f in PASSENGER_FIELDS},
+            "survival_probability": [e[2] for e in singles],
+            "model_version": [e[3] for e in singles],
+        }
+        tables.append(pa.Table.from_pydict(columns, schema=schema))
+
+    for timestamp, batch, probabilities, model_version in filter(_is_batch, entries):
+        n = len(probabilities)
+        columns = {
+            "timestamp": np.full(n, timestamp),
+            # from_pandas=True trata NaN como nulo nas colunas de texto
+            **{
+                f: pa.array(batch[f], type=schema.field(f).type, from_pandas=True)
+                for f in PASSENGER_FIELDS
+            },
+            "survival_probability": np.asarray(probabilities, dtype=float),
+            "model_version": pa.repeat(pa.scalar(model_version, pa.string()), n),
+        }
+        tables.append(pa.Table.from_pydict(columns, schema=schema))
+
+    return pa.concat_tables(tables)
+
+
+def _is_batch(entry) -> bool:
+    # Entradas de lote carregam arrays por campo; as individuais, escalares
+    return not isinstance(entry[2], float)
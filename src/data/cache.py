@@ -0,0 +1,154 @@
+# src/data/cache.py
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "titanic-insights" / "datasets"
+
+
+class ChecksumMismatch(Exception):
+    """O arquivo obtido não corresponde ao checksum registrado."""
+
+
+def file_digest(path) -> str:
+    """SHA-256 (hexadecimal) do conteúdo do arquivo."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _copy_atomic(source: Path, target: Path):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.tmp")
+    shutil.copyfile(source, tmp)
+    os.replace(tmp, target)
+
+
+class DatasetCache:
+    """
+    Cache local de datasets endereçado por conteúdo.
+
+    Cada arquivo é guardado uma única vez em `<root>/sha256/<ab>/<digest>` e o
+    `index.json` associa '<dataset>/<arquivo>' ao SHA-256 registrado na primeira
+    obtenção. A partir daí o checksum funciona como pino: cópias locais, objetos
+    do cache e novos downloads são sempre verificados contra ele.
+
+    Com `mirror`, os arquivos ausentes são copiados de `<mirror>/<dataset>/<arquivo>`
+    em vez de baixados, para ambientes sem acesso à internet.
+
+    Parâmetros:
+    root (str | Path, opcional): Diretório do cache. Padrão: TITANIC_DATA_CACHE ou
+    ~/.cache/titanic-insights/datasets.
+    mirror (str | Path, opcional): Diretório espelho. Padrão: TITANIC_DATA_MIRROR.
+    """
+
+    def __init__(self, root=None, mirror=None):
+        self.root = Path(
+            root or os.environ.get("TITANIC_DATA_CACHE", DEFAULT_CACHE_DIR)
+        )
+        mirror = mirror or os.environ.get("TITANIC_DATA_MIRROR")
+        self.mirror = Path(mirror) if mirror else None
+        self._lock = threading.Lock()
+
+    @property
+    def _index_path(self) -> Path:
+        return self.root / "index.json"
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "sha256" / digest[:2] / digest
+
+    def index(self) -> dict:
+        try:
+            with open(self._index_path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _record(self, key: str, digest: str):
+        with self._lock:
+            index = self.index()
+            index[key] = digest
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp = self._index_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(index, indent=2, sort_keys=True))
+            os.replace(tmp, self._index_path)
+
+    def lookup(self, key: str) -> Path | None:
+        """Objeto verificado do cache para `key`, ou None se ausente ou corrompido."""
+        digest = self.index().get(key)
+        if digest is None:
+            return None
+        path = self._object_path(digest)
+        if path.exists() and file_digest(path) == digest:
+            return path
+        return None
+
+    def store(self, key: str, source) -> str:
+        """
+        Copia `source` para o cache e registra seu checksum em `key`.
+
+        Falha com `ChecksumMismatch` se `key` já tiver um checksum diferente.
+
+        Retorna:
+        str: O SHA-256 do arquivo.
+        """
+        digest = file_digest(source)
+        expected = self.index().get(key)
+        if expected is not None and digest != expected:
+            raise ChecksumMismatch(
+                f"{key}: checksum {digest[:12]} difere do registrado ({expected[:12]}). "
+                f"Remova a entrada de {self._index_path} para aceitar a nova versão."
+            )
+        _copy_atomic(Path(source), self._object_path(digest))
+        self._record(key, digest)
+        return digest
+
+    def fetch(self, dataset: str, files: list[str], dest, fetcher=None, workers=4):
+        """
+        Garante que `files` estejam em `dest` com o conteúdo registrado.
+
+        Arquivos cuja cópia em `dest` já confere com o checksum não são tocados;
+        os presentes no cache são copiados dele; os demais são obtidos em paralelo
+        do espelho ou, sem espelho, por `fetcher(nome, diretório)`, que deve gravar
+        o arquivo no diretório indicado e retornar seu caminho.
+
+        Retorna:
+        dict: Origem de cada arquivo: 'local', 'cache', 'mirror' ou 'remote'.
+        """
+        dest = Path(dest)
+
+        def obtain(name):
+            key = f"{dataset}/{name}"
+            target = dest / name
+            digest = self.index().get(key)
+            if digest and target.exists() and file_digest(target) == digest:
+                return "local"
+
+            source = "cache"
+            cached = self.lookup(key)
+            if cached is None:
+                self.root.mkdir(parents=True, exist_ok=True)
+                with tempfile.TemporaryDirectory(dir=self.root) as tmp:
+                    if self.mirror is not None:
+                        path, source = self.mirror / dataset / name, "mirror"
+                        if not path.exists():
+                            raise FileNotFoundError(f"{path} não existe no espelho.")
+                    elif fetcher is not None:
+                        path, source = fetcher(name, tmp), "remote"
+                    else:
+                        raise FileNotFoundError(f"{key} não está no cache.")
+                    self.store(key, path)
+                cached = self.lookup(key)
+            _copy_atomic(cached, target)
+            return source
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(files)))) as pool:
+            return dict(zip(files, pool.map(obtain, files)))
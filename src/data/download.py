@@ -1,9 +1,13 @@
 # src/data/download.py
 import os
 import sys
+import threading
 from pathlib import Path
 
-from kaggle.api.kaggle_api_extended import KaggleApi
+from src.data.cache import DatasetCache
+
+COMPETITION = "titanic"
+FILES = ["train.csv", "test.csv"]
 
 
 def check_kaggle_config():
@@ -29,37 +33,78 @@ def check_kaggle_config():
     return True
 
 
-def download_titanic(dest_path="data/raw"):
-    """Download dos dados do Titanic do Kaggle"""
-    if not check_kaggle_config():
-        return False
+class KaggleFetcher:
+    """
+    Baixa arquivos da competição, autenticando na API do Kaggle apenas no primeiro
+    download (acertos no cache ou no espelho não exigem o kaggle.json).
+    """
 
-    try:
-        api = KaggleApi()
-        api.authenticate()
+    def __init__(self, competition=COMPETITION):
+        self.competition = competition
+        self._api = None
+        self._lock = threading.Lock()
 
-        # Cria o diretório de destino
-        os.makedirs(dest_path, exist_ok=True)
+    def _authenticated_api(self):
+        with self._lock:
+            if self._api is None:
+                if not check_kaggle_config():
+                    raise RuntimeError("Configuração do Kaggle não encontrada.")
+                from kaggle.api.kaggle_api_extended import KaggleApi
 
-        print(f"📥 Baixando dados para {dest_path}...")
+                api = KaggleApi()
+                api.authenticate()
+                self._api = api
+            return self._api
 
-        # Download dos arquivos
+    def __call__(self, name, directory):
+        api = self._authenticated_api()
         api.competition_download_file(
-            "titanic", "train.csv", path=dest_path, force=True
+            self.competition, name, path=directory, force=True
         )
-        api.competition_download_file("titanic", "test.csv", path=dest_path, force=True)
+        return Path(directory) / name
+
+
+def download_titanic(dest_path="data/raw", mirror=None, cache_dir=None):
+    """
+    Obtém os dados do Titanic usando o cache local de datasets.
 
-        print(f"✅ Dados baixados com sucesso em {dest_path}")
-        return True
+    Arquivos já presentes com o checksum registrado não são baixados novamente; os
+    ausentes são copiados do cache, do espelho local ou baixados do Kaggle, em
+    paralelo.
 
+    Parâmetros:
+    dest_path (str): Diretório de destino.
+    mirror (str, opcional): Diretório espelho com `titanic/train.csv` e
+    `titanic/test.csv` (padrão: TITANIC_DATA_MIRROR). Com espelho, o Kaggle não é
+    acessado.
+    cache_dir (str, opcional): Diretório do cache (padrão: TITANIC_DATA_CACHE).
+
+    Retorna:
+    bool: True se todos os arquivos estão disponíveis em `dest_path`.
+    """
+    cache = DatasetCache(cache_dir, mirror)
+    try:
+        print(f"📥 Obtendo dados para {dest_path}...")
+        sources = cache.fetch(COMPETITION, FILES, dest_path, fetcher=KaggleFetcher())
     except Exception as e:
         print(f"❌ Erro durante o download: {e}")
         return False
 
+    labels = {
+        "local": "já atualizado",
+        "cache": "copiado do cache",
+        "mirror": "copiado do espelho",
+        "remote": "baixado do Kaggle",
+    }
+    for name, source in sources.items():
+        print(f"  {name}: {labels[source]}")
+    print(f"✅ Dados disponíveis em {dest_path} (cache em {cache.root})")
+    return True
+
 
-def main():
+def main(mirror=None):
     """Função principal para download dos dados"""
-    success = download_titanic()
+    success = download_titanic(mirror=mirror)
     if not success:
         sys.exit(1)
 
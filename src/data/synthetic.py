@@ -0,0 +1,66 @@
+# src/data/synthetic.py
+
+import numpy as np
+import pandas as pd
+
+
+def synthetic_passengers(n: int, seed: int = 42, labeled: bool = True) -> pd.DataFrame:
+    """
+    Gera passageiros sintéticos com as mesmas colunas do `train.csv` do Kaggle.
+
+    As distribuições aproximam as do dataset original (proporção de sexo, classe e
+    porto, ~20% de idades ausentes, tarifas log-normais) e 'Survived' segue um
+    modelo logístico simples. Útil para benchmarks e testes de carga.
+
+    Parâmetros:
+    n (int): Número de passageiros.
+    seed (int): Semente do gerador aleatório.
+    labeled (bool): Se True, inclui a coluna 'Survived'.
+
+    Retorna:
+    pd.DataFrame: Passageiros sintéticos.
+    """
+    rng = np.random.default_rng(seed)
+    sex = rng.choice(np.array(["male", "female"], dtype=object), n, p=[0.65, 0.35])
+    pclass = rng.choice([1, 2, 3], n, p=[0.24, 0.21, 0.55])
+    age = np.round(rng.gamma(5.0, 6.0, n), 1)
+    age[rng.random(n) < 0.2] = np.nan
+    embarked = rng.choice(
+        np.array(["S", "C", "Q"], dtype=object), n, p=[0.72, 0.19, 0.09]
+    )
+    embarked[rng.random(n) < 0.002] = None
+
+    df = pd.DataFrame(
+        {
+            "PassengerId": np.arange(1, n + 1),
+            "Pclass": pclass,
+            "Name": "Synthetic",
+            "Sex": sex,
+            "Age": age,
+            "SibSp": rng.poisson(0.5, n),
+            "Parch": rng.poisson(0.4, n),
+            "Ticket": "SYNTH",
+            "Fare": np.round(rng.lognormal(2.8, 1.0, n), 2),
+            "Cabin": None,
+            "Embarked": embarked,
+        }
+    )
+
+    if labeled:
+        logit = (
+            -0.4
+            + 2.5 * (sex == "female")
+            - 0.9 * (pclass - 2)
+            - 0.03 * np.nan_to_num(age, nan=30.0)
+        )
+        survived = rng.random(n) < 1.0 / (1.0 + np.exp(-logit))
+        df.insert(1, "Survived", survived.astype(int))
+    return df
+
+
+def synthetic_payloads(n: int, seed: int = 42) -> list[dict]:
+    """Gera `n` payloads JSON no formato do modelo `Passenger` da API."""
+    df = synthetic_passengers(n, seed=seed, labeled=False)
+    fields = ["Pclass", "Sex", "Age", "SibSp", "Parch", "Fare", "Embarked"]
+    records = df[fields].astype(object)
+    return records.where(records.notna(), None).to_dict("records")
@@ -0,0 +1,98 @@
+# src/model/calibration.py
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+CALIBRATION_PATH = "models/calibration.json"
+METHODS = ["isotonic", "sigmoid"]
+
+# Pontos da tabela para a calibração de Platt, uniformes no espaço logit
+_SIGMOID_KNOTS = 1025
+
+
+class CalibrationTable:
+    """
+    Calibração compilada em uma tabela monótona aplicada por interpolação linear.
+
+    `x` são probabilidades do modelo em ordem crescente e `y` as probabilidades
+    calibradas correspondentes; fora de [x[0], x[-1]] o valor é constante. Aplicar
+    a tabela é um `np.interp`, sem chamada a estimadores do scikit-learn.
+
+    Parâmetros:
+    method (str): 'isotonic' ou 'sigmoid' (Platt).
+    x (list[float]): Probabilidades de entrada, crescentes.
+    y (list[float]): Probabilidades calibradas, não decrescentes.
+    """
+
+    def __init__(self, method, x, y):
+        self.method = method
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+
+    def apply(self, probs):
+        """Retorna as probabilidades calibradas (array ou escalar)."""
+        return np.interp(probs, self.x, self.y)
+
+    def save(self, path=CALIBRATION_PATH):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(
+                {"method": self.method, "x": self.x.tolist(), "y": self.y.tolist()}, f
+            )
+
+    @classmethod
+    def load(cls, path=CALIBRATION_PATH):
+        """Carrega a tabela; retorna None se o arquivo não existir."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        return cls(data["method"], data["x"], data["y"])
+
+
+def fit_calibration(pipeline, X, y, method="isotonic", cv=5) -> CalibrationTable:
+    """
+    Ajusta a calibração em predições fora da amostra e a compila em tabela.
+
+    As probabilidades usadas no ajuste vêm de `cross_val_predict` (cada linha é
+    avaliada por um pipeline que não a viu no treino), de forma que a calibração
+    não herda o sobreajuste do modelo final.
+
+    Parâmetros:
+    pipeline (Pipeline): Pipeline não treinado (ex.: `build_pipeline()`).
+    X (pd.DataFrame): Features de treino.
+    y (pd.Series): Rótulos de treino.
+    method (str): 'isotonic' ou 'sigmoid'.
+    cv (int): Número de folds.
+
+    Retorna:
+    CalibrationTable: A calibração compilada.
+    """
+    from sklearn.model_selection import cross_val_predict
+
+    if method not in METHODS:
+        raise ValueError(f"Método de calibração desconhecido: '{method}'.")
+
+    raw = cross_val_predict(pipeline, X, y, cv=cv, method="predict_proba")[:, 1]
+    y = np.asarray(y, dtype=np.float64)
+
+    if method == "isotonic":
+        from sklearn.isotonic import IsotonicRegression
+
+        iso = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds="clip")
+        iso.fit(raw, y)
+        # A regressão isotônica já é linear por partes entre esses pontos
+        x_knots, y_knots = iso.X_thresholds_, iso.y_thresholds_
+    else:
+        from sklearn.linear_model import LogisticRegression
+
+        logit = np.log(np.clip(raw, 1e-12, 1 - 1e-12) / np.clip(1 - raw, 1e-12, 1))
+        platt = LogisticRegression(C=1e6).fit(logit[:, None], y)
+        grid = np.linspace(-12.0, 12.0, _SIGMOID_KNOTS)
+        x_knots = 1.0 / (1.0 + np.exp(-grid))
+        y_knots = platt.predict_proba(grid[:, None])[:, 1]
+
+    return CalibrationTable(method, x_knots, y_knots)
@@ -0,0 +1,219 @@
+# src/model/compact.py
+
+import json
+import os
+import struct
+from pathlib import Path
+
+COMPACT_MODEL_PATH = "models/logreg_titanic.compact"
+
+MAGIC = b"TITCMPT\0"
+FORMAT_VERSION = 1
+# Os arrays começam em offsets múltiplos de 64 bytes
+_ALIGN = 64
+
+
+def export_compact(pipeline, path=COMPACT_MODEL_PATH, metadata=None):
+    """
+    Grava o pipeline treinado em um formato binário compacto.
+
+    O arquivo contém apenas o necessário para inferência: medianas e estatísticas
+    do `StandardScaler` das features numéricas, moda e vocabulário do
+    `OneHotEncoder` das categóricas e os coeficientes da `LogisticRegression`.
+
+    Layout: `MAGIC` (8 bytes), tamanho do cabeçalho (uint32 little-endian),
+    cabeçalho JSON e, a seguir, a seção de dados com os arrays float64 alinhados
+    em 64 bytes. O cabeçalho descreve as features, os vocabulários e o offset
+    (relativo ao início da seção de dados) e o tamanho de cada array.
+
+    Parâmetros:
+    pipeline (Pipeline): Pipeline gerado por `build_pipeline` e já treinado.
+    path (str | Path): Destino do arquivo.
+    metadata (dict, opcional): Informações extras gravadas no cabeçalho.
+    """
+    import numpy as np
+
+    preprocessor, classifier = pipeline[0], pipeline[-1]
+    transformers = {name: (t, cols) for name, t, cols in preprocessor.transformers_}
+    numeric, numeric_feats = transformers["num"]
+    categorical, categorical_feats = transformers["cat"]
+    num_imputer, scaler = numeric[0], numeric[1]
+    cat_imputer, encoder = categorical[0], categorical[1]
+
+    drop_idx = encoder.drop_idx_
+    arrays = {
+        "median": num_imputer.statistics_,
+        "mean": scaler.mean_,
+        "scale": scaler.scale_,
+        "coef": classifier.coef_.ravel(),
+        "intercept": classifier.intercept_,
+    }
+
+    header = {
+        "format_version": FORMAT_VERSION,
+        "numeric_features": list(numeric_feats),
+        "categorical_features": list(categorical_feats),
+        "categorical_fill": [str(v) for v in cat_imputer.statistics_],
+        "categories": [[str(c) for c in cats] for cats in encoder.categories_],
+        "drop_idx": (
+            [None] * len(categorical_feats)
+            if drop_idx is None
+            else [None if i is None else int(i) for i in drop_idx]
+        ),
+        "metadata": metadata or {},
+        "arrays": {},
+    }
+
+    blobs = {name: np.ascontiguousarray(a, dtype="<f8") for name, a in arrays.items()}
+    cursor = 0
+    for name, blob in blobs.items():
+        header["arrays"][name] = [cursor, len(blob)]
+        cursor = _aligned(cursor + blob.nbytes)
+    header_bytes = json.dumps(header).encode()
+    data_start = _aligned(len(MAGIC) + 4 + len(header_bytes))
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Workers da API mantêm o arquivo atual mapeado em memória: grava em um
+    # arquivo temporário e troca com um rename atômico, sem truncar o original
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        for name, blob in blobs.items():
+            offset = data_start + header["arrays"][name][0]
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(blob.tobytes())
+    os.replace(tmp_path, path)
+
+
+def _aligned(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class CompactModel:
+    """
+    Modelo de inferência lido do formato compacto via memory-map somente leitura.
+
+    Os arrays são views do arquivo mapeado, então vários workers que carregam o
+    mesmo arquivo compartilham as mesmas páginas físicas. Não depende do
+    scikit-learn: `transform` e `predict_proba` reproduzem o pipeline com NumPy.
+
+    Parâmetros:
+    path (str | Path): Arquivo gerado por `export_compact`.
+    """
+
+    def __init__(self, path=COMPACT_MODEL_PATH):
+        import numpy as np
+
+        self.path = Path(path)
+        self._buffer = np.memmap(self.path, dtype=np.uint8, mode="r")
+        if bytes(self._buffer[: len(MAGIC)]) != MAGIC:
+            raise ValueError(f"'{self.path}' não é um modelo compacto.")
+        (header_size,) = struct.unpack(
+            "<I", bytes(self._buffer[len(MAGIC) : len(MAGIC) + 4])
+        )
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(self._buffer[start : start + header_size]))
+        if header["format_version"] > FORMAT_VERSION:
+            raise ValueError(
+                f"Versão do formato não suportada: {header['format_version']}"
+            )
+
+        self.header = header
+        self.metadata = header["metadata"]
+        self.numeric_features = header["numeric_features"]
+        self.categorical_features = header["categorical_features"]
+        self.categorical_fill = header["categorical_fill"]
+        self.categories = [
+            np.array(cats, dtype=object) for cats in header["categories"]
+        ]
+        self.drop_idx = header["drop_idx"]
+        data_start = _aligned(start + header_size)
+        for name, (offset, length) in header["arrays"].items():
+            offset += data_start
+            view = self._buffer[offset : offset + 8 * length].view("<f8")
+            setattr(self, name, view)
+
+    def transform(self, df):
+        """Aplica imputação, padronização e one-hot como o `ColumnTransformer`."""
+        import numpy as np
+
+        numeric = df[self.numeric_features].to_numpy(dtype=np.float64, na_value=np.nan)
+        numeric = np.where(np.isnan(numeric), self.median, numeric)
+        blocks = [(numeric - self.mean) / self.scale]
+
+        for j, feature in enumerate(self.categorical_features):
+            column = df[feature]
+            values = np.where(
+                column.isna().to_numpy(),
+                self.categorical_fill[j],
+                column.to_numpy(dtype=object),
+            )
+            keep = [
+                c for i, c in enumerate(self.categories[j]) if i != self.drop_idx[j]
+            ]
+            # Categorias desconhecidas resultam em uma linha só de zeros
+            blocks.append(values[:, None] == np.array(keep, dtype=object)[None, :])
+
+        return np.hstack([b.astype(np.float64, copy=False) for b in blocks])
+
+    def predict_proba(self, df):
+        """Retorna as probabilidades [P(não sobreviveu), P(sobreviveu)] por linha."""
+        import numpy as np
+
+        logits = self.transform(df) @ self.coef + self.intercept[0]
+        positive = 1.0 / (1.0 + np.exp(-logits))
+        return np.column_stack([1.0 - positive, positive])
+
+
+_LOAD_PROBE = """
+import resource, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+{load}
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+_LOADERS = {
+    "joblib": "import joblib; model = joblib.load({path!r})",
+    "compact": "from src.model.compact import CompactModel; model = CompactModel({path!r})",
+}
+
+
+def measure_load(path, kind: str) -> dict:
+    """
+    Mede, em um processo novo, o tempo de carga e o pico de memória (RSS) de um
+    artefato, descontando o RSS de um interpretador vazio.
+
+    Parâmetros:
+    path (str | Path): Caminho do artefato.
+    kind (str): 'joblib' ou 'compact'.
+
+    Retorna:
+    dict: 'load_ms', 'rss_mb' e 'size_kb' (tamanho do arquivo).
+    """
+    import subprocess
+    import sys
+
+    root = str(Path(__file__).resolve().parents[2])
+
+    def probe(load):
+        result = subprocess.run(
+            [sys.executable, "-c", _LOAD_PROBE.format(root=root, load=load)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        elapsed, max_rss_kb = result.stdout.split()
+        return float(elapsed), int(max_rss_kb)
+
+    _, baseline_kb = probe("pass")
+    elapsed, max_rss_kb = probe(_LOADERS[kind].format(path=str(path)))
+    return {
+        "load_ms": elapsed * 1000,
+        "rss_mb": (max_rss_kb - baseline_kb) / 1024,
+        "size_kb": Path(path).stat().st_size / 1024,
+    }
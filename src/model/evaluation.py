@@ -0,0 +1,148 @@
+# src/model/evaluation.py
+
+import numpy as np
+
+
+def curves(y_true, scores) -> dict:
+    """
+    Calcula as curvas ROC e precisão-recall com uma única ordenação.
+
+    Os escores são ordenados de forma decrescente e as contagens de verdadeiros e
+    falsos positivos são somas acumuladas, avaliadas apenas nos pontos em que o
+    escore muda (empates formam um único limiar). O custo é O(n log n) pela
+    ordenação e O(n) para o restante.
+
+    Parâmetros:
+    y_true (array): Rótulos binários (1 = sobreviveu), não vazio.
+    scores (array): Probabilidades previstas para a classe positiva.
+
+    Retorna:
+    dict: 'thresholds' (decrescentes; positivo se escore >= limiar), 'tps' e 'fps'
+    acumulados, 'fpr', 'tpr', 'precision', 'recall', 'roc_auc' e
+    'average_precision'.
+    """
+    y_true = np.asarray(y_true, dtype=np.int64)
+    scores = np.asarray(scores, dtype=np.float64)
+
+    order = np.argsort(-scores, kind="stable")
+    scores, y_true = scores[order], y_true[order]
+    # Último índice de cada grupo de escores iguais
+    last = np.r_[np.flatnonzero(np.diff(scores)), scores.size - 1]
+
+    tps = np.cumsum(y_true)[last]
+    fps = (last + 1) - tps
+    positives, negatives = tps[-1], fps[-1]
+
+    tpr = np.r_[0.0, tps / positives] if positives else np.zeros(tps.size + 1)
+    fpr = np.r_[0.0, fps / negatives] if negatives else np.zeros(fps.size + 1)
+    precision = tps / np.maximum(tps + fps, 1)
+    recall = tpr[1:]
+
+    return {
+        "thresholds": scores[last],
+        "tps": tps,
+        "fps": fps,
+        "positives": int(positives),
+        "negatives": int(negatives),
+        "fpr": fpr,
+        "tpr": tpr,
+        "precision": precision,
+        "recall": recall,
+        "roc_auc": float(np.trapezoid(tpr, fpr)) if positives and negatives else None,
+        "average_precision": (
+            float(np.sum(np.diff(np.r_[0.0, recall]) * precision))
+            if positives
+            else None
+        ),
+    }
+
+
+def optimal_threshold(curve: dict, cost_fp=1.0, cost_fn=1.0) -> dict:
+    """
+    Escolhe o limiar de decisão de menor custo esperado.
+
+    O custo de cada limiar é `cost_fp * FP + cost_fn * FN`, avaliado em todos os
+    pontos da curva (e no limiar acima do maior escore, que não prevê nenhum
+    sobrevivente).
+
+    Parâmetros:
+    curve (dict): Resultado de `curves`.
+    cost_fp (float): Custo de prever sobrevivência para quem não sobreviveu.
+    cost_fn (float): Custo de não prever sobrevivência para quem sobreviveu.
+
+    Retorna:
+    dict: 'threshold', 'cost' (médio por passageiro), 'precision', 'recall' e
+    'accuracy' no limiar escolhido.
+    """
+    positives, negatives = curve["positives"], curve["negatives"]
+    tps = np.r_[0, curve["tps"]]
+    fps = np.r_[0, curve["fps"]]
+    thresholds = np.r_[np.nextafter(1.0, 2.0), curve["thresholds"]]
+
+    costs = cost_fp * fps + cost_fn * (positives - tps)
+    best = int(np.argmin(costs))
+    total = max(positives + negatives, 1)
+    tp, fp = int(tps[best]), int(fps[best])
+    return {
+        "threshold": float(thresholds[best]),
+        "cost_fp": float(cost_fp),
+        "cost_fn": float(cost_fn),
+        "cost": float(costs[best] / total),
+        "precision": tp / (tp + fp) if tp + fp else None,
+        "recall": tp / positives if positives else None,
+        "accuracy": (tp + negatives - fp) / total,
+    }
+
+
+def calibration_bins(y_true, scores, n_bins=10) -> dict:
+    """
+    Agrupa as probabilidades em `n_bins` faixas de mesma largura e compara a
+    probabilidade média prevista com a taxa observada em cada faixa.
+
+    Retorna:
+    dict: 'edges', 'count', 'mean_predicted' e 'observed_rate' por faixa (None em
+    faixas vazias) e o erro de calibração esperado ('ece').
+    """
+    y_true = np.asarray(y_true, dtype=np.float64)
+    scores = np.asarray(scores, dtype=np.float64)
+    bins = np.clip((scores * n_bins).astype(np.int64), 0, n_bins - 1)
+
+    count = np.bincount(bins, minlength=n_bins)
+    predicted = np.bincount(bins, weights=scores, minlength=n_bins)
+    observed = np.bincount(bins, weights=y_true, minlength=n_bins)
+    filled = count > 0
+    mean_predicted = np.divide(predicted, count, where=filled, out=np.zeros(n_bins))
+    observed_rate = np.divide(observed, count, where=filled, out=np.zeros(n_bins))
+    ece = float(
+        np.sum(count * np.abs(mean_predicted - observed_rate)) / max(scores.size, 1)
+    )
+
+    return {
+        "edges": np.linspace(0.0, 1.0, n_bins + 1).tolist(),
+        "count": count.tolist(),
+        "mean_predicted": [
+            float(v) if f else None for v, f in zip(mean_predicted, filled)
+        ],
+        "observed_rate": [
+            float(v) if f else None for v, f in zip(observed_rate, filled)
+        ],
+        "ece": ece,
+    }
+
+
+def evaluate_scores(y_true, scores, cost_fp=1.0, cost_fn=1.0, n_bins=10) -> dict:
+    """
+    Avaliação completa das probabilidades de um conjunto de hold-out.
+
+    Retorna:
+    dict: 'roc_auc', 'average_precision', 'threshold' (ver `optimal_threshold`),
+    'calibration' (ver `calibration_bins`) e 'curve' (ver `curves`).
+    """
+    curve = curves(y_true, scores)
+    return {
+        "roc_auc": curve["roc_auc"],
+        "average_precision": curve["average_precision"],
+        "threshold": optimal_threshold(curve, cost_fp, cost_fn),
+        "calibration": calibration_bins(y_true, scores, n_bins),
+        "curve": curve,
+    }
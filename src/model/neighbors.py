@@ -0,0 +1,91 @@
+# src/model/neighbors.py
+
+import numpy as np
+import pandas as pd
+from joblib import dump, load
+
+NEIGHBOR_INDEX_PATH = "models/knn_index.joblib"
+PASSENGER_FIELDS = ["Pclass", "Sex", "Age", "SibSp", "Parch", "Fare", "Embarked"]
+
+
+def build_index(model, X: pd.DataFrame, y: pd.Series, passenger_ids=None) -> dict:
+    """
+    Constrói o índice espacial dos passageiros de treino.
+
+    Os pontos são as features geradas pelo `ColumnTransformer` do pipeline
+    (numéricas padronizadas + one-hot), de forma que a distância usada na busca é a
+    mesma representação vista pelo modelo.
+
+    Parâmetros:
+    model (Pipeline): Pipeline já treinado.
+    X (pd.DataFrame): Features de treino (pré-processadas).
+    y (pd.Series): Rótulo 'Survived' de cada linha de X.
+    passenger_ids (array-like, opcional): PassengerId de cada linha de X.
+
+    Retorna:
+    dict: Árvore, rótulos e dados originais dos passageiros indexados.
+    """
+    # Só o treino constrói a árvore; a API apenas carrega o índice já gravado
+    from sklearn.neighbors import KDTree
+
+    features = _features(model, X)
+    records = X[PASSENGER_FIELDS].astype(object)
+    return {
+        "tree": KDTree(np.asarray(features, dtype=np.float64)),
+        "survived": np.asarray(y, dtype=np.int64),
+        "passenger_ids": (
+            None if passenger_ids is None else np.asarray(passenger_ids, np.int64)
+        ),
+        "records": records.where(records.notna(), None).to_dict("records"),
+    }
+
+
+def _features(model, X):
+    # Pipeline: todas as etapas menos o classificador; CompactModel: transform
+    if hasattr(model, "steps"):
+        return model[:-1].transform(X)
+    return model.transform(X)
+
+
+def save_index(index: dict, path=NEIGHBOR_INDEX_PATH):
+    dump(index, path)
+
+
+def load_index(path=NEIGHBOR_INDEX_PATH) -> dict | None:
+    try:
+        return load(path)
+    except FileNotFoundError:
+        return None
+
+
+def query(index: dict, model, X: pd.DataFrame, k: int = 5) -> list[list[dict]]:
+    """
+    Busca, em lote, os k passageiros de treino mais próximos de cada linha de X.
+
+    Parâmetros:
+    index (dict): Índice gerado por `build_index`.
+    model (Pipeline | CompactModel): Modelo usado na construção do índice.
+    X (pd.DataFrame): Passageiros pré-processados.
+    k (int): Número de vizinhos.
+
+    Retorna:
+    list[list[dict]]: Para cada linha de X, os vizinhos em ordem de distância.
+    """
+    tree = index["tree"]
+    k = min(k, tree.data.shape[0])
+    features = np.asarray(_features(model, X), dtype=np.float64)
+    distances, indices = tree.query(features, k=k)
+
+    ids = index["passenger_ids"]
+    return [
+        [
+            {
+                "passenger_id": None if ids is None else int(ids[i]),
+                "distance": float(d),
+                "survived": int(index["survived"][i]),
+                "passenger": index["records"][i],
+            }
+            for d, i in zip(row_distances, row_indices)
+        ]
+        for row_distances, row_indices in zip(distances, indices)
+    ]
@@ -0,0 +1,356 @@
+# src/model/registry.py
+
+import json
+import os
+import random
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from pathlib import Path
+
+REGISTRY_ROOT = "models/registry"
+METADATA_FILE = "metadata.json"
+CALIBRATION_FILE = "calibration.json"
+NEIGHBOR_INDEX_FILE = "knn_index.joblib"
+DRIFT_REFERENCE_FILE = "drift_reference.json"
+SCORE_TABLE_FILE = "score_table.npy"
+ARTIFACTS = {"joblib": "model.joblib", "compact": "model.compact"}
+
+
+class ModelRegistry:
+    """
+    Registro de modelos versionados em disco.
+
+    Cada versão é um diretório imutável `<root>/v<N>/` com o pipeline em joblib,
+    o formato compacto (ver src/model/compact.py), um `metadata.json` com o perfil
+    do treino, as métricas e o schema de features e os artefatos derivados do
+    modelo (calibração, índice de vizinhos, referência de drift e tabela de
+    escores), de forma que uma versão antiga nunca é servida com artefatos de
+    outra. 'latest' é um alias para a maior versão registrada.
+
+    Parâmetros:
+    root (str | Path): Diretório raiz do registro.
+    """
+
+    def __init__(self, root=REGISTRY_ROOT):
+        self.root = Path(root)
+        # (assinatura do diretório raiz, versões), trocado em uma única atribuição
+        self._listing = None
+
+    def versions(self) -> list[str]:
+        """
+        Versões registradas, da mais antiga para a mais recente.
+
+        A listagem é refeita apenas quando o mtime do diretório raiz muda: as
+        versões entram com um rename (ver `register`) e são imutáveis depois.
+        Enquanto houver um diretório de versão sem `metadata.json` (cópia em
+        andamento), a listagem não é guardada.
+        """
+        try:
+            stat = os.stat(self.root)
+        except FileNotFoundError:
+            self._listing = None
+            return []
+        signature = (stat.st_ino, stat.st_mtime_ns)
+        listing = self._listing
+        if listing is None or listing[0] != signature:
+            candidates = [
+                p for p in self.root.iterdir() if p.is_dir() and p.name[1:].isdigit()
+            ]
+            found = [p.name for p in candidates if (p / METADATA_FILE).exists()]
+            listing = (signature, sorted(found, key=lambda name: int(name[1:])))
+            self._listing = listing if len(found) == len(candidates) else None
+        return list(listing[1])
+
+    def latest(self) -> str | None:
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def resolve(self, name: str) -> str:
+        """Converte 'latest' na versão correspondente; falha com KeyError se não existir."""
+        versions = self.versions()
+        version = (versions[-1] if versions else None) if name == "latest" else name
+        if version is None or version not in versions:
+            raise KeyError(name)
+        return version
+
+    def metadata(self, version: str) -> dict:
+        with open(self.root / version / METADATA_FILE) as f:
+            return json.load(f)
+
+    def artifact_path(self, version: str, model_format="joblib") -> Path:
+        return self.root / version / ARTIFACTS[model_format]
+
+    def calibration_path(self, version: str) -> Path:
+        return self.root / version / CALIBRATION_FILE
+
+    def neighbor_index_path(self, version: str) -> Path:
+        return self.root / version / NEIGHBOR_INDEX_FILE
+
+    def drift_reference_path(self, version: str) -> Path:
+        return self.root / version / DRIFT_REFERENCE_FILE
+
+    def score_table_path(self, version: str) -> Path:
+        return self.root / version / SCORE_TABLE_FILE
+
+    def register(
+        self,
+        pipeline,
+        metrics=None,
+        training_profile=None,
+        decision_threshold=0.5,
+        calibration=None,
+        neighbor_index=None,
+        drift_reference=None,
+        score_dataset=None,
+    ) -> str:
+        """
+        Grava um pipeline treinado como uma nova versão.
+
+        Os arquivos são gravados em um diretório temporário renomeado ao final, de
+        forma que uma versão visível está sempre completa.
+
+        Parâmetros:
+        pipeline (Pipeline): Pipeline gerado por `build_pipeline` e já treinado.
+        metrics (dict, opcional): Métricas de avaliação.
+        training_profile (dict, opcional): Dados e parâmetros do treino.
+        decision_threshold (float): Limiar a partir do qual a probabilidade é
+        classificada como sobrevivência.
+        calibration (CalibrationTable, opcional): Calibração aplicada às
+        probabilidades do pipeline (ver src/model/calibration.py).
+        neighbor_index (dict, opcional): Índice de vizinhos construído com este
+        pipeline (ver src/model/neighbors.py).
+        drift_reference (dict, opcional): Resumos de referência do treino (ver
+        src/monitoring/drift.py).
+        score_dataset (str, opcional): CSV avaliado para a tabela de escores (ver
+        src/model/score_table.py).
+
+        Retorna:
+        str: A versão criada (ex.: 'v3').
+        """
+        from joblib import dump
+
+        from src.model.compact import export_compact
+
+        versions = self.versions()
+        version = f"v{int(versions[-1][1:]) + 1 if versions else 1}"
+        staging = self.root / f".{version}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        metadata = {
+            "version": version,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "training_profile": training_profile or {},
+            "metrics": metrics or {},
+            "feature_schema": feature_schema(pipeline),
+            "decision_threshold": decision_threshold,
+            "calibration": calibration.method if calibration is not None else None,
+            "artifacts": ARTIFACTS,
+        }
+        dump(pipeline, staging / ARTIFACTS["joblib"])
+        export_compact(
+            pipeline,
+            staging / ARTIFACTS["compact"],
+            metadata={"version": version, "decision_threshold": decision_threshold},
+        )
+        if calibration is not None:
+            calibration.save(staging / CALIBRATION_FILE)
+        if neighbor_index is not None:
+            from src.model.neighbors import save_index
+
+            save_index(neighbor_index, staging / NEIGHBOR_INDEX_FILE)
+        if drift_reference is not None:
+            from src.monitoring.drift import save_reference
+
+            save_reference(drift_reference, staging / DRIFT_REFERENCE_FILE)
+        if score_dataset is not None:
+            from src.model.score_table import materialize
+
+            materialize(
+                score_dataset,
+                staging / ARTIFACTS["joblib"],
+                staging / SCORE_TABLE_FILE,
+                calibration_path=staging / CALIBRATION_FILE,
+            )
+        with open(staging / METADATA_FILE, "w") as f:
+            json.dump(metadata, f, indent=2)
+        os.rename(staging, self.root / version)
+        return version
+
+
+def load_model(path, model_format=None):
+    """
+    Carrega o modelo no formato indicado.
+
+    Parâmetros:
+    path (str | Path): Caminho do artefato.
+    model_format (str, opcional): 'joblib' (Pipeline completo) ou 'compact'
+    (ver src/model/compact.py). Por padrão, inferido pela extensão do arquivo.
+
+    Retorna:
+    O objeto com `predict_proba`.
+    """
+    if model_format is None:
+        model_format = "compact" if str(path).endswith(".compact") else "joblib"
+    if model_format == "compact":
+        from src.model.compact import CompactModel
+
+        return CompactModel(path)
+
+    import joblib
+
+    return joblib.load(path)
+
+
+def feature_schema(pipeline) -> dict:
+    """Features de entrada do `ColumnTransformer`, agrupadas por transformador."""
+    return {
+        name: list(cols)
+        for name, _, cols in pipeline[0].transformers_
+        if name != "remainder"
+    }
+
+
+class ModelCache:
+    """
+    Mantém em memória até `capacity` modelos, descartando o usado há mais tempo.
+
+    Os modelos são identificados pelo caminho do artefato; o formato é inferido
+    pela extensão. É seguro para uso por várias threads: o carregamento acontece
+    fora do lock, de forma que os modelos já residentes continuam respondendo
+    enquanto outro é lido do disco, e chamadas simultâneas para o mesmo artefato
+    aguardam um único carregamento.
+
+    Parâmetros:
+    capacity (int): Número máximo de modelos residentes.
+    """
+
+    def __init__(self, capacity=3):
+        self.capacity = capacity
+        self._models = OrderedDict()
+        # Carregamentos em andamento: caminho -> Future com o modelo
+        self._loading = {}
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "loads": 0, "waits": 0, "evictions": 0}
+
+    def get(self, path):
+        key = str(path)
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self.counters["hits"] += 1
+                return self._models[key]
+            loading = self._loading.get(key)
+            owner = loading is None
+            if owner:
+                loading = self._loading[key] = Future()
+            else:
+                self.counters["waits"] += 1
+
+        if not owner:
+            return loading.result()
+
+        try:
+            model = load_model(key)
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            loading.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._loading[key]
+            self._models[key] = model
+            self.counters["loads"] += 1
+            while len(self._models) > self.capacity:
+                self._models.popitem(last=False)
+                self.counters["evictions"] += 1
+        loading.set_result(model)
+        return model
+
+    def resident(self) -> list[str]:
+        with self._lock:
+            return list(self._models)
+
+
+def parse_routes(spec: str) -> dict[str, float]:
+    """
+    Converte 'v3=90,v4=10' em {'v3': 90.0, 'v4': 10.0}. Uma versão sem peso
+    recebe peso 1.
+    """
+    routes = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        version, _, weight = item.partition("=")
+        routes[version.strip()] = float(weight) if weight else 1.0
+    return routes
+
+
+class ModelRouter:
+    """
+    Escolhe a versão que responde cada requisição e acompanha os modelos sombra.
+
+    Sem versão explícita, a requisição é atribuída a uma das `routes` com
+    probabilidade proporcional ao peso (divisão canário). As versões em `shadow`
+    avaliam as mesmas entradas sem afetar a resposta; `record_shadow` acumula a
+    diferença para a versão que respondeu.
+
+    Parâmetros:
+    routes (dict[str, float]): Pesos por versão.
+    shadow (list[str]): Versões avaliadas em modo sombra.
+    seed (int, opcional): Semente do sorteio.
+    """
+
+    def __init__(self, routes=None, shadow=None, seed=None):
+        self.routes = {v: w for v, w in (routes or {}).items() if w > 0}
+        self.shadow = list(shadow or [])
+        self._random = random.Random(seed)
+        self._versions = list(self.routes)
+        self._weights = list(self.routes.values())
+        self.routed = {version: 0 for version in self.routes}
+        self.shadow_stats = {
+            version: {
+                "scored": 0,
+                "dropped": 0,
+                "errors": 0,
+                "abs_diff_sum": 0.0,
+                "agreements": 0,
+            }
+            for version in self.shadow
+        }
+
+    def choose(self) -> str | None:
+        if not self._versions:
+            return None
+        version = self._random.choices(self._versions, self._weights)[0]
+        self.routed[version] += 1
+        return version
+
+    def record_shadow(
+        self, version, primary, shadow, primary_threshold=0.5, shadow_threshold=0.5
+    ):
+        """
+        Acumula a diferença entre as probabilidades da versão que respondeu
+        (`primary`) e as da versão sombra; a concordância compara as decisões de
+        cada uma com o próprio limiar.
+        """
+        stats = self.shadow_stats[version]
+        for p, q in zip(primary, shadow):
+            stats["scored"] += 1
+            stats["abs_diff_sum"] += abs(p - q)
+            stats["agreements"] += (p >= primary_threshold) == (q >= shadow_threshold)
+
+    def stats(self) -> dict:
+        shadow = {}
+        for version, stats in self.shadow_stats.items():
+            scored = stats["scored"]
+            shadow[version] = {
+                "scored": scored,
+                "dropped": stats["dropped"],
+                "errors": stats["errors"],
+                "mean_abs_diff": stats["abs_diff_sum"] / scored if scored else None,
+                "agreement_rate": stats["agreements"] / scored if scored else None,
+            }
+        return {"routes": self.routes, "routed": dict(self.routed), "shadow": shadow}
@@ -0,0 +1,125 @@
+# src/model/score_table.py
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from joblib import load
+
+from src.model.calibration import CalibrationTable
+from src.processing.preprocessing import preprocess
+
+SCORE_TABLE_PATH = "models/score_table.npy"
+
+
+def materialize(
+    dataset_path="data/raw/test.csv",
+    model_path="models/logreg_titanic.joblib",
+    output_path=SCORE_TABLE_PATH,
+    calibration_path=None,
+):
+    """
+    Avalia um dataset inteiro com o pipeline salvo e grava a tabela de escores.
+
+    A tabela é um único `.npy` int64 de formato (2, n): a linha 0 contém os
+    PassengerId ordenados e a linha 1 os bits float64 das probabilidades. Assim as
+    duas linhas são contíguas e podem ser consultadas via memory-map sem cópias.
+    A gravação é atômica (arquivo temporário + rename).
+
+    Parâmetros:
+    dataset_path (str): CSV com a coluna PassengerId e os campos do passageiro.
+    model_path (str): Pipeline treinado.
+    output_path (str): Destino da tabela.
+    calibration_path (str, opcional): Calibração aplicada às probabilidades, se o
+    arquivo existir (ver src/model/calibration.py).
+
+    Retorna:
+    int: Número de passageiros na tabela.
+    """
+    model = load(model_path)
+    df = pd.read_csv(dataset_path)
+    ids = df["PassengerId"].to_numpy(dtype=np.int64)
+    probs = model.predict_proba(preprocess(df))[:, 1]
+    if calibration_path is not None:
+        calibrator = CalibrationTable.load(calibration_path)
+        if calibrator is not None:
+            probs = calibrator.apply(probs)
+
+    order = np.argsort(ids, kind="stable")
+    ids = ids[order]
+    if len(ids) > 1 and (np.diff(ids) == 0).any():
+        raise ValueError(f"PassengerId duplicado em {dataset_path}.")
+
+    table = np.empty((2, len(ids)), dtype=np.int64)
+    table[0] = ids
+    table[1] = probs[order].astype(np.float64).view(np.int64)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, table)
+    os.replace(tmp_path, output_path)
+    return len(ids)
+
+
+class ScoreTable:
+    """
+    Consulta a tabela de escores materializada por PassengerId.
+
+    O arquivo é aberto com memory-map e reaberto automaticamente quando é
+    substituído (por exemplo, após um re-treino), sem reiniciar a API.
+    Se os ids forem consecutivos, a consulta é por índice direto; caso contrário,
+    por busca binária.
+
+    Parâmetros:
+    path (str | Path): Caminho da tabela gerada por `materialize`.
+    """
+
+    def __init__(self, path=SCORE_TABLE_PATH):
+        self.path = Path(path)
+        # (assinatura do arquivo, ids, probabilidades, ids consecutivos), trocado
+        # em uma única atribuição para que consultas concorrentes a um refresh
+        # nunca combinem ids de uma versão com probabilidades de outra
+        self._state = None
+
+    def _refresh(self):
+        """Retorna o estado atual, reabrindo o arquivo se ele foi substituído."""
+        state = self._state
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._state = None
+            return None
+        signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if state is None or state[0] != signature:
+            table = np.load(self.path, mmap_mode="r")
+            ids = table[0]
+            dense = len(ids) > 0 and int(ids[-1]) - int(ids[0]) == len(ids) - 1
+            state = (signature, ids, table[1].view(np.float64), dense)
+            self._state = state
+        return state
+
+    @property
+    def available(self) -> bool:
+        return self._refresh() is not None
+
+    def lookup(self, passenger_id: int) -> float | None:
+        """Retorna a probabilidade do passageiro ou None se ele não estiver na tabela."""
+        state = self._refresh()
+        if state is None:
+            return None
+        _, ids, probs, dense = state
+        if len(ids) == 0:
+            return None
+
+        if dense:
+            i = passenger_id - int(ids[0])
+            if not 0 <= i < len(ids):
+                return None
+        else:
+            i = int(ids.searchsorted(passenger_id))
+            if i == len(ids) or ids[i] != passenger_id:
+                return None
+        return float(probs[i])
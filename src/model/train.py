@@ -1,5 +1,8 @@
 # src/model/train.py
 
+import json
+from pathlib import Path
+
 import pandas as pd
 from joblib import dump
 from sklearn.compose import ColumnTransformer
@@ -8,6 +11,13 @@ from sklearn.model_selection import cross_val_score, train_test_split
 from sklearn.pipeline import make_pipeline
 from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
+from src.model.calibration import CALIBRATION_PATH, fit_calibration
+from src.model.compact import export_compact
+from src.model.evaluation import evaluate_scores
+from src.model.neighbors import build_index, save_index
+from src.model.registry import ModelRegistry
+from src.model.score_table import materialize
+from src.monitoring.drift import build_reference, save_reference
 from src.processing.preprocessing import add_age_group, add_household_features
 
 
@@ -22,6 +32,30 @@ def load_data(path="data/processed/train_processed.csv"):
     return df
 
 
+def load_raw_rows(passenger_ids=None, path="data/raw/train.csv"):
+    """
+    Carrega os dados brutos (antes da imputação), opcionalmente filtrados por
+    PassengerId. Retorna None se o arquivo não existir.
+    """
+    try:
+        df = pd.read_csv(path)
+    except FileNotFoundError:
+        return None
+    if passenger_ids is not None:
+        df = df[df["PassengerId"].isin(passenger_ids)]
+    return df
+
+
+def load_request_log(path="data/requests"):
+    """Carrega o log de requisições da API (diretório Parquet particionado)."""
+    try:
+        df = pd.read_parquet(path)
+    except (FileNotFoundError, ValueError):
+        print(f"Log de requisições não encontrado em {path}.")
+        return None
+    return df
+
+
 def build_pipeline():
     numeric_feats = ["Age", "Fare", "HouseholdSize", "Pclass", "SibSp", "Parch"]
     categorical_feats = ["Sex", "Embarked", "AgeGroup", "AloneXAgeGroup"]
@@ -50,19 +84,41 @@ def build_pipeline():
     return pipeline
 
 
-def evaluate_model(scores, y_test, y_pred_proba, model, X_test):
-    """Gera um descritivo avaliativo dos valores das validações cross, hold-out e outras."""
+def evaluate_model(
+    scores, y_test, y_pred_proba, model, X_test, cost_fp=1.0, cost_fn=1.0
+):
+    """
+    Gera um descritivo avaliativo dos valores das validações cross, hold-out e outras.
+
+    Além do ROC-AUC, calcula as curvas ROC e precisão-recall, o limiar de decisão de
+    menor custo (ver src/model/evaluation.py) e a calibração das probabilidades.
+
+    Parâmetros:
+    cost_fp (float): Custo de um falso positivo na escolha do limiar.
+    cost_fn (float): Custo de um falso negativo na escolha do limiar.
+
+    Retorna:
+    dict: Métricas de cross-validation e do hold-out, incluindo o limiar escolhido.
+    """
     print(f"ROC-AUC CV scores: {scores}")
     print(f"Média ROC-AUC: {scores.mean():.3f}")
     print(f"Desvio padrão ROC-AUC: {scores.std():.3f}")
     print(f"Mínimo ROC-AUC: {scores.min():.3f}")
     print(f"Máximo ROC-AUC: {scores.max():.3f}")
 
-    from sklearn.metrics import roc_auc_score
-
-    test_roc_auc = roc_auc_score(y_test, y_pred_proba)
-    print(f"Acurácia no conjunto de teste: {model.score(X_test, y_test):.3f}")
-    print(f"ROC-AUC no conjunto de teste: {test_roc_auc:.3f}")
+    report = evaluate_scores(y_test, y_pred_proba, cost_fp=cost_fp, cost_fn=cost_fn)
+    threshold = report["threshold"]
+    accuracy = model.score(X_test, y_test)
+    print(f"Acurácia no conjunto de teste: {accuracy:.3f}")
+    print(f"ROC-AUC no conjunto de teste: {report['roc_auc']:.3f}")
+    print(
+        f"Precisão média (PR-AUC) no conjunto de teste: {report['average_precision']:.3f}"
+    )
+    print(
+        f"Limiar de decisão (custo FP={cost_fp:g}, FN={cost_fn:g}): "
+        f"{threshold['threshold']:.3f} (acurácia {threshold['accuracy']:.3f})"
+    )
+    print(f"Erro de calibração esperado (ECE): {report['calibration']['ece']:.3f}")
 
     if scores.mean() > 0.8:
         print(
@@ -77,8 +133,18 @@ def evaluate_model(scores, y_test, y_pred_proba, model, X_test):
             "O modelo apresenta um desempenho ruim, com uma média ROC-AUC inferior a 0.7."
         )
 
+    return {
+        "cv_roc_auc_mean": float(scores.mean()),
+        "cv_roc_auc_std": float(scores.std()),
+        "test_roc_auc": report["roc_auc"],
+        "test_accuracy": float(accuracy),
+        "test_average_precision": report["average_precision"],
+        "threshold": threshold,
+        "calibration": report["calibration"],
+    }
+
 
-def train_and_evaluate():
+def train_and_evaluate(cost_fp=1.0, cost_fn=1.0, calibration=None):
     df = load_data()
     if df is None:
         return
@@ -109,11 +175,93 @@ def train_and_evaluate():
 
     y_pred_proba = model.predict_proba(X_test)[:, 1]
 
-    evaluate_model(scores, y_test, y_pred_proba, model, X_test)
+    # calibração opcional, ajustada em predições fora da amostra do treino; o
+    # limiar e as métricas do hold-out passam a usar as probabilidades calibradas
+    calibrator = None
+    if calibration:
+        print(f"Ajustando calibração ({calibration}) em folds de validação...")
+        calibrator = fit_calibration(build_pipeline(), X_train, y_train, calibration)
+        y_pred_proba = calibrator.apply(y_pred_proba)
 
-    # salvar o pipeline completo
+    metrics = evaluate_model(
+        scores, y_test, y_pred_proba, model, X_test, cost_fp=cost_fp, cost_fn=cost_fn
+    )
+    decision_threshold = metrics["threshold"]["threshold"]
+
+    # salvar o pipeline completo e o limiar de decisão usado pela API
     dump(model, "models/logreg_titanic.joblib")
     print("Modelo salvo em models/logreg_titanic.joblib")
+    with open("models/decision_threshold.json", "w") as f:
+        json.dump({"decision_threshold": decision_threshold}, f)
+    print("Limiar de decisão salvo em models/decision_threshold.json")
+    if calibrator is not None:
+        calibrator.save(CALIBRATION_PATH)
+        print(f"Calibração salva em {CALIBRATION_PATH}")
+    else:
+        # evita que uma calibração antiga seja aplicada ao novo modelo
+        Path(CALIBRATION_PATH).unlink(missing_ok=True)
+
+    # resumos de referência para o monitoramento de drift da API, a partir dos
+    # dados brutos: o tráfego chega sem imputação, com valores ausentes
+    train_ids = df.loc[X_train.index, "PassengerId"] if "PassengerId" in df else None
+    raw_train = load_raw_rows(train_ids)
+    if raw_train is None:
+        print(
+            "AVISO: data/raw/train.csv não encontrado. A referência de drift usará os dados imputados."
+        )
+        raw_train = X_train
+    drift_reference = build_reference(raw_train)
+
+    # índice de vizinhos mais próximos para o endpoint de passageiros semelhantes
+    neighbor_index = build_index(model, X_train, y_train, train_ids)
+
+    # tabela de escores pré-computados servida por GET /predict/{passenger_id}
+    score_dataset = "data/raw/test.csv" if Path("data/raw/test.csv").exists() else None
+
+    # nova versão no registro de modelos, com perfil do treino, métricas e os
+    # artefatos derivados deste pipeline
+    version = ModelRegistry().register(
+        model,
+        metrics=metrics,
+        decision_threshold=decision_threshold,
+        calibration=calibrator,
+        neighbor_index=neighbor_index,
+        drift_reference=drift_reference,
+        score_dataset=score_dataset,
+        training_profile={
+            "train_rows": int(len(X_train)),
+            "test_rows": int(len(X_test)),
+            "survival_rate": float(y_train.mean()),
+            "classifier": type(model[-1]).__name__,
+            "params": {
+                k: v if isinstance(v, (int, float, str, bool, type(None))) else repr(v)
+                for k, v in model[-1].get_params().items()
+            },
+        },
+    )
+    print(f"Modelo registrado como {version} em models/registry/{version}")
+
+    # cópias fora do registro, usadas pela API quando TITANIC_REGISTRY_DIR não
+    # tem versões
+    export_compact(
+        model,
+        "models/logreg_titanic.compact",
+        metadata={"decision_threshold": decision_threshold},
+    )
+    print("Modelo compacto salvo em models/logreg_titanic.compact")
+    save_reference(drift_reference, "models/drift_reference.json")
+    print("Referência de drift salva em models/drift_reference.json")
+    save_index(neighbor_index)
+    print("Índice de vizinhos salvo em models/knn_index.joblib")
+    if score_dataset is not None:
+        n = materialize(
+            score_dataset,
+            "models/logreg_titanic.joblib",
+            calibration_path=CALIBRATION_PATH,
+        )
+        print(
+            f"Tabela de escores atualizada com {n} passageiros em models/score_table.npy"
+        )
 
 
 if __name__ == "__main__":
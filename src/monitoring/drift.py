@@ -0,0 +1,282 @@
+import json
+import math
+import threading
+from bisect import bisect_right
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+NUMERIC_FIELDS = ["Age", "Fare"]
+CATEGORICAL_FIELDS = ["Sex", "Pclass", "Embarked"]
+MISSING = "__missing__"
+# Categorias que não existem na referência (memória constante por campo)
+OTHER = "__other__"
+
+# Limiares usuais de PSI para classificar o drift
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+
+# Evita log(0) e divisão por zero quando um bucket está vazio
+_EPS = 1e-6
+
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _category_key(value) -> str:
+    if _is_missing(value):
+        return MISSING
+    # Pclass chega como int na API e pode vir como float do CSV
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+class QuantileSketch:
+    """
+    Resumo em memória constante de uma variável numérica.
+
+    Os limites dos buckets são os quantis da distribuição de referência (treino), de
+    forma que cada bucket contém a mesma fração dos dados de referência. Cada
+    atualização é uma busca binária em poucos limites e um incremento, o que permite
+    manter o sketch ligado no caminho da requisição.
+
+    Parâmetros:
+    edges (list[float]): Limites (ordenados) dos buckets.
+    """
+
+    def __init__(self, edges):
+        self.edges = [float(e) for e in edges]
+        self.counts = [0] * (len(self.edges) + 1)
+        self.missing = 0
+
+    def update(self, value):
+        if _is_missing(value):
+            self.missing += 1
+        else:
+            self.counts[bisect_right(self.edges, float(value))] += 1
+
+    def to_dict(self) -> dict:
+        return {
+            "edges": list(self.edges),
+            "counts": list(self.counts),
+            "missing": self.missing,
+        }
+
+
+class CategoricalCounter:
+    """
+    Contagens por categoria, com um bucket dedicado a valores ausentes.
+
+    Com `categories`, apenas essas categorias (e ausentes) têm contagem própria;
+    as demais vão para o bucket `__other__`, de forma que valores arbitrários
+    enviados por clientes não aumentam o uso de memória.
+
+    Parâmetros:
+    categories (list[str] | None): Categorias conhecidas (None = todas).
+    """
+
+    def __init__(self, categories=None):
+        self.categories = None if categories is None else set(categories) | {MISSING}
+        self.counts = {}
+
+    def add(self, value, count=1):
+        key = _category_key(value)
+        if self.categories is not None and key not in self.categories:
+            key = OTHER
+        self.counts[key] = self.counts.get(key, 0) + count
+
+    def update(self, value):
+        self.add(value)
+
+    def to_dict(self) -> dict:
+        return {"counts": dict(self.counts)}
+
+
+def psi(expected, actual) -> float:
+    """
+    Calcula o Population Stability Index entre duas distribuições de contagens.
+
+    Parâmetros:
+    expected (array-like): Contagens da referência por bucket.
+    actual (array-like): Contagens observadas, nos mesmos buckets.
+
+    Retorna:
+    float: PSI (0 = distribuições idênticas).
+    """
+    expected = np.asarray(expected, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+    p = np.clip(expected / max(expected.sum(), 1.0), _EPS, None)
+    q = np.clip(actual / max(actual.sum(), 1.0), _EPS, None)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def ks_statistic(expected, actual) -> float:
+    """
+    Estatística de Kolmogorov-Smirnov calculada sobre os buckets do sketch.
+
+    Como só as contagens por bucket são conhecidas, o valor é a maior diferença
+    entre as CDFs avaliadas nos limites dos buckets (um limite inferior do KS exato).
+    """
+    expected = np.asarray(expected, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+    if expected.sum() == 0 or actual.sum() == 0:
+        return 0.0
+    cdf_expected = np.cumsum(expected) / expected.sum()
+    cdf_actual = np.cumsum(actual) / actual.sum()
+    return float(np.max(np.abs(cdf_expected - cdf_actual)))
+
+
+def _drift_level(value: float) -> str:
+    if value >= PSI_SIGNIFICANT:
+        return "significativo"
+    if value >= PSI_MODERATE:
+        return "moderado"
+    return "estável"
+
+
+def build_reference(df: pd.DataFrame, n_buckets: int = 10) -> dict:
+    """
+    Constrói os resumos de referência a partir dos dados de treino.
+
+    Parâmetros:
+    df (pd.DataFrame): Dados de treino brutos (antes da imputação), com as
+        colunas do `Passenger`; valores ausentes entram no bucket de ausentes.
+    n_buckets (int): Número de buckets por quantis para as variáveis numéricas.
+
+    Retorna:
+    dict: Resumos serializáveis em JSON.
+    """
+    reference = {"n": int(len(df)), "numeric": {}, "categorical": {}}
+
+    quantiles = np.linspace(0, 1, n_buckets + 1)[1:-1]
+    for field in NUMERIC_FIELDS:
+        values = pd.to_numeric(df[field], errors="coerce")
+        present = values.dropna().to_numpy(dtype=float)
+        edges = np.unique(np.quantile(present, quantiles)) if len(present) else []
+        sketch = QuantileSketch(edges)
+        buckets = np.searchsorted(sketch.edges, present, side="right")
+        sketch.counts = np.bincount(buckets, minlength=len(sketch.counts)).tolist()
+        sketch.missing = int(values.isna().sum())
+        reference["numeric"][field] = sketch.to_dict()
+
+    for field in CATEGORICAL_FIELDS:
+        counter = CategoricalCounter()
+        for value, count in df[field].value_counts(dropna=False).items():
+            counter.add(value, int(count))
+        reference["categorical"][field] = counter.to_dict()
+
+    return reference
+
+
+def save_reference(reference: dict, path="models/drift_reference.json"):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(reference, f, indent=2)
+
+
+def load_reference(path="models/drift_reference.json") -> dict | None:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+class DriftMonitor:
+    """
+    Acompanha o tráfego de produção e compara com a referência de treino.
+
+    Mantém um `QuantileSketch` para cada campo numérico e um `CategoricalCounter`
+    para cada campo categórico; o uso de memória não cresce com o número de
+    requisições.
+
+    Parâmetros:
+    reference (dict): Resumos gerados por `build_reference`.
+    """
+
+    def __init__(self, reference: dict):
+        self.reference = reference
+        self._lock = threading.Lock()
+        self.observed = 0
+        self.numeric = {
+            field: QuantileSketch(summary["edges"])
+            for field, summary in reference["numeric"].items()
+        }
+        self.categorical = {
+            field: CategoricalCounter(summary["counts"])
+            for field, summary in reference["categorical"].items()
+        }
+
+    def update(self, record: dict):
+        """Registra um passageiro (dicionário com os campos do `Passenger`)."""
+        with self._lock:
+            self.observed += 1
+            for field, sketch in self.numeric.items():
+                sketch.update(record.get(field))
+            for field, counter in self.categorical.items():
+                counter.update(record.get(field))
+
+    def update_many(self, df: pd.DataFrame):
+        """Registra um lote de passageiros de forma vetorizada."""
+        numeric = {}
+        for field, sketch in self.numeric.items():
+            values = pd.to_numeric(df[field], errors="coerce").to_numpy(dtype=float)
+            present = values[~np.isnan(values)]
+            buckets = np.searchsorted(sketch.edges, present, side="right")
+            numeric[field] = (
+                np.bincount(buckets, minlength=len(sketch.counts)),
+                len(values) - len(present),
+            )
+        categorical = {
+            field: df[field].value_counts(dropna=False) for field in self.categorical
+        }
+
+        with self._lock:
+            self.observed += len(df)
+            for field, (counts, missing) in numeric.items():
+                sketch = self.numeric[field]
+                sketch.counts = [a + int(b) for a, b in zip(sketch.counts, counts)]
+                sketch.missing += missing
+            for field, counts in categorical.items():
+                counter = self.categorical[field]
+                for value, count in counts.items():
+                    counter.add(value, int(count))
+
+    def report(self) -> dict:
+        """Retorna PSI (e KS para campos numéricos) de cada campo."""
+        with self._lock:
+            observed = self.observed
+            numeric = {f: s.to_dict() for f, s in self.numeric.items()}
+            categorical = {f: c.to_dict() for f, c in self.categorical.items()}
+
+        fields = {}
+        if observed == 0:
+            numeric, categorical = {}, {}
+
+        for field, current in numeric.items():
+            ref = self.reference["numeric"][field]
+            expected = ref["counts"] + [ref["missing"]]
+            actual = current["counts"] + [current["missing"]]
+            value = psi(expected, actual)
+            fields[field] = {
+                "psi": value,
+                "ks": ks_statistic(ref["counts"], current["counts"]),
+                "drift": _drift_level(value),
+            }
+
+        for field, current in categorical.items():
+            ref_counts = self.reference["categorical"][field]["counts"]
+            keys = sorted(set(ref_counts) | set(current["counts"]))
+            expected = [ref_counts.get(k, 0) for k in keys]
+            actual = [current["counts"].get(k, 0) for k in keys]
+            value = psi(expected, actual)
+            fields[field] = {"psi": value, "drift": _drift_level(value)}
+
+        return {
+            "reference_size": self.reference["n"],
+            "observed": observed,
+            "fields": fields,
+        }
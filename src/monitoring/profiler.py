@@ -0,0 +1,194 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+PROFILE_DIR = "reports/profiles"
+
+# 100 amostras por segundo: o custo é percorrer as pilhas das threads a cada
+# intervalo, desprezível perto do tempo de uma predição ou de um treino
+DEFAULT_INTERVAL = 0.01
+MAX_DURATION = 600.0
+# Capturas com nome automático mantidas em `output_dir`; as mais antigas são
+# apagadas a cada nova captura
+MAX_FILES = 20
+
+
+class ProfilerBusy(Exception):
+    """Já existe uma captura em andamento."""
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    cwd = os.getcwd() + os.sep
+    if "site-packages" in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[-1]
+    elif filename.startswith(cwd):
+        filename = filename[len(cwd) :]
+    else:
+        # Biblioteca padrão e módulos congelados
+        filename = os.path.basename(filename)
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Profiler por amostragem das pilhas de todas as threads do processo.
+
+    Uma thread em segundo plano lê `sys._current_frames()` a cada `interval`
+    segundos e conta as pilhas observadas (por código de função, sem
+    instrumentar as chamadas). Ao final, grava as pilhas no formato "collapsed"
+    (`thread;func1;func2 N`, uma linha por pilha), aceito por `flamegraph.pl`,
+    speedscope e inferno.
+
+    Sem captura ativa não há nenhum custo, então o profiler pode ficar sempre
+    disponível e ser ligado sob demanda. Cada processo tem suas próprias pilhas:
+    com um pool de inferência, o trabalho dos processos do pool não aparece.
+
+    Parâmetros:
+    output_dir (str): Diretório onde os perfis são gravados.
+    max_files (int): Capturas com nome automático mantidas em `output_dir`.
+    """
+
+    def __init__(self, output_dir=PROFILE_DIR, max_files=MAX_FILES):
+        self.output_dir = Path(output_dir)
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._status = {"running": False}
+        self.last = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration=30.0, interval=DEFAULT_INTERVAL, output=None) -> dict:
+        """
+        Inicia uma captura que termina sozinha após `duration` segundos.
+
+        Parâmetros:
+        duration (float | None): Duração máxima da captura (None = até `stop`).
+        interval (float): Intervalo entre amostras, em segundos.
+        output (str | None): Arquivo de saída; por padrão, um arquivo com data e
+            hora em `output_dir`.
+
+        Retorna:
+        dict: O estado da captura iniciada.
+        """
+        with self._lock:
+            if self.running:
+                raise ProfilerBusy("Já existe uma captura de perfil em andamento.")
+            if output is None:
+                stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+                output = self.output_dir / f"profile-{stamp}-{os.getpid()}.collapsed"
+            self._stop.clear()
+            self._status = {
+                "running": True,
+                "path": str(output),
+                "started_at": datetime.now().isoformat(timespec="seconds"),
+                "duration": duration,
+                "interval": interval,
+                "samples": 0,
+            }
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(duration, interval, Path(output)),
+                name="sampling-profiler",
+                daemon=True,
+            )
+            self._thread.start()
+            return dict(self._status)
+
+    def stop(self) -> dict | None:
+        """
+        Encerra a captura em andamento (se houver) e aguarda a gravação.
+
+        Retorna:
+        dict | None: O estado da última captura.
+        """
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+        return self.last
+
+    def status(self) -> dict:
+        return {**self._status, "last": self.last}
+
+    def _run(self, duration, interval, output):
+        own = threading.get_ident()
+        deadline = None if duration is None else time.monotonic() + duration
+        stacks = Counter()
+        samples = 0
+
+        while not self._stop.wait(interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                codes = []
+                while frame is not None:
+                    codes.append(frame.f_code)
+                    frame = frame.f_back
+                stacks[(ident, tuple(codes))] += 1
+            samples += 1
+            self._status["samples"] = samples
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+
+        self._write(stacks, output)
+        self._prune()
+        self._status["running"] = False
+        self.last = {**self._status, "stacks": len(stacks)}
+
+    def _prune(self):
+        # Só as capturas com nome automático; arquivos passados em `output` ficam
+        try:
+            captures = sorted(
+                self.output_dir.glob("profile-*.collapsed"),
+                key=lambda path: (path.stat().st_mtime, path.name),
+            )
+        except FileNotFoundError:
+            # Outro processo da API apagou um arquivo ao mesmo tempo
+            return
+        for path in captures[: max(len(captures) - self.max_files, 0)]:
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _write(stacks, output):
+        names = {t.ident: t.name for t in threading.enumerate()}
+        labels = {}
+        collapsed = Counter()
+        for (ident, codes), count in stacks.items():
+            frames = [names.get(ident, f"thread-{ident}")]
+            for code in reversed(codes):
+                if code not in labels:
+                    labels[code] = _frame_label(code)
+                frames.append(labels[code])
+            collapsed[";".join(frames)] += count
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "w") as f:
+            for stack, count in collapsed.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+@contextmanager
+def profile(output=None, interval=DEFAULT_INTERVAL, output_dir=PROFILE_DIR):
+    """
+    Perfila o bloco `with` e grava as pilhas ao sair dele.
+
+    Exemplo:
+        with profile("reports/profiles/train.collapsed"):
+            train_and_evaluate()
+    """
+    profiler = SamplingProfiler(output_dir)
+    profiler.start(duration=None, interval=interval, output=output)
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
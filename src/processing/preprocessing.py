@@ -1,5 +1,11 @@
+import os
+
+import numpy as np
 import pandas as pd
 
+AGE_BINS = [0, 12, 18, 60, 80]
+AGE_LABELS = ["Child", "Teen", "Adult", "Senior"]
+
 
 def add_household_features(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -37,9 +43,9 @@ def add_age_group(df: pd.DataFrame) -> pd.DataFrame:
     Retorna:
     df (pd.DataFrame): DataFrame após a adição da coluna 'AgeGroup'.
     """
-    bins = [0, 12, 18, 60, 80]
-    labels = ["Child", "Teen", "Adult", "Senior"]
-    df["AgeGroup"] = pd.cut(df["Age"], bins=bins, labels=labels)
+    # Um lote só com idades ausentes (ex.: um único passageiro sem 'Age') chega
+    # como coluna de objetos; pd.to_numeric a converte para float com NaN
+    df["AgeGroup"] = pd.cut(pd.to_numeric(df["Age"]), bins=AGE_BINS, labels=AGE_LABELS)
     return df
 
 
@@ -66,7 +72,137 @@ def add_alone_x_age_group(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def preprocess(df: pd.DataFrame) -> pd.DataFrame:
+def fill_missing(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Preenche os valores ausentes de 'Age' e 'Fare' com a mediana e de 'Embarked'
+    com a moda.
+
+    Colunas inteiramente ausentes (ex.: um único passageiro sem o campo) não têm
+    mediana nem moda e ficam com nulos, preenchidos depois pelos imputers do
+    pipeline, como no `NumpyEngine`.
+    """
+    for column in ("Age", "Fare"):
+        if column in df.columns:
+            values = pd.to_numeric(df[column])
+            df[column] = (
+                values.fillna(values.median()) if values.notna().any() else values
+            )
+    if "Embarked" in df.columns:
+        mode = df["Embarked"].mode()
+        if mode.empty:
+            # O imputer do pipeline reconhece NaN como ausente, mas não None
+            df["Embarked"] = (
+                df["Embarked"].astype(object).where(df["Embarked"].notna(), np.nan)
+            )
+        else:
+            df["Embarked"] = df["Embarked"].fillna(mode[0])
+    return df
+
+
+class PandasEngine:
+    """Implementação de referência das features, com operações do pandas."""
+
+    name = "pandas"
+
+    add_household_features = staticmethod(add_household_features)
+    add_age_group = staticmethod(add_age_group)
+    add_alone_x_age_group = staticmethod(add_alone_x_age_group)
+    fill_missing = staticmethod(fill_missing)
+
+
+class NumpyEngine:
+    """
+    Implementação das features com NumPy, sem `pd.cut` nem concatenação de strings.
+
+    'AgeGroup' é calculado com `searchsorted` sobre os limites dos grupos (intervalos
+    fechados à direita, como no `pd.cut`) e 'AloneXAgeGroup' como um código inteiro
+    (grupo * 2 + Alone) traduzido por uma tabela de rótulos. Os valores resultantes
+    são os mesmos do `PandasEngine`; 'AgeGroup' é uma coluna de objetos (com NaN
+    para idades ausentes ou fora dos grupos) em vez de categórica.
+    """
+
+    name = "numpy"
+
+    # Rótulos indexados pelo código do grupo; o código -1 (sem grupo) cai em "nan"
+    _age_labels = np.array(AGE_LABELS + [np.nan], dtype=object)
+    _interaction_labels = np.array(
+        [f"{group}_Alone{alone}" for group in AGE_LABELS + ["nan"] for alone in (0, 1)],
+        dtype=object,
+    )
+
+    @staticmethod
+    def _age(df: pd.DataFrame) -> np.ndarray:
+        return df["Age"].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    @staticmethod
+    def _age_codes(age: np.ndarray) -> np.ndarray:
+        # side="left" devolve i tal que AGE_BINS[i-1] < idade <= AGE_BINS[i];
+        # NaN é ordenado ao final e, como idades <= 0 ou > 80, fica sem grupo
+        codes = np.searchsorted(AGE_BINS, age, side="left") - 1
+        codes[(codes < 0) | (codes >= len(AGE_LABELS))] = -1
+        return codes
+
+    def add_household_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        size = df["SibSp"].to_numpy() + df["Parch"].to_numpy() + 1
+        df["HouseholdSize"] = size
+        df["IsAlone"] = (size == 1).astype(int)
+        return df
+
+    def add_age_group(self, df: pd.DataFrame) -> pd.DataFrame:
+        df["AgeGroup"] = self._age_labels[self._age_codes(self._age(df))]
+        return df
+
+    def add_alone_x_age_group(self, df: pd.DataFrame) -> pd.DataFrame:
+        alone = (df["HouseholdSize"].to_numpy() == 1).astype(int)
+        codes = self._age_codes(self._age(df))
+        codes[codes < 0] = len(AGE_LABELS)
+        df["Alone"] = alone
+        df["AloneXAgeGroup"] = self._interaction_labels[codes * 2 + alone]
+        return df
+
+    def fill_missing(self, df: pd.DataFrame) -> pd.DataFrame:
+        for column in ("Age", "Fare"):
+            if column in df.columns:
+                values = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                missing = np.isnan(values)
+                if missing.any() and not missing.all():
+                    values = np.where(missing, np.median(values[~missing]), values)
+                df[column] = values
+        if "Embarked" in df.columns:
+            values = df["Embarked"].to_numpy(dtype=object)
+            missing = df["Embarked"].isna().to_numpy()
+            if missing.all():
+                # O imputer do pipeline reconhece NaN como ausente, mas não None
+                df["Embarked"] = np.full(len(values), np.nan, dtype=object)
+            elif missing.any():
+                # Em caso de empate, np.unique (ordenado) devolve o menor valor,
+                # como `Series.mode()[0]`
+                ports, counts = np.unique(
+                    values[~missing].astype(str), return_counts=True
+                )
+                values = np.where(missing, ports[counts.argmax()], values)
+                df["Embarked"] = values
+        return df
+
+
+ENGINES = {engine.name: engine for engine in (PandasEngine(), NumpyEngine())}
+
+# Engine usado quando `preprocess` é chamado sem `engine` (ex.: pela API)
+DEFAULT_ENGINE = os.environ.get("TITANIC_PREPROCESS_ENGINE", "pandas")
+
+
+def get_engine(name: str | None = None):
+    """Retorna o engine de features pelo nome ('pandas' ou 'numpy')."""
+    name = name or DEFAULT_ENGINE
+    if name not in ENGINES:
+        raise ValueError(
+            f"Engine de pré-processamento desconhecido: '{name}'. "
+            f"Opções: {sorted(ENGINES)}"
+        )
+    return ENGINES[name]
+
+
+def preprocess(df: pd.DataFrame, engine: str | None = None) -> pd.DataFrame:
     """
     Realiza o pré-processamento do DataFrame fornecido.
 
@@ -75,37 +211,33 @@ def preprocess(df: pd.DataFrame) -> pd.DataFrame:
 
     Parâmetros:
     df (pd.DataFrame): DataFrame original a ser pré-processado.
+    engine (str, opcional): 'pandas' ou 'numpy'. Por padrão, o valor de
+    TITANIC_PREPROCESS_ENGINE (ou 'pandas').
 
     Retorna:
     df (pd.DataFrame): DataFrame após o pré-processamento.
     """
-    df = add_household_features(df)
-    df = add_age_group(df)
-    df = add_alone_x_age_group(df)
-
-    if "Age" in df.columns:
-        df["Age"] = df["Age"].fillna(df["Age"].median())
-    if "Embarked" in df.columns:
-        df["Embarked"] = df["Embarked"].fillna(df["Embarked"].mode()[0])
-    if "Fare" in df.columns:
-        df["Fare"] = df["Fare"].fillna(df["Fare"].median())
-    return df
+    engine = get_engine(engine)
+    df = engine.add_household_features(df)
+    df = engine.add_age_group(df)
+    df = engine.add_alone_x_age_group(df)
+    return engine.fill_missing(df)
 
 
-def main():
+def main(engine: str | None = None):
     from pathlib import Path
 
     Path("data/processed").mkdir(parents=True, exist_ok=True)
 
     df_train = pd.read_csv("data/raw/train.csv")
-    df_train_processed = preprocess(df_train)
+    df_train_processed = preprocess(df_train, engine)
     df_train_processed.to_csv("data/processed/train_processed.csv", index=False)
     print(
         "Dados de treino pré-processados e salvos em data/processed/train_processed.csv"
     )
 
     df_test = pd.read_csv("data/raw/test.csv")
-    df_test_processed = preprocess(df_test)
+    df_test_processed = preprocess(df_test, engine)
     df_test_processed.to_csv("data/processed/test_processed.csv", index=False)
     print(
         "Dados de teste pré-processados e salvos em data/processed/test_processed.csv"
@@ -1,10 +1,20 @@
+import json
+
+import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 import streamlit as st
 
-# API endpoint
-API_URL = "http://127.0.0.1:8000/predict"
+# API endpoints
+API_BASE_URL = "http://127.0.0.1:8000"
+API_URL = f"{API_BASE_URL}/predict"
+BATCH_API_URL = f"{API_BASE_URL}/predict/batch"
+SWEEP_API_URL = f"{API_BASE_URL}/predict/sweep"
+JSON_HEADERS = {"Content-Type": "application/json"}
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -15,16 +25,155 @@ st.set_page_config(
 
 
 # --- Functions ---
-def get_prediction(passenger_data):
-    """Faz uma requisição para a API e retorna a predição."""
+@st.cache_resource
+def get_session():
+    """Sessão HTTP persistente, compartilhada entre os reruns do Streamlit.
+
+    Reaproveita conexões keep-alive em vez de abrir uma nova a cada requisição.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=10,
+        max_retries=Retry(total=2, connect=2, read=0, backoff_factor=0.2),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_data(ttl=5, show_spinner=False)
+def get_api_status():
+    """Verifica se a API está online e retorna a versão do modelo carregado.
+
+    O resultado fica em cache por alguns segundos para não repetir o health check
+    a cada interação com os widgets.
+    """
     try:
-        response = requests.post(API_URL, json=passenger_data)
-        response.raise_for_status()  # Gera uma exceção para códigos de status ruins
-        return response.json()
+        response = get_session().get(f"{API_BASE_URL}/", timeout=3)
+        response.raise_for_status()
+        return {"online": True, "model_version": response.json().get("model_version")}
+    except requests.exceptions.RequestException:
+        return {"online": False, "model_version": None}
+
+
+def _canonical(payload):
+    """Serializa o payload de forma determinística para servir de chave de cache."""
+    return json.dumps(payload, sort_keys=True)
+
+
+def _model_params(model_version):
+    """Fixa a versão na requisição (`?model=`), para que a resposta corresponda à
+    chave de cache; sem ela, a API pode responder com uma versão canário."""
+    return {"model": model_version} if model_version else None
+
+
+@st.cache_data(max_entries=1024, show_spinner=False)
+def _cached_prediction(payload_json, model_version):
+    response = get_session().post(
+        API_URL,
+        data=payload_json,
+        headers=JSON_HEADERS,
+        params=_model_params(model_version),
+        timeout=10,
+    )
+    response.raise_for_status()  # Gera uma exceção para códigos de status ruins
+    return response.json()
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _cached_batch_prediction(payloads_json, model_version):
+    response = get_session().post(
+        BATCH_API_URL,
+        data=payloads_json,
+        headers=JSON_HEADERS,
+        params=_model_params(model_version),
+        timeout=10,
+    )
+    response.raise_for_status()
+    return response.json()["survival_probabilities"]
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _cached_sweep(request_json, model_version):
+    response = get_session().post(
+        SWEEP_API_URL,
+        data=request_json,
+        headers=JSON_HEADERS,
+        params=_model_params(model_version),
+        timeout=10,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def get_prediction(passenger_data, model_version=None):
+    """Faz uma requisição para a API e retorna a predição.
+
+    Resultados ficam em cache por payload e versão do modelo; erros não são cacheados.
+    """
+    try:
+        return _cached_prediction(_canonical(passenger_data), model_version)
     except requests.exceptions.RequestException as e:
         return {"error": str(e)}
 
 
+def get_batch_predictions(passengers, model_version=None):
+    """Prevê vários passageiros em uma única requisição ao endpoint de lote."""
+    try:
+        probs = _cached_batch_prediction(_canonical(passengers), model_version)
+        return [{"survival_probability": prob} for prob in probs]
+    except requests.exceptions.RequestException as e:
+        return [{"error": str(e)} for _ in passengers]
+
+
+def get_sweep(passenger_data, model_version=None, steps=100):
+    """Avalia o passageiro em uma grade Idade × Tarifa com uma única requisição."""
+    # Age e Fare são substituídos pela grade; removê-los da chave evita refazer a
+    # varredura quando apenas esses sliders mudam.
+    request = {
+        "passenger": {**passenger_data, "Age": None, "Fare": None},
+        "age_min": 0.0,
+        "age_max": 80.0,
+        "age_steps": steps,
+        "fare_min": 0.0,
+        "fare_max": 300.0,
+        "fare_steps": steps,
+    }
+    try:
+        return _cached_sweep(_canonical(request), model_version)
+    except requests.exceptions.RequestException as e:
+        return {"error": str(e)}
+
+
+def display_sweep(sweep, container):
+    """Renderiza a grade de probabilidades como um mapa de calor."""
+    if "error" in sweep:
+        container.error(f"Erro ao calcular a sensibilidade: {sweep['error']}")
+        return
+
+    ages = np.asarray(sweep["ages"])
+    fares = np.asarray(sweep["fares"])
+    probs = np.asarray(sweep["survival_probabilities"])
+
+    fig, ax = plt.subplots(figsize=(4, 3.2))
+    image = ax.imshow(
+        probs,
+        origin="lower",
+        aspect="auto",
+        extent=(fares[0], fares[-1], ages[0], ages[-1]),
+        cmap="RdYlGn",
+        vmin=0.0,
+        vmax=1.0,
+    )
+    ax.set_xlabel("Tarifa ($)")
+    ax.set_ylabel("Idade")
+    fig.colorbar(image, ax=ax, label="Sobrevivência")
+    fig.tight_layout()
+    container.pyplot(fig)
+    plt.close(fig)
+
+
 def display_prediction(prediction, header):
     """Exibe o resultado da predição em um formato agradável."""
     st.subheader(header)
@@ -157,20 +306,24 @@ with st.expander("Clique para ver a Tese de Negócio e as Hipóteses do Projeto"
 st.header("Casos de Teste Pré-definidos")
 
 # Verifica se a API está online antes de prosseguir
-try:
-    requests.get("http://127.0.0.1:8000/", timeout=3)
-except requests.ConnectionError:
+api_status = get_api_status()
+if not api_status["online"]:
     st.error(
         "A API de predição não parece estar rodando. Por favor, inicie-a com o comando `titanic-insights api` em outro terminal antes de continuar."
     )
     st.stop()
 
+model_version = api_status["model_version"]
+
+# Todos os casos são avaliados em uma única requisição em lote
+case_predictions = get_batch_predictions(list(predefined_cases.values()), model_version)
+
 # Layout em colunas para os casos
 cols = st.columns(len(predefined_cases))
 for i, (name, data) in enumerate(predefined_cases.items()):
     with cols[i]:
         st.info(f"**{name}**")
-        prediction = get_prediction(data)
+        prediction = case_predictions[i]
 
         prob_float = float(prediction.get("survival_probability", 0))
         st.metric(label="Sobrevivência", value=f"{prob_float:.0%}")
@@ -208,5 +361,10 @@ custom_passenger = {
 }
 
 if st.sidebar.button("Verificar Sobrevivência"):
-    prediction = get_prediction(custom_passenger)
+    prediction = get_prediction(custom_passenger, model_version)
     display_prediction(prediction, "Resultado da Predição para Passageiro Customizado")
+
+st.sidebar.subheader("Sensibilidade Idade × Tarifa")
+if st.sidebar.checkbox("Mostrar mapa de calor", key="show_sweep"):
+    sweep = get_sweep(custom_passenger, model_version)
+    display_sweep(sweep, st.sidebar)
@@ -0,0 +1,69 @@
+"""
+Benchmarks dos caminhos críticos do pipeline e da API.
+
+Execute com `pytest tests/benchmarks --benchmark`. Os tempos (melhor de N),
+divididos pelo de uma carga de referência medida na mesma sessão, são comparados
+com as razões de `baselines.json`; use `--benchmark-update` para regravá-las e
+`--benchmark-threshold` (ou BENCHMARK_THRESHOLD) para ajustar a tolerância.
+"""
+
+import pytest
+
+from src.data.synthetic import synthetic_passengers, synthetic_payloads
+from src.model.train import build_pipeline
+from src.processing.preprocessing import preprocess
+from tests.conftest import DROP_COLUMNS
+
+pytestmark = pytest.mark.benchmark
+
+
+@pytest.fixture(scope="module")
+def training_data():
+    df = preprocess(synthetic_passengers(10_000, seed=0))
+    return df.drop(columns=DROP_COLUMNS), df["Survived"]
+
+
+@pytest.fixture(scope="module")
+def fitted_model(training_data):
+    X, y = training_data
+    return build_pipeline().fit(X, y)
+
+
+@pytest.mark.parametrize("rows", [1_000, 100_000, 1_000_000])
+def test_preprocess(bench, rows):
+    raw = synthetic_passengers(rows, seed=1, labeled=False)
+    rounds = 5 if rows < 1_000_000 else 3
+    bench(f"preprocess[{rows}]", preprocess, setup=raw.copy, rounds=rounds)
+
+
+def test_pipeline_fit(bench, training_data):
+    X, y = training_data
+    bench("build_pipeline.fit[10000]", lambda: build_pipeline().fit(X, y), rounds=7)
+
+
+def test_predict_proba_single(bench, fitted_model, training_data):
+    row = training_data[0].iloc[:1]
+    bench("predict_proba[1]", lambda: fitted_model.predict_proba(row), rounds=50)
+
+
+def test_predict_proba_batch(bench, fitted_model, training_data):
+    X = training_data[0]
+    bench("predict_proba[10000]", lambda: fitted_model.predict_proba(X), rounds=10)
+
+
+def test_api_predict(bench, fitted_model, monkeypatch):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    import src.api.api as api
+
+    monkeypatch.setattr(api, "model", fitted_model)
+    monkeypatch.setattr(api, "model_version", "benchmark")
+    # Sem o startup a thread do log não roda; desliga o enfileiramento
+    monkeypatch.setattr(api.request_log, "log", lambda *args, **kwargs: None)
+    payload = synthetic_payloads(1, seed=2)[0]
+    payload["Age"] = payload["Age"] or 30.0
+
+    client = TestClient(api.app)
+    assert client.post("/predict", json=payload).status_code == 200
+    bench("api./predict", lambda: client.post("/predict", json=payload), rounds=50)
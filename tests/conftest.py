@@ -0,0 +1,178 @@
+import json
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+BASELINES_PATH = Path(__file__).parent / "benchmarks" / "baselines.json"
+# Colunas do dataset pré-processado que não são features do modelo
+DROP_COLUMNS = ["Survived", "PassengerId", "Name", "Ticket", "Cabin"]
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark", "Benchmarks de desempenho")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Executa os benchmarks (marcados com @pytest.mark.benchmark).",
+    )
+    group.addoption(
+        "--benchmark-update",
+        action="store_true",
+        default=False,
+        help="Regrava os baselines com os tempos medidos nesta execução.",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=float(os.environ.get("BENCHMARK_THRESHOLD", "0.5")),
+        help="Regressão relativa tolerada sobre o baseline (0.5 = 50%%).",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: benchmark de desempenho (executado com --benchmark)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark") or config.getoption("--benchmark-update"):
+        return
+    skip = pytest.mark.skip(reason="use --benchmark para executar os benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def _reference_workload():
+    # Carga fixa (NumPy e Python puro) usada como unidade de tempo da máquina
+    values = np.random.default_rng(0).random(200_000)
+    np.sort(values)
+    sum(i * i for i in range(100_000))
+
+
+def _best_of(func, rounds=5, min_time=0.2, setup=None) -> float:
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < rounds or time.perf_counter() - started < min_time:
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        func(arg) if setup is not None else func()
+        timings.append(time.perf_counter() - start)
+        if len(timings) >= 1000:
+            break
+    return min(timings)
+
+
+class BenchmarkRunner:
+    """
+    Mede uma função (melhor de N execuções) e compara com o baseline salvo.
+
+    Os baselines não guardam segundos, e sim a razão entre o tempo do benchmark e
+    o de uma carga de referência medida na mesma sessão, de forma que o mesmo
+    arquivo vale para máquinas de velocidades diferentes.
+
+    `setup`, se informado, é chamado antes de cada execução, fora da medição, e
+    seu retorno é passado para a função medida.
+    """
+
+    def __init__(self, baselines, threshold, results, reference):
+        self.baselines = baselines
+        self.threshold = threshold
+        self.results = results
+        self.reference = reference
+
+    def __call__(self, name, func, setup=None, rounds=5, min_time=0.2):
+        best = _best_of(func, rounds=rounds, min_time=min_time, setup=setup)
+        ratio = best / self.reference
+        self.results[name] = (best, ratio)
+        baseline = self.baselines.get(name)
+        if baseline is not None and ratio > baseline * (1 + self.threshold):
+            pytest.fail(
+                f"{name}: {best * 1000:.3f} ms ({ratio:.2f}x a referência) excede "
+                f"o baseline de {baseline:.2f}x em mais de {self.threshold:.0%}"
+            )
+        return best
+
+
+_session_results = {}
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _session_results:
+        return
+    baselines = _load_baselines()
+    terminalreporter.section("benchmarks")
+    for name, (seconds, ratio) in sorted(_session_results.items()):
+        baseline = baselines.get(name)
+        delta = f"{ratio / baseline - 1:+.0%}" if baseline else "sem baseline"
+        terminalreporter.write_line(
+            f"{name:<32} {seconds * 1000:>10.3f} ms {ratio:>9.2f}x  ({delta})"
+        )
+
+
+@pytest.fixture(scope="session")
+def benchmark_reference() -> float:
+    """Tempo (melhor de N) da carga de referência nesta máquina."""
+    return _best_of(_reference_workload, rounds=30, min_time=1.0)
+
+
+@pytest.fixture(scope="session")
+def benchmark_results(request):
+    results = _session_results
+    yield results
+    if request.config.getoption("--benchmark-update") and results:
+        baselines = _load_baselines()
+        baselines.update({name: round(r, 3) for name, (_, r) in results.items()})
+        BASELINES_PATH.write_text(
+            json.dumps(baselines, indent=2, sort_keys=True) + "\n"
+        )
+
+
+@pytest.fixture
+def bench(request, benchmark_results, benchmark_reference):
+    update = request.config.getoption("--benchmark-update")
+    return BenchmarkRunner(
+        baselines={} if update else _load_baselines(),
+        threshold=request.config.getoption("--benchmark-threshold"),
+        results=benchmark_results,
+        reference=benchmark_reference,
+    )
+
+
+def _load_baselines() -> dict:
+    if BASELINES_PATH.exists():
+        return json.loads(BASELINES_PATH.read_text())
+    return {}
+
+
+def fit_pipeline(rows=300, seed=9):
+    """
+    Treina o pipeline de `build_pipeline` com passageiros sintéticos.
+
+    Retorna:
+    tuple: (pipeline treinado, X, y, DataFrame pré-processado completo).
+    """
+    from src.data.synthetic import synthetic_passengers
+    from src.model.train import build_pipeline
+    from src.processing.preprocessing import preprocess
+
+    df = preprocess(synthetic_passengers(rows, seed=seed))
+    X, y = df.drop(columns=DROP_COLUMNS), df["Survived"]
+    return build_pipeline().fit(X, y), X, y, df
+
+
+@pytest.fixture(scope="module")
+def training_params() -> dict:
+    """Argumentos de `fit_pipeline` para `trained_pipeline`; sobrescreva no módulo."""
+    return {}
+
+
+@pytest.fixture(scope="module")
+def trained_pipeline(training_params):
+    """Pipeline treinado uma vez por módulo: (pipeline, X, y, df)."""
+    return fit_pipeline(**training_params)
@@ -0,0 +1,291 @@
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import src.api.api as api
+from src.api import columnar
+from src.api.inference import InferenceExecutor
+from src.model import neighbors
+from src.model.registry import ModelRegistry, ModelRouter
+from src.monitoring.profiler import SamplingProfiler
+from src.processing.preprocessing import preprocess
+from tests.conftest import fit_pipeline
+from tests.test_score_table import write_table
+
+PASSENGER = {
+    "Pclass": 3,
+    "Sex": "male",
+    "Age": 22.0,
+    "SibSp": 0,
+    "Parch": 0,
+    "Fare": 7.25,
+    "Embarked": "S",
+}
+
+
+@pytest.fixture(scope="module")
+def training_params():
+    return {"rows": 500, "seed": 8}
+
+
+@pytest.fixture(scope="module")
+def trained(trained_pipeline):
+    return trained_pipeline[0]
+
+
+@pytest.fixture
+def client(trained, monkeypatch):
+    # Sem o startup: o modelo padrão é injetado e o log de requisições desligado
+    monkeypatch.setattr(api, "model", trained)
+    monkeypatch.setattr(api, "model_version", "test")
+    monkeypatch.setattr(api.request_log, "log", lambda *args, **kwargs: None)
+    return TestClient(api.app)
+
+
+@pytest.mark.parametrize("field", ["Age", "Fare", "Embarked"])
+def test_predict_single_passenger_with_missing_field(client, field):
+    response = client.post("/predict", json={**PASSENGER, field: None})
+
+    assert response.status_code == 200
+    assert 0.0 < response.json()["survival_probability"] < 1.0
+
+
+def test_missing_embarked_uses_the_training_mode(client, trained):
+    # O imputer do pipeline preenche o porto ausente com a moda do treino
+    mode = trained[0].named_transformers_["cat"][0].statistics_[1]
+    missing = client.post("/predict", json={**PASSENGER, "Embarked": None})
+    filled = client.post("/predict", json={**PASSENGER, "Embarked": mode})
+
+    assert missing.json()["survival_probability"] == pytest.approx(
+        filled.json()["survival_probability"]
+    )
+
+
+def test_model_input_errors_are_422(client, monkeypatch):
+    class RejectingModel:
+        def predict_proba(self, df):
+            raise ValueError("entrada incompatível com o modelo")
+
+    monkeypatch.setattr(api, "model", RejectingModel())
+    response = client.post("/predict", json=PASSENGER)
+
+    assert response.status_code == 422
+    assert "incompatível" in response.json()["detail"]
+
+
+def test_model_query_accepts_the_unregistered_default(client, monkeypatch):
+    # O app do Streamlit fixa a versão informada por GET /, que pode ser o hash
+    # do modelo fora do registro
+    monkeypatch.setattr(api, "router", ModelRouter(routes={"v9": 100}))
+    version = client.get("/").json()["model_version"]
+    response = client.post(f"/predict?model={version}", json=PASSENGER)
+
+    assert response.status_code == 200
+    assert response.json()["model_version"] == "test"
+
+
+def test_unregistered_model_uses_the_saved_threshold(client, tmp_path, monkeypatch):
+    # Sem versão no registro, o limiar vem do JSON salvo ao lado do .joblib
+    threshold_path = tmp_path / "decision_threshold.json"
+    threshold_path.write_text(json.dumps({"decision_threshold": 0.3729}))
+    monkeypatch.setattr(api, "threshold_path", threshold_path)
+    monkeypatch.setattr(api, "_version_settings", {})
+
+    response = client.post("/predict", json=PASSENGER).json()
+
+    assert response["decision_threshold"] == pytest.approx(0.3729)
+    assert response["survival_prediction"] == (
+        response["survival_probability"] >= 0.3729
+    )
+
+
+def test_by_id_without_a_loaded_model_uses_the_global_table(tmp_path, monkeypatch):
+    # A tabela de escores não depende do modelo: sem modelo, usa a cópia global
+    write_table(tmp_path / "score_table.npy", [892, 893], [0.1, 0.8])
+    monkeypatch.setattr(api, "model", None)
+    monkeypatch.setattr(api, "model_version", None)
+    monkeypatch.setattr(api, "score_table_path", tmp_path / "score_table.npy")
+    monkeypatch.setattr(api, "threshold_path", tmp_path / "decision_threshold.json")
+    for cache in ("_version_settings", "_score_tables"):
+        monkeypatch.setattr(api, cache, {})
+
+    response = TestClient(api.app).get("/predict/893")
+
+    assert response.status_code == 200
+    assert response.json()["survival_probability"] == pytest.approx(0.8)
+    assert response.json()["decision_threshold"] == 0.5
+
+
+@pytest.fixture
+def registered(trained, tmp_path, monkeypatch):
+    """Registro com v1 (modelo padrão) e v2 (treinado com outros dados)."""
+    other, X, y, _ = fit_pipeline(rows=500, seed=21)
+    registry = ModelRegistry(tmp_path / "registry")
+    registry.register(trained)
+    registry.register(other, neighbor_index=neighbors.build_index(other, X, y))
+
+    monkeypatch.setattr(api, "registry", registry)
+    monkeypatch.setattr(api, "model_version", "v1")
+    monkeypatch.setattr(api, "inference", InferenceExecutor(workers=0))
+    monkeypatch.setattr(api, "router", ModelRouter(shadow=["v2"]))
+    for cache in ("_version_settings", "_score_tables", "_neighbor_indexes"):
+        monkeypatch.setattr(api, cache, {})
+    return trained, other
+
+
+def test_shadow_scoring_compares_with_the_served_version(registered):
+    served, shadow = registered
+    df = preprocess(pd.DataFrame([PASSENGER]))
+    primary = served.predict_proba(df)[:, 1].tolist()
+
+    async def main():
+        api._schedule_shadow([PASSENGER], primary, "v2")
+        assert not api._shadow_tasks
+        api._schedule_shadow([PASSENGER], primary, "v1")
+        await asyncio.gather(*api._shadow_tasks)
+
+    asyncio.run(main())
+    stats = api.router.stats()["shadow"]["v2"]
+    assert stats["scored"] == 1 and stats["errors"] == 0
+    assert stats["mean_abs_diff"] == pytest.approx(
+        abs(primary[0] - shadow.predict_proba(df)[0, 1])
+    )
+
+
+def test_shadow_scoring_never_takes_the_last_slots(registered, monkeypatch):
+    # Com max_pending=1 a cota da sombra (metade da fila) é zero: descarta
+    monkeypatch.setattr(api, "inference", InferenceExecutor(workers=0, max_pending=1))
+    asyncio.run(api._shadow_score("v2", [PASSENGER], [0.5], "v1"))
+
+    assert api.router.stats()["shadow"]["v2"]["dropped"] == 1
+    assert api.inference.counters["rejected"] == 1
+
+
+def test_model_query_routes_every_prediction_endpoint(client, registered):
+    _, other = registered
+    grid = {"passenger": PASSENGER, "age_steps": 3, "fare_steps": 2}
+
+    sweep = client.post("/predict/sweep?model=v2", json=grid).json()
+    default = client.post("/predict/sweep", json=grid).json()
+    similar = client.post("/predict/similar?model=latest", json=[PASSENGER])
+
+    assert sweep["model_version"] == "v2" and default["model_version"] == "v1"
+    assert sweep["survival_probabilities"] != default["survival_probabilities"]
+    df = preprocess(pd.DataFrame([{**PASSENGER, "Age": 0.0, "Fare": 0.0}]))
+    assert sweep["survival_probabilities"][0][0] == pytest.approx(
+        other.predict_proba(df)[0, 1]
+    )
+    assert similar.status_code == 200
+    assert similar.json()[0]["model_version"] == "v2"
+    # v1 foi registrada sem índice de vizinhos
+    assert client.post("/predict/similar?model=v1", json=[PASSENGER]).status_code == 503
+
+
+def test_model_query_on_columnar_and_by_id(client, registered):
+    buffer = io.BytesIO()
+    np.savez(
+        buffer,
+        **{k: np.array([v]) for k, v in PASSENGER.items()},
+    )
+    response = client.post(
+        "/predict/batch/columnar?model=v2",
+        content=buffer.getvalue(),
+        headers={"content-type": columnar.NPZ_MEDIA_TYPE},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["x-model-version"] == "v2"
+    assert client.get("/predict/892?model=v9").status_code == 404
+    # v2 não tem tabela de escores: 503 em vez da tabela de outra versão
+    by_id = client.get("/predict/892?model=v2")
+    assert by_id.status_code == 503 and "v2" in by_id.json()["detail"]
+
+
+def test_direct_model_endpoints_go_through_the_inference_queue(client, monkeypatch):
+    # Sem vagas na fila, as predições vetorizadas também respondem 429
+    monkeypatch.setattr(api, "inference", InferenceExecutor(workers=0, max_pending=0))
+    monkeypatch.setattr(api, "_neighbor_indexes", {"test": {}})
+    grid = {"passenger": PASSENGER, "age_steps": 3, "fare_steps": 2}
+    buffer = io.BytesIO()
+    np.savez(buffer, **{k: np.array([v]) for k, v in PASSENGER.items()})
+
+    responses = [
+        client.post("/predict/sweep", json=grid),
+        client.post("/predict/similar", json=[PASSENGER]),
+        client.post(
+            "/predict/batch/columnar",
+            content=buffer.getvalue(),
+            headers={"content-type": columnar.NPZ_MEDIA_TYPE},
+        ),
+    ]
+
+    assert [r.status_code for r in responses] == [429, 429, 429]
+    assert all(r.headers["retry-after"] == api.retry_after for r in responses)
+    assert api.inference.counters["rejected"] == 3
+
+
+def test_columnar_batch_size_is_capped(client, monkeypatch):
+    buffer = io.BytesIO()
+    np.savez(buffer, **{k: np.array([v, v]) for k, v in PASSENGER.items()})
+
+    def post():
+        return client.post(
+            "/predict/batch/columnar",
+            content=buffer.getvalue(),
+            headers={"content-type": columnar.NPZ_MEDIA_TYPE},
+        )
+
+    monkeypatch.setattr(api, "max_columnar_rows", 1)
+    assert post().status_code == 413
+    monkeypatch.setattr(api, "max_columnar_rows", 2)
+    assert post().status_code == 200
+    monkeypatch.setattr(api, "max_columnar_bytes", 100)
+    assert post().status_code == 413
+
+
+def test_profiler_routes_are_not_registered_by_default(client):
+    assert not api.profiler_enabled
+    for method in ("get", "post", "delete"):
+        assert getattr(client, method)("/admin/profile").status_code == 404
+    assert not api.profiler.running
+
+
+def test_profiler_routes_when_enabled(tmp_path, monkeypatch):
+    # Mesmo roteador que a API inclui com TITANIC_ENABLE_PROFILER=1
+    monkeypatch.setattr(api, "profiler", SamplingProfiler(tmp_path))
+    app = FastAPI()
+    app.include_router(api.admin_router)
+    client = TestClient(app)
+
+    started = client.post("/admin/profile", params={"duration": 5})
+    busy = client.post("/admin/profile")
+    stopped = client.delete("/admin/profile")
+
+    assert started.status_code == 200 and busy.status_code == 409
+    assert stopped.json()["last"]["path"] == started.json()["path"]
+    assert client.post("/admin/profile", params={"duration": 0}).status_code == 422
+
+
+@pytest.mark.parametrize("flag, expected", [("1", True), ("0", False)])
+def test_profiler_flag(flag, expected):
+    code = "import src.api.api as a; print('/admin/profile' in [r.path for r in a.app.routes])"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        env={**os.environ, "TITANIC_ENABLE_PROFILER": flag},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == str(expected)
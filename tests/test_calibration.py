@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from src.model.calibration import CalibrationTable, fit_calibration
+
+
+@pytest.fixture
+def dataset():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(2_000, 3))
+    y = (X @ [1.5, -1.0, 0.5] + rng.normal(size=2_000)) > 0
+    return X, y.astype(int)
+
+
+@pytest.mark.parametrize("method", ["isotonic", "sigmoid"])
+def test_table_is_monotonic(dataset, method):
+    X, y = dataset
+    table = fit_calibration(LogisticRegression(), X, y, method=method)
+    grid = np.linspace(0.0, 1.0, 501)
+    calibrated = table.apply(grid)
+    assert np.all(np.diff(calibrated) >= 0)
+    assert calibrated.min() >= 0.0 and calibrated.max() <= 1.0
+
+
+def test_save_and_load_roundtrip(tmp_path, dataset):
+    X, y = dataset
+    table = fit_calibration(LogisticRegression(), X, y, method="sigmoid")
+    table.save(tmp_path / "calibration.json")
+    loaded = CalibrationTable.load(tmp_path / "calibration.json")
+    assert loaded.method == "sigmoid"
+    np.testing.assert_allclose(
+        loaded.apply([0.1, 0.5, 0.9]), table.apply([0.1, 0.5, 0.9])
+    )
+    assert CalibrationTable.load(tmp_path / "ausente.json") is None
+
+
+def test_unknown_method_is_rejected(dataset):
+    with pytest.raises(ValueError):
+        fit_calibration(LogisticRegression(), *dataset, method="beta")
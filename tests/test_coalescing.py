@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from src.api.inference import RequestCoalescer
+
+
+def test_identical_requests_share_one_computation():
+    coalescer = RequestCoalescer()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [0.42]
+
+    async def main():
+        return await asyncio.gather(
+            *(coalescer.run("a", compute) for _ in range(5)),
+            coalescer.run("b", compute),
+        )
+
+    results = asyncio.run(main())
+    assert results == [[0.42]] * 6
+    assert len(calls) == 2
+    assert coalescer.stats() == {
+        "requests": 6,
+        "computed": 2,
+        "coalesced": 4,
+        "in_flight": 0,
+    }
+
+
+def test_errors_reach_every_waiter_and_release_the_key():
+    coalescer = RequestCoalescer()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("falhou")
+
+    async def main():
+        return await asyncio.gather(
+            *(coalescer.run("a", fail) for _ in range(3)), return_exceptions=True
+        )
+
+    assert all(isinstance(r, RuntimeError) for r in asyncio.run(main()))
+    assert coalescer.stats()["in_flight"] == 0
+
+
+def test_cancelled_waiter_does_not_cancel_the_computation():
+    coalescer = RequestCoalescer()
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        return [0.1]
+
+    async def main():
+        first = asyncio.ensure_future(coalescer.run("a", compute))
+        second = asyncio.ensure_future(coalescer.run("a", compute))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == [0.1]
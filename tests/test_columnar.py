@@ -0,0 +1,107 @@
+import io
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from src.api import columnar
+
+COLUMNS = {
+    "Pclass": np.array([1, 3]),
+    "Sex": np.array(["female", "male"]),
+    "Age": np.array([38.0, np.nan]),
+    "SibSp": np.array([1, 0]),
+    "Parch": np.array([0, 0]),
+    "Fare": np.array([71.28, 7.25]),
+    "Embarked": np.array(["C", ""]),
+}
+
+
+def npz_payload(columns):
+    buffer = io.BytesIO()
+    np.savez(buffer, **columns)
+    return buffer.getvalue()
+
+
+def arrow_payload(table, media_type):
+    buffer = io.BytesIO()
+    if media_type == columnar.ARROW_STREAM_MEDIA_TYPE:
+        writer = pa.ipc.new_stream(buffer, table.schema)
+    else:
+        writer = pa.ipc.new_file(buffer, table.schema)
+    with writer:
+        writer.write_table(table)
+    return buffer.getvalue()
+
+
+def test_valid_npz_payload():
+    columns = columnar.read_payload(npz_payload(COLUMNS), columnar.NPZ_MEDIA_TYPE)
+    df = columnar.to_frame(columns)
+    assert list(df.columns) == columnar.PASSENGER_FIELDS
+    assert df["Embarked"].tolist() == ["C", None]
+    assert np.isnan(df.loc[1, "Age"])
+    assert df["Pclass"].dtype == np.int64
+
+
+@pytest.mark.parametrize(
+    "media_type", [columnar.ARROW_STREAM_MEDIA_TYPE, columnar.ARROW_FILE_MEDIA_TYPE]
+)
+def test_valid_arrow_payload(media_type):
+    table = pa.table(
+        {
+            "Pclass": [1, 3],
+            "Sex": ["female", "male"],
+            "Age": [38.0, None],
+            "SibSp": [1, 0],
+            "Parch": [0, 0],
+            "Embarked": ["C", None],
+        }
+    )
+    df = columnar.to_frame(
+        columnar.read_payload(arrow_payload(table, media_type), media_type)
+    )
+    assert len(df) == 2
+    assert df["Embarked"].tolist() == ["C", None]
+    # Campo opcional ausente no payload
+    assert df["Fare"].isna().all()
+
+
+def test_wrong_dtype_is_rejected():
+    columns = {**COLUMNS, "Pclass": np.array([1.5, 3.0])}
+    with pytest.raises(columnar.ColumnarPayloadError, match="Pclass"):
+        columnar.to_frame(columns)
+    with pytest.raises(columnar.ColumnarPayloadError, match="Age"):
+        columnar.to_frame({**COLUMNS, "Age": np.array(["a", "b"])})
+
+
+def test_null_in_integer_arrow_column_is_rejected():
+    table = pa.table({"Pclass": [1, None], "Sex": ["male", "male"]})
+    media_type = columnar.ARROW_STREAM_MEDIA_TYPE
+    with pytest.raises(columnar.ColumnarPayloadError, match="nulos"):
+        columnar.read_payload(arrow_payload(table, media_type), media_type)
+
+
+def test_missing_required_column_is_rejected():
+    columns = {k: v for k, v in COLUMNS.items() if k != "Sex"}
+    with pytest.raises(columnar.ColumnarPayloadError, match="Sex"):
+        columnar.to_frame(columns)
+
+
+def test_mismatched_lengths_are_rejected():
+    columns = {**COLUMNS, "Parch": np.array([0, 0, 1])}
+    with pytest.raises(columnar.ColumnarPayloadError, match="mesmo tamanho"):
+        columnar.to_frame(columns)
+
+
+def test_unsupported_or_corrupt_payload_is_rejected():
+    with pytest.raises(columnar.ColumnarPayloadError, match="não suportado"):
+        columnar.read_payload(b"Pclass\n1\n", "text/csv")
+    with pytest.raises(columnar.ColumnarPayloadError, match="decodificar"):
+        columnar.read_payload(b"lixo", columnar.NPZ_MEDIA_TYPE)
+
+
+def test_probabilities_roundtrip():
+    probs = [0.25, 0.75]
+    body = columnar.write_probabilities(probs, columnar.NPZ_MEDIA_TYPE)
+    decoded = columnar.read_payload(body, columnar.NPZ_MEDIA_TYPE)
+    np.testing.assert_array_equal(decoded["survival_probability"], probs)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from src.model.compact import CompactModel, export_compact
+from tests.conftest import fit_pipeline
+
+
+@pytest.fixture(scope="module")
+def trained(trained_pipeline):
+    pipeline, X, _, _ = trained_pipeline
+    return pipeline, X
+
+
+def test_compact_model_matches_pipeline(trained, tmp_path):
+    pipeline, X = trained
+    path = tmp_path / "model.compact"
+    export_compact(pipeline, path, metadata={"version": "test"})
+
+    compact = CompactModel(path)
+    np.testing.assert_allclose(
+        compact.predict_proba(X), pipeline.predict_proba(X), rtol=1e-12, atol=1e-12
+    )
+    np.testing.assert_allclose(
+        compact.transform(X), pipeline[:-1].transform(X), rtol=1e-12, atol=1e-12
+    )
+
+
+def test_compact_model_handles_missing_values(trained, tmp_path):
+    pipeline, X = trained
+    rows = X.iloc[:20].copy()
+    rows.loc[rows.index[::2], "Age"] = np.nan
+    rows.loc[rows.index[1::3], "Embarked"] = np.nan
+    path = tmp_path / "model.compact"
+    export_compact(pipeline, path)
+
+    np.testing.assert_allclose(
+        CompactModel(path).predict_proba(rows),
+        pipeline.predict_proba(rows),
+        rtol=1e-12,
+        atol=1e-12,
+    )
+
+
+def test_reexport_does_not_change_mapped_model(trained, tmp_path):
+    pipeline, X = trained
+    path = tmp_path / "model.compact"
+    export_compact(pipeline, path)
+    mapped = CompactModel(path)
+    before = mapped.predict_proba(X)
+
+    other = fit_pipeline(seed=11)[0]
+    export_compact(other, path)
+
+    # O arquivo antigo continua mapeado; o novo só é visto ao recarregar
+    np.testing.assert_array_equal(mapped.predict_proba(X), before)
+    np.testing.assert_allclose(
+        CompactModel(path).predict_proba(X), other.predict_proba(X), rtol=1e-12
+    )
+    assert [p.name for p in tmp_path.iterdir()] == ["model.compact"]
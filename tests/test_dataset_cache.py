@@ -0,0 +1,76 @@
+import pytest
+
+from src.data.cache import ChecksumMismatch, DatasetCache
+
+FILES = ["train.csv", "test.csv"]
+
+
+class RecordingFetcher:
+    def __init__(self, content=b"PassengerId\n1\n"):
+        self.content = content
+        self.calls = []
+
+    def __call__(self, name, directory):
+        self.calls.append(name)
+        path = directory + "/" + name
+        with open(path, "wb") as f:
+            f.write(self.content + name.encode())
+        return path
+
+
+def test_fetch_uses_cache_after_first_download(tmp_path):
+    cache = DatasetCache(tmp_path / "cache")
+    fetcher = RecordingFetcher()
+
+    first = cache.fetch("titanic", FILES, tmp_path / "raw", fetcher)
+    assert first == {"train.csv": "remote", "test.csv": "remote"}
+    assert sorted(fetcher.calls) == sorted(FILES)
+
+    assert cache.fetch("titanic", FILES, tmp_path / "raw", fetcher) == {
+        "train.csv": "local",
+        "test.csv": "local",
+    }
+    assert cache.fetch("titanic", FILES, tmp_path / "other", fetcher) == {
+        "train.csv": "cache",
+        "test.csv": "cache",
+    }
+    assert len(fetcher.calls) == 2
+
+
+def test_modified_local_copy_is_restored(tmp_path):
+    cache = DatasetCache(tmp_path / "cache")
+    cache.fetch("titanic", FILES, tmp_path / "raw", RecordingFetcher())
+    original = (tmp_path / "raw" / "train.csv").read_bytes()
+
+    (tmp_path / "raw" / "train.csv").write_bytes(b"editado")
+    sources = cache.fetch("titanic", FILES, tmp_path / "raw", RecordingFetcher())
+    assert sources["train.csv"] == "cache"
+    assert (tmp_path / "raw" / "train.csv").read_bytes() == original
+
+
+def test_mirror_is_used_without_fetcher(tmp_path):
+    mirror = tmp_path / "mirror" / "titanic"
+    mirror.mkdir(parents=True)
+    for name in FILES:
+        (mirror / name).write_text(name)
+
+    cache = DatasetCache(tmp_path / "cache", mirror=tmp_path / "mirror")
+    sources = cache.fetch("titanic", FILES, tmp_path / "raw")
+    assert set(sources.values()) == {"mirror"}
+    assert (tmp_path / "raw" / "test.csv").read_text() == "test.csv"
+
+
+def test_changed_remote_content_is_rejected(tmp_path):
+    cache = DatasetCache(tmp_path / "cache")
+    cache.fetch("titanic", ["train.csv"], tmp_path / "raw", RecordingFetcher())
+
+    # Objeto do cache e cópia local perdidos: o novo download deve conferir
+    for path in (tmp_path / "cache" / "sha256").rglob("*"):
+        if path.is_file():
+            path.unlink()
+    (tmp_path / "raw" / "train.csv").unlink()
+
+    with pytest.raises(ChecksumMismatch):
+        cache.fetch(
+            "titanic", ["train.csv"], tmp_path / "raw", RecordingFetcher(b"outro")
+        )
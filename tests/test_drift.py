@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.monitoring.drift import (
+    MISSING,
+    OTHER,
+    CategoricalCounter,
+    DriftMonitor,
+    QuantileSketch,
+    build_reference,
+    ks_statistic,
+    psi,
+)
+
+
+@pytest.fixture
+def raw_train():
+    rng = np.random.default_rng(0)
+    n = 1_000
+    age = rng.normal(30, 12, n).clip(0.5, 80)
+    age[rng.random(n) < 0.2] = np.nan
+    return pd.DataFrame(
+        {
+            "Pclass": rng.choice([1, 2, 3], n),
+            "Sex": rng.choice(["male", "female"], n),
+            "Age": age,
+            "Fare": rng.exponential(30, n),
+            "Embarked": rng.choice(["S", "C", "Q", None], n, p=[0.7, 0.2, 0.09, 0.01]),
+        }
+    )
+
+
+def test_psi_and_ks():
+    assert psi([10, 20, 30], [10, 20, 30]) == pytest.approx(0.0)
+    assert psi([10, 20, 30], [1, 2, 3]) == pytest.approx(0.0)
+    assert psi([50, 50], [90, 10]) > 0.25
+    assert ks_statistic([10, 10, 10, 10], [10, 10, 10, 10]) == 0.0
+    assert ks_statistic([10, 0], [0, 10]) == pytest.approx(1.0)
+    assert ks_statistic([10, 10], [0, 0]) == 0.0
+
+
+def test_quantile_sketch_buckets_and_missing():
+    sketch = QuantileSketch([10.0, 20.0])
+    for value in [5, 10, 15, 25, None, float("nan")]:
+        sketch.update(value)
+    assert sketch.counts == [1, 2, 1]
+    assert sketch.missing == 2
+
+
+def test_categorical_counter_is_bounded_by_reference():
+    counter = CategoricalCounter(["male", "female"])
+    for i in range(1_000):
+        counter.update(f"valor-{i}")
+    counter.update("male")
+    counter.update(None)
+    assert counter.counts == {OTHER: 1_000, "male": 1, MISSING: 1}
+
+
+def test_reference_keeps_missing_values(raw_train):
+    reference = build_reference(raw_train)
+    assert reference["numeric"]["Age"]["missing"] == raw_train["Age"].isna().sum()
+    assert MISSING in reference["categorical"]["Embarked"]["counts"]
+    assert reference["categorical"]["Pclass"]["counts"].keys() == {"1", "2", "3"}
+
+
+def test_monitor_same_distribution_is_stable(raw_train):
+    monitor = DriftMonitor(build_reference(raw_train))
+    for record in raw_train.to_dict("records"):
+        monitor.update(record)
+    fields = monitor.report()["fields"]
+    assert all(field["drift"] == "estável" for field in fields.values())
+    assert fields["Age"]["psi"] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_update_many_matches_update(raw_train):
+    reference = build_reference(raw_train)
+    one, many = DriftMonitor(reference), DriftMonitor(reference)
+    shifted = raw_train.assign(Age=raw_train["Age"] + 20, Sex="desconhecido")
+    for record in shifted.to_dict("records"):
+        one.update(record)
+    many.update_many(shifted)
+    assert one.report() == many.report()
+    assert many.report()["fields"]["Age"]["drift"] == "significativo"
+    assert many.categorical["Sex"].counts == {OTHER: len(shifted)}
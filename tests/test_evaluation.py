@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from sklearn.metrics import average_precision_score, roc_auc_score
+
+from src.model.evaluation import calibration_bins, curves, optimal_threshold
+
+
+@pytest.fixture
+def holdout():
+    rng = np.random.default_rng(0)
+    y = rng.random(20_000) < 0.38
+    # Escores arredondados para gerar empates
+    scores = np.round(np.clip(0.3 * y + 0.7 * rng.random(y.size), 0, 1), 2)
+    return y, scores
+
+
+def test_curves_match_sklearn(holdout):
+    y, scores = holdout
+    curve = curves(y, scores)
+    assert curve["roc_auc"] == pytest.approx(roc_auc_score(y, scores), abs=1e-12)
+    assert curve["average_precision"] == pytest.approx(
+        average_precision_score(y, scores), abs=1e-12
+    )
+    assert len(curve["thresholds"]) == len(np.unique(scores))
+
+
+def test_optimal_threshold_minimizes_cost_by_brute_force(holdout):
+    y, scores = holdout
+    result = optimal_threshold(curves(y, scores), cost_fp=1.0, cost_fn=3.0)
+
+    def cost(threshold):
+        predicted = scores >= threshold
+        return (np.sum(predicted & ~y) + 3.0 * np.sum(~predicted & y)) / y.size
+
+    best = min(cost(t) for t in np.unique(scores))
+    assert result["cost"] == pytest.approx(best)
+    assert cost(result["threshold"]) == pytest.approx(best)
+
+
+def test_calibration_bins():
+    y = np.array([0, 1, 1, 1])
+    scores = np.array([0.05, 0.95, 0.95, 1.0])
+    bins = calibration_bins(y, scores, n_bins=10)
+    assert bins["count"][0] == 1 and bins["count"][9] == 3
+    assert bins["observed_rate"][9] == 1.0
+    assert bins["mean_predicted"][5] is None
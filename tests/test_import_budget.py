@@ -0,0 +1,15 @@
+import pytest
+
+from titanic_insights.importtime import load_budgets, measure
+
+BUDGETS = load_budgets()
+
+
+@pytest.mark.parametrize("module", sorted(BUDGETS))
+def test_entry_point_import_is_within_budget(module):
+    measured = measure(module, repeat=3)
+
+    heaviest = ", ".join(f"{name} {ms:.0f} ms" for name, ms in measured["heaviest"])
+    assert (
+        measured["ms"] <= BUDGETS[module]
+    ), f"{module}: {measured['ms']:.0f} ms > {BUDGETS[module]} ms ({heaviest})"
@@ -0,0 +1,141 @@
+import asyncio
+import os
+import threading
+
+import joblib
+import numpy as np
+import pytest
+
+from src.api.inference import (
+    InferenceExecutor,
+    InferenceInputError,
+    InferenceOverloaded,
+    InferenceUnavailable,
+)
+
+PASSENGER = {
+    "Pclass": 3,
+    "Sex": "male",
+    "Age": 22.0,
+    "SibSp": 0,
+    "Parch": 0,
+    "Fare": 7.25,
+    "Embarked": "S",
+}
+
+
+class ConstantModel:
+    """Modelo de teste: probabilidade fixa; Fare negativa derruba o processo."""
+
+    def predict_proba(self, df):
+        if (df["Fare"] < 0).any():
+            os._exit(1)
+        return np.tile([0.25, 0.75], (len(df), 1))
+
+
+class BlockingModel:
+    """Modelo de teste que só responde depois de `release.set()`."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def predict_proba(self, df):
+        self.release.wait(5)
+        return np.tile([0.5, 0.5], (len(df), 1))
+
+
+class RejectingModel:
+    def predict_proba(self, df):
+        raise ValueError("X has 3 features, but the model expects 12")
+
+
+def test_rejects_above_max_pending():
+    executor = InferenceExecutor(workers=0, max_pending=1, timeout=5)
+    model = BlockingModel()
+
+    async def main():
+        first = asyncio.ensure_future(executor.run([PASSENGER], model))
+        await asyncio.sleep(0.05)
+        with pytest.raises(InferenceOverloaded):
+            await executor.run([PASSENGER], model)
+        model.release.set()
+        return await first
+
+    assert asyncio.run(main()) == [0.5]
+    stats = executor.stats()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 1
+    assert stats["pending"] == 0
+
+
+def test_call_shares_the_max_pending_limit():
+    executor = InferenceExecutor(workers=0, max_pending=1, timeout=5)
+    model = BlockingModel()
+
+    async def main():
+        first = asyncio.ensure_future(executor.run([PASSENGER], model))
+        await asyncio.sleep(0.05)
+        with pytest.raises(InferenceOverloaded):
+            await executor.call(len, [PASSENGER])
+        model.release.set()
+        await first
+        return await executor.call(len, [PASSENGER])
+
+    assert asyncio.run(main()) == 1
+    assert executor.counters["rejected"] == 1
+    assert executor.counters["completed"] == 2
+
+
+def test_timeout_keeps_the_slot_until_the_work_finishes():
+    executor = InferenceExecutor(workers=0, max_pending=1, timeout=0.05)
+    model = BlockingModel()
+
+    async def main():
+        with pytest.raises(InferenceUnavailable, match="não concluiu"):
+            await executor.run([PASSENGER], model)
+        # A predição continua ocupando a vaga depois do timeout
+        assert executor.stats()["pending"] == 1
+        with pytest.raises(InferenceOverloaded):
+            await executor.run([PASSENGER], model)
+        model.release.set()
+        while executor.stats()["pending"]:
+            await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    assert executor.counters["timed_out"] == 1
+
+
+def test_model_errors_on_the_input_are_input_errors():
+    executor = InferenceExecutor(workers=0)
+
+    with pytest.raises(InferenceInputError, match="features"):
+        asyncio.run(executor.run([PASSENGER], RejectingModel()))
+    assert executor.counters["failed"] == 1
+    assert executor.stats()["pending"] == 0
+
+
+def test_missing_artifact_is_unavailable(tmp_path):
+    executor = InferenceExecutor(workers=0)
+
+    with pytest.raises(InferenceUnavailable, match="carregar"):
+        asyncio.run(executor.run([PASSENGER], model_path=tmp_path / "v9.joblib"))
+
+
+def test_broken_pool_is_restarted(tmp_path):
+    model_path = tmp_path / "model.joblib"
+    joblib.dump(ConstantModel(), model_path)
+    executor = InferenceExecutor(workers=1, timeout=60)
+    executor.start(model_path)
+
+    async def main():
+        assert await executor.run([PASSENGER]) == [0.75]
+        with pytest.raises(InferenceUnavailable, match="reiniciado"):
+            await executor.run([{**PASSENGER, "Fare": -1.0}])
+        return await executor.run([PASSENGER])
+
+    try:
+        assert asyncio.run(main()) == [0.75]
+    finally:
+        executor.stop()
+    assert executor.counters["pool_restarts"] == 1
+    assert executor.counters["completed"] == 2
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from src.model import neighbors
+
+
+@pytest.fixture(scope="module")
+def trained(trained_pipeline):
+    model, X, y, df = trained_pipeline
+    index = neighbors.build_index(model, X, y, df["PassengerId"])
+    return model, index, df, X
+
+
+def test_training_passenger_is_its_own_nearest_neighbor(trained):
+    model, index, df, X = trained
+    rows = X.iloc[[0, 10, 200]]
+    found = neighbors.query(index, model, rows, k=3)
+
+    assert [len(row) for row in found] == [3, 3, 3]
+    for position, row in zip([0, 10, 200], found):
+        nearest = row[0]
+        assert nearest["distance"] == pytest.approx(0.0, abs=1e-9)
+        assert nearest["passenger_id"] == df["PassengerId"].iloc[position]
+        assert nearest["survived"] == df["Survived"].iloc[position]
+        distances = [n["distance"] for n in row]
+        assert distances == sorted(distances)
+
+
+def test_neighbors_use_the_model_feature_space(trained):
+    model, index, _, X = trained
+    features = model[:-1].transform(X.iloc[[5]])
+    found = neighbors.query(index, model, X.iloc[[5]], k=len(X))
+    all_features = model[:-1].transform(X)
+    expected = np.sort(np.linalg.norm(all_features - features, axis=1))
+    np.testing.assert_allclose([n["distance"] for n in found[0]], expected)
+
+
+def test_k_is_capped_and_missing_values_become_none(trained):
+    model, index, _, X = trained
+    found = neighbors.query(index, model, X.iloc[[0]], k=10_000)
+    assert len(found[0]) == len(X)
+    assert all(
+        value is None or value == value
+        for n in found[0]
+        for value in n["passenger"].values()
+    )
+
+
+def test_save_and_load(tmp_path, trained):
+    model, index, _, X = trained
+    path = tmp_path / "knn_index.joblib"
+    neighbors.save_index(index, path)
+    loaded = neighbors.load_index(path)
+    assert neighbors.query(loaded, model, X.iloc[[1]]) == neighbors.query(
+        index, model, X.iloc[[1]]
+    )
+    assert neighbors.load_index(tmp_path / "ausente.joblib") is None
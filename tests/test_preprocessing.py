@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.synthetic import synthetic_passengers
+from src.model.train import build_pipeline
+from src.processing.preprocessing import get_engine, preprocess
+from tests.conftest import DROP_COLUMNS
+
+
+def _passengers():
+    df = synthetic_passengers(5_000, seed=3)
+    # Limites dos grupos de idade e valores fora deles
+    edges = [0.0, 0.5, 12.0, 12.01, 18.0, 59.99, 60.0, 80.0, 80.5, -1.0, np.nan]
+    df.loc[: len(edges) - 1, "Age"] = edges
+    df.loc[len(edges) : len(edges) + 4, "Fare"] = np.nan
+    return df
+
+
+def _comparable(df):
+    return df.assign(AgeGroup=df["AgeGroup"].astype(object))
+
+
+def test_numpy_engine_matches_pandas_engine():
+    expected = preprocess(_passengers(), engine="pandas")
+    result = preprocess(_passengers(), engine="numpy")
+
+    assert list(result.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(_comparable(result), _comparable(expected))
+
+
+def test_engines_produce_the_same_predictions():
+    train = preprocess(synthetic_passengers(2_000, seed=4), engine="pandas")
+    model = build_pipeline().fit(train.drop(columns=DROP_COLUMNS), train["Survived"])
+
+    probs = {
+        engine: model.predict_proba(
+            preprocess(_passengers(), engine=engine).drop(columns=DROP_COLUMNS)
+        )[:, 1]
+        for engine in ("pandas", "numpy")
+    }
+    np.testing.assert_array_equal(probs["numpy"], probs["pandas"])
+
+
+def test_single_passenger_with_missing_age():
+    df = pd.DataFrame([{"Age": None, "SibSp": 0, "Parch": 0, "Fare": 7.25}])
+    result = preprocess(df, engine="numpy")
+    assert result.loc[0, "AloneXAgeGroup"] == "nan_Alone1"
+    assert np.isnan(result.loc[0, "Age"])
+
+
+def test_engines_agree_on_single_passenger_with_missing_fields():
+    record = {"Age": None, "SibSp": 0, "Parch": 0, "Fare": None, "Embarked": None}
+    expected = preprocess(pd.DataFrame([record]), engine="pandas")
+    result = preprocess(pd.DataFrame([record]), engine="numpy")
+
+    pd.testing.assert_frame_equal(_comparable(result), _comparable(expected))
+    assert np.isnan(expected.loc[0, "Age"]) and np.isnan(expected.loc[0, "Fare"])
+    assert isinstance(expected.loc[0, "Embarked"], float)
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError, match="desconhecido"):
+        get_engine("polars")
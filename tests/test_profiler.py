@@ -0,0 +1,58 @@
+import os
+import time
+
+import pytest
+
+from src.monitoring.profiler import ProfilerBusy, SamplingProfiler, profile
+
+
+def busy_loop(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+def test_profile_writes_collapsed_stacks(tmp_path):
+    output = tmp_path / "train.collapsed"
+    with profile(output, interval=0.002) as profiler:
+        busy_loop(0.2)
+
+    lines = output.read_text().splitlines()
+    assert profiler.last["samples"] > 0
+    assert all(int(line.rsplit(" ", 1)[1]) > 0 for line in lines)
+    assert any(
+        line.startswith("MainThread;") and "busy_loop (tests/test_profiler.py" in line
+        for line in lines
+    )
+
+
+def test_capture_is_time_boxed_and_exclusive(tmp_path):
+    profiler = SamplingProfiler(tmp_path)
+    status = profiler.start(duration=0.05, interval=0.005)
+    assert status["running"]
+    with pytest.raises(ProfilerBusy):
+        profiler.start()
+
+    profiler._thread.join(timeout=2)
+    assert not profiler.running
+    assert profiler.status()["last"]["path"] == status["path"]
+    assert (tmp_path / status["path"].rsplit("/", 1)[-1]).exists()
+
+
+def test_only_the_latest_captures_are_kept(tmp_path):
+    old = []
+    for i in range(4):
+        path = tmp_path / f"profile-2026010{i}-000000-1.collapsed"
+        path.write_text("MainThread;main 1\n")
+        os.utime(path, (i, i))
+        old.append(path)
+    explicit = tmp_path / "train.collapsed"
+    explicit.write_text("MainThread;main 1\n")
+
+    profiler = SamplingProfiler(tmp_path, max_files=3)
+    status = profiler.start(duration=0.02, interval=0.005)
+    profiler._thread.join(timeout=2)
+
+    kept = sorted(p.name for p in tmp_path.glob("profile-*.collapsed"))
+    assert kept == sorted([old[2].name, old[3].name, status["path"].rsplit("/")[-1]])
+    assert explicit.exists()
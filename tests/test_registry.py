@@ -0,0 +1,204 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import src.model.registry as registry_module
+from src.model.registry import ModelCache, ModelRegistry, ModelRouter, parse_routes
+
+
+@pytest.fixture(scope="module")
+def pipeline(trained_pipeline):
+    return trained_pipeline[0]
+
+
+def test_register_creates_sequential_immutable_versions(pipeline, tmp_path):
+    registry = ModelRegistry(tmp_path)
+    assert registry.versions() == [] and registry.latest() is None
+
+    first = registry.register(pipeline, metrics={"auc": 0.8}, decision_threshold=0.4)
+    second = registry.register(pipeline)
+
+    assert (first, second) == ("v1", "v2")
+    assert registry.versions() == ["v1", "v2"]
+    assert registry.resolve("latest") == "v2"
+    assert registry.resolve("v1") == "v1"
+    metadata = registry.metadata("v1")
+    assert metadata["metrics"] == {"auc": 0.8}
+    assert metadata["decision_threshold"] == 0.4
+    assert metadata["feature_schema"]["num"][0] == "Age"
+    assert registry.artifact_path("v1").exists()
+    assert registry.artifact_path("v1", "compact").exists()
+    # Nenhum diretório temporário fica para trás
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["v1", "v2"]
+
+
+def test_version_listing_is_cached_until_the_root_changes(
+    pipeline, tmp_path, monkeypatch
+):
+    registry = ModelRegistry(tmp_path)
+    registry.register(pipeline)
+    listings = []
+    iterdir = Path.iterdir
+    monkeypatch.setattr(
+        Path, "iterdir", lambda self: listings.append(self) or iterdir(self)
+    )
+
+    for _ in range(3):
+        assert registry.resolve("latest") == "v1"
+    assert len(listings) == 1
+    registry.register(pipeline)
+    assert registry.resolve("latest") == "v2"
+
+
+def test_resolve_unknown_version(tmp_path):
+    registry = ModelRegistry(tmp_path)
+    for name in ("latest", "v1"):
+        with pytest.raises(KeyError):
+            registry.resolve(name)
+
+
+def test_incomplete_version_is_not_listed(pipeline, tmp_path):
+    registry = ModelRegistry(tmp_path)
+    registry.register(pipeline)
+    (tmp_path / "v2").mkdir()
+    (tmp_path / ".v3.tmp").mkdir()
+
+    assert registry.versions() == ["v1"]
+    # Um diretório sem metadata.json (cópia interrompida) é substituído
+    assert registry.register(pipeline) == "v2"
+    assert registry.versions() == ["v1", "v2"]
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        ("", {}),
+        ("v3=90,v4=10", {"v3": 90.0, "v4": 10.0}),
+        (" v3 = 2.5 , latest ", {"v3": 2.5, "latest": 1.0}),
+        ("v5,,", {"v5": 1.0}),
+    ],
+)
+def test_parse_routes(spec, expected):
+    assert parse_routes(spec) == expected
+
+
+def test_router_splits_by_weight():
+    router = ModelRouter(routes={"v1": 90, "v2": 10, "v3": 0}, seed=1)
+    chosen = [router.choose() for _ in range(5_000)]
+
+    assert set(chosen) == {"v1", "v2"}
+    assert chosen.count("v2") / len(chosen) == pytest.approx(0.10, abs=0.02)
+    assert router.stats()["routed"] == {
+        "v1": chosen.count("v1"),
+        "v2": chosen.count("v2"),
+    }
+
+
+def test_router_without_routes_uses_the_default():
+    assert ModelRouter().choose() is None
+
+
+def test_router_shadow_stats():
+    router = ModelRouter(shadow=["v2"])
+    router.record_shadow("v2", [0.9, 0.2, 0.6], [0.8, 0.3, 0.4])
+
+    stats = router.stats()["shadow"]["v2"]
+    assert stats["scored"] == 3
+    assert stats["mean_abs_diff"] == pytest.approx(0.4 / 3)
+    assert stats["agreement_rate"] == pytest.approx(2 / 3)
+    assert ModelRouter(shadow=["v3"]).stats()["shadow"]["v3"]["mean_abs_diff"] is None
+
+
+def test_router_shadow_agreement_uses_each_threshold():
+    router = ModelRouter(shadow=["v2"])
+    # 0.45 é sobrevivência com o limiar 0.4 da versão sombra
+    router.record_shadow("v2", [0.6, 0.2], [0.45, 0.35], 0.5, 0.4)
+
+    assert router.stats()["shadow"]["v2"]["agreement_rate"] == pytest.approx(1.0)
+
+
+@pytest.fixture
+def slow_loader(monkeypatch):
+    calls = []
+    gates = {}
+
+    def load(path, model_format=None):
+        calls.append(path)
+        gates.setdefault(path, threading.Event()).wait(5)
+        if path.startswith("broken"):
+            raise FileNotFoundError(path)
+        return f"model:{path}"
+
+    monkeypatch.setattr(registry_module, "load_model", load)
+    return calls, gates
+
+
+def test_cache_evicts_least_recently_used(slow_loader):
+    calls, gates = slow_loader
+    for path in ("a", "b", "c"):
+        gates[path] = threading.Event()
+        gates[path].set()
+    cache = ModelCache(capacity=2)
+
+    cache.get("a"), cache.get("b"), cache.get("a"), cache.get("c")
+
+    assert cache.resident() == ["a", "c"]
+    assert cache.counters == {"hits": 1, "loads": 3, "waits": 0, "evictions": 1}
+
+
+def test_cache_loads_outside_the_lock(slow_loader):
+    calls, gates = slow_loader
+    gates["a"] = threading.Event()
+    gates["a"].set()
+    cache = ModelCache()
+    cache.get("a")
+
+    results = []
+    loaders = [
+        threading.Thread(target=lambda: results.append(cache.get("b")))
+        for _ in range(4)
+    ]
+    for thread in loaders:
+        thread.start()
+    time.sleep(0.1)
+
+    # Enquanto 'b' carrega, o modelo residente continua respondendo
+    started = time.perf_counter()
+    assert cache.get("a") == "model:a"
+    assert time.perf_counter() - started < 0.05
+
+    gates["b"].set()
+    for thread in loaders:
+        thread.join()
+    assert results == ["model:b"] * 4
+    assert calls.count("b") == 1
+    assert cache.counters["waits"] == 3
+
+
+def test_failed_load_is_shared_and_retried(slow_loader):
+    calls, gates = slow_loader
+    gates["broken"] = threading.Event()
+    cache = ModelCache()
+    errors = []
+
+    def get():
+        try:
+            cache.get("broken")
+        except FileNotFoundError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=get) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    gates["broken"].set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 3 and calls == ["broken"]
+    with pytest.raises(FileNotFoundError):
+        cache.get("broken")
+    assert calls == ["broken", "broken"]
+    assert cache.resident() == []
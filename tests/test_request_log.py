@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.api.request_log import RequestLogWriter, _schema
+
+PASSENGER = {
+    "Pclass": 3,
+    "Sex": "male",
+    "Age": 22.0,
+    "SibSp": 1,
+    "Parch": 0,
+    "Fare": 7.25,
+    "Embarked": None,
+}
+
+
+def published(root):
+    return sorted(root.rglob("part-*.parquet"))
+
+
+def test_full_queue_drops_without_blocking(tmp_path):
+    writer = RequestLogWriter(tmp_path, max_queue=2)
+    for _ in range(3):
+        writer.log(PASSENGER, 0.3, "v1")
+    writer.log_batch({f: [PASSENGER[f]] * 5 for f in PASSENGER}, [0.1] * 5, "v1")
+    stats = writer.stats()
+    assert stats["enqueued"] == 2 and stats["dropped"] == 6
+    assert stats["queued"] == 2
+
+
+def test_flushes_append_to_one_file_per_partition(tmp_path):
+    writer = RequestLogWriter(tmp_path)
+    writer.log(PASSENGER, 0.3, "v1")
+    writer._flush()
+    columns = {f: np.array([PASSENGER[f]] * 4) for f in PASSENGER}
+    columns["Age"] = np.array([1.0, np.nan, 3.0, 4.0])
+    writer.log_batch(columns, np.array([0.1, 0.2, 0.3, 0.4]), "v2")
+    writer._flush()
+
+    # Arquivo ainda aberto não é visível aos leitores
+    assert published(tmp_path) == []
+    assert writer.stats()["open_files"] == 1
+
+    writer.stop()
+    files = published(tmp_path)
+    assert len(files) == 1
+    assert pq.read_metadata(files[0]).num_row_groups == 2
+    assert pq.read_schema(files[0]).equals(_schema())
+
+    df = pd.read_parquet(tmp_path)
+    assert len(df) == 5
+    assert df["Age"].isna().sum() == 1
+    assert df["Embarked"].isna().all()
+    assert sorted(df["model_version"]) == ["v1", "v2", "v2", "v2", "v2"]
+    assert writer.stats()["written_rows"] == 5
+    assert writer.stats()["files_written"] == 1
+
+
+def test_files_rotate_by_size(tmp_path):
+    writer = RequestLogWriter(tmp_path, max_file_bytes=1)
+    for _ in range(3):
+        writer.log(PASSENGER, 0.3)
+        writer._flush()
+    assert len(published(tmp_path)) == 3
+    assert writer.stats()["open_files"] == 0
@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.model.score_table import ScoreTable
+
+
+def write_table(path, ids, probs):
+    # Mesmo formato de `materialize`: ids ordenados e bits float64 das probabilidades
+    ids = np.asarray(ids, dtype=np.int64)
+    order = np.argsort(ids)
+    table = np.stack(
+        [ids[order], np.asarray(probs, dtype=np.float64)[order].view(np.int64)]
+    )
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, table)
+    os.replace(tmp_path, path)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / "score_table.npy"
+
+
+def test_dense_lookup(path):
+    write_table(path, [892, 893, 894], [0.1, 0.2, 0.3])
+    table = ScoreTable(path)
+    assert table._refresh()[3]
+    assert table.lookup(893) == pytest.approx(0.2)
+    assert table.lookup(891) is None
+    assert table.lookup(895) is None
+
+
+def test_sparse_lookup(path):
+    write_table(path, [30, 10, 20, 100], [0.3, 0.1, 0.2, 1.0])
+    table = ScoreTable(path)
+    assert not table._refresh()[3]
+    assert table.lookup(10) == pytest.approx(0.1)
+    assert table.lookup(100) == pytest.approx(1.0)
+    assert table.lookup(15) is None
+    assert table.lookup(101) is None
+
+
+def test_missing_file(path):
+    table = ScoreTable(path)
+    assert not table.available
+    assert table.lookup(1) is None
+
+
+def test_replaced_file_is_reloaded(path):
+    write_table(path, [1, 2], [0.1, 0.2])
+    table = ScoreTable(path)
+    assert table.lookup(2) == pytest.approx(0.2)
+
+    write_table(path, [1, 2, 5], [0.5, 0.6, 0.7])
+    assert table.lookup(2) == pytest.approx(0.6)
+    assert table.lookup(5) == pytest.approx(0.7)
+
+    path.unlink()
+    assert table.lookup(2) is None
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import functools
 import os
 import subprocess
 import sys
@@ -8,20 +9,45 @@ from pathlib import Path
 from typing import Optional
 
 import click
-from rich import box
-from rich.console import Console
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.prompt import Confirm, Prompt
-from rich.table import Table
-from rich.text import Text
 
-console = Console()
+# O rich (e os módulos do pipeline) são importados apenas pelos comandos que os
+# usam, para que comandos simples como `version` e `info` iniciem rapidamente.
+
+
+@functools.cache
+def get_console():
+    from rich.console import Console
+
+    return Console()
+
+
+class _LazyConsole:
+    """Encaminha os atributos para o `Console` do rich, criado no primeiro uso."""
+
+    def __getattr__(self, name):
+        return getattr(get_console(), name)
+
+
+console = _LazyConsole()
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 
+def spinner_progress():
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=get_console(),
+    )
+
+
 def print_banner():
+    from rich import box
+    from rich.panel import Panel
+    from rich.text import Text
+
     banner_text = Text()
     banner_text.append("🚢 ", style="bold blue")
     banner_text.append("TITANIC INSIGHTS", style="bold white on blue")
@@ -33,6 +59,9 @@ def print_banner():
 
 
 def print_menu():
+    from rich import box
+    from rich.table import Table
+
     table = Table(
         title="📋 Menu Principal",
         box=box.ROUNDED,
@@ -71,6 +100,8 @@ def cli(ctx):
 
 
 def interactive_mode():
+    from rich.prompt import Confirm, Prompt
+
     while True:
         console.clear()
         print_banner()
@@ -124,23 +155,25 @@ def interactive_mode():
 
 @cli.command()
 @click.option("--interactive", "-i", is_flag=True, help="Modo interativo")
-def download(interactive):
+@click.option(
+    "--mirror",
+    default=None,
+    type=click.Path(exists=True, file_okay=False),
+    help="Diretório espelho com titanic/train.csv e titanic/test.csv (sem acesso ao Kaggle)",
+)
+def download(interactive, mirror):
 
-    download_data()
+    download_data(mirror)
 
 
-def download_data():
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+def download_data(mirror=None):
+    with spinner_progress() as progress:
         task = progress.add_task("📥 Iniciando download dos dados...", total=None)
 
         try:
             from src.data.download import main
 
-            main()
+            main(mirror)
             progress.update(task, description="✅ Download concluído com sucesso!")
             console.print("\n[green]✅ Download concluído com sucesso![/green]")
         except ImportError:
@@ -160,11 +193,7 @@ def explore(interactive):
 
 
 def explore_data():
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    with spinner_progress() as progress:
         task = progress.add_task("🔍 Abrindo notebook de exploração...", total=None)
 
         notebook_path = Path("notebooks/00_exploracao.ipynb")
@@ -181,17 +210,24 @@ def explore_data():
             console.print("\n[red]❌ Notebook de exploração não encontrado[/red]")
 
 
-@cli.command()
-def preprocess():
-    preprocess_data()
+# Mantido em sincronia com src.processing.preprocessing.ENGINES (não importado
+# aqui para não carregar o pandas ao montar a CLI)
+PREPROCESS_ENGINES = ["pandas", "numpy"]
 
 
-def preprocess_data():
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+@cli.command()
+@click.option(
+    "--engine",
+    type=click.Choice(PREPROCESS_ENGINES),
+    default=None,
+    help="Engine das features (padrão: TITANIC_PREPROCESS_ENGINE ou pandas)",
+)
+def preprocess(engine):
+    preprocess_data(engine)
+
+
+def preprocess_data(engine=None):
+    with spinner_progress() as progress:
         task = progress.add_task(
             "🧹 Iniciando pré-processamento dos dados...", total=None
         )
@@ -199,7 +235,7 @@ def preprocess_data():
         try:
             from src.processing.preprocessing import main as preprocess_main
 
-            preprocess_main()
+            preprocess_main(engine)
             progress.update(task, description="✅ Dados pré-processados com sucesso!")
             console.print("\n[green]✅ Dados pré-processados com sucesso![/green]")
             console.print("[dim]Arquivos salvos em data/processed/[/dim]")
@@ -224,21 +260,53 @@ def preprocess_data():
 
 
 @cli.command()
-def train():
-    train_model()
-
-
-def train_model():
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+@click.option(
+    "--cost-fp",
+    default=1.0,
+    show_default=True,
+    help="Custo de um falso positivo na escolha do limiar de decisão",
+)
+@click.option(
+    "--cost-fn",
+    default=1.0,
+    show_default=True,
+    help="Custo de um falso negativo na escolha do limiar de decisão",
+)
+@click.option(
+    "--calibration",
+    type=click.Choice(["isotonic", "sigmoid"]),
+    default=None,
+    help="Calibra as probabilidades em folds de validação (isotônica ou Platt)",
+)
+@click.option(
+    "--profile",
+    is_flag=True,
+    help="Grava um perfil por amostragem do treino (pilhas collapsed, para flamegraph)",
+)
+def train(cost_fp, cost_fn, calibration, profile):
+    train_model(cost_fp, cost_fn, calibration, profile)
+
+
+def train_model(cost_fp=1.0, cost_fn=1.0, calibration=None, profile=False):
+    with spinner_progress() as progress:
         task = progress.add_task("🤖 Iniciando treinamento do modelo...", total=None)
         try:
             from src.model.train import train_and_evaluate
 
-            train_and_evaluate()
+            if profile:
+                from src.monitoring.profiler import profile as sampling_profile
+
+                with sampling_profile() as profiler:
+                    train_and_evaluate(
+                        cost_fp=cost_fp, cost_fn=cost_fn, calibration=calibration
+                    )
+                console.print(
+                    f"[dim]Perfil gravado em {profiler.last['path']} ({profiler.last['samples']} amostras)[/dim]"
+                )
+            else:
+                train_and_evaluate(
+                    cost_fp=cost_fp, cost_fn=cost_fn, calibration=calibration
+                )
             progress.update(task, description="✅ Modelo treinado com sucesso!")
             console.print("\n[green]✅ Modelo treinado e salvo com sucesso![/green]")
         except ImportError:
@@ -262,6 +330,77 @@ def train_model():
             console.print(f"\n[red]❌ Erro durante o treinamento: {e}[/red]")
 
 
+@cli.command("score-table")
+@click.option(
+    "--dataset",
+    default="data/raw/test.csv",
+    show_default=True,
+    help="CSV com os passageiros a avaliar",
+)
+@click.option(
+    "--output",
+    default="models/score_table.npy",
+    show_default=True,
+    help="Destino da tabela de escores",
+)
+@click.option(
+    "--version",
+    default=None,
+    help="Versão do registro (ex.: 'v3' ou 'latest'); usa o modelo e grava a tabela no diretório da versão",
+)
+def score_table_command(dataset, output, version):
+    """🗂️  Materializa a tabela PassengerId → probabilidade"""
+    build_score_table(dataset, output, version)
+
+
+def build_score_table(
+    dataset="data/raw/test.csv", output="models/score_table.npy", version=None
+):
+    with spinner_progress() as progress:
+        task = progress.add_task("🗂️  Materializando escores...", total=None)
+        try:
+            from src.model.calibration import CALIBRATION_PATH
+            from src.model.score_table import materialize
+
+            model_path, calibration_path = (
+                "models/logreg_titanic.joblib",
+                CALIBRATION_PATH,
+            )
+            if version is not None:
+                from src.model.registry import ModelRegistry
+
+                registry = ModelRegistry()
+                try:
+                    version = registry.resolve(version)
+                except KeyError:
+                    progress.update(task, description="❌ Erro: Versão não encontrada")
+                    console.print(
+                        f"\n[red]❌ Versão '{version}' não encontrada no registro.[/red]"
+                    )
+                    return
+                model_path = registry.artifact_path(version)
+                calibration_path = registry.calibration_path(version)
+                output = registry.score_table_path(version)
+
+            n = materialize(
+                dataset,
+                model_path,
+                output,
+                calibration_path=calibration_path,
+            )
+            progress.update(task, description="✅ Tabela de escores gerada!")
+            console.print(
+                f"\n[green]✅ {n} passageiros avaliados e salvos em {output}[/green]"
+            )
+        except FileNotFoundError as e:
+            progress.update(task, description="❌ Erro: Arquivo não encontrado")
+            console.print(f"\n[red]❌ Erro: Arquivo não encontrado: {e.filename}[/red]")
+            console.print("[dim]Treine um modelo e baixe os dados primeiro.[/dim]")
+        except Exception as e:
+            progress.update(task, description="❌ Erro ao gerar a tabela de escores")
+            console.print(f"\n[red]❌ Erro ao gerar a tabela de escores: {e}[/red]")
+
+
 @cli.command()
 def evaluate():
     evaluate_model()
@@ -275,6 +414,9 @@ def evaluate_model():
         return
 
     from joblib import load
+    from rich import box
+    from rich.panel import Panel
+    from rich.text import Text
 
     model = load(model_path)
 
@@ -290,6 +432,48 @@ def evaluate_model():
     console.print(panel)
 
 
+@cli.command("model-footprint")
+def model_footprint_command():
+    """📦 Compara carga e memória do modelo joblib e do compacto"""
+    model_footprint()
+
+
+def model_footprint():
+    from rich import box
+    from rich.table import Table
+
+    from src.model.compact import measure_load
+
+    artifacts = [
+        ("joblib", "models/logreg_titanic.joblib"),
+        ("compact", "models/logreg_titanic.compact"),
+    ]
+    table = Table(title="📦 Carga do Modelo por Worker", box=box.ROUNDED)
+    table.add_column("Formato", style="cyan")
+    table.add_column("Arquivo")
+    table.add_column("Tamanho (KB)", justify="right")
+    table.add_column("Carga (ms)", justify="right")
+    table.add_column("RSS (MB)", justify="right")
+
+    for kind, path in artifacts:
+        if not Path(path).exists():
+            table.add_row(kind, path, "-", "-", "[red]não encontrado[/red]")
+            continue
+        result = measure_load(path, kind)
+        table.add_row(
+            kind,
+            path,
+            f"{result['size_kb']:.1f}",
+            f"{result['load_ms']:.1f}",
+            f"{result['rss_mb']:.1f}",
+        )
+    console.print(table)
+    console.print(
+        "[dim]RSS: pico de memória do processo acima de um interpretador vazio. "
+        "O modelo compacto é mapeado em memória e compartilhado entre workers.[/dim]"
+    )
+
+
 @cli.command()
 def insights():
     generate_insights()
@@ -307,11 +491,7 @@ def jupyter(interactive):
 
 
 def open_jupyter():
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
+    with spinner_progress() as progress:
         task = progress.add_task("📝 Abrindo Jupyter Lab...", total=None)
 
         try:
@@ -324,11 +504,20 @@ def open_jupyter():
 
 
 @cli.command()
-def api():
-    start_api()
-
-
-def start_api():
+@click.option(
+    "--engine",
+    type=click.Choice(PREPROCESS_ENGINES),
+    default=None,
+    help="Engine das features usado pela API",
+)
+def api(engine):
+    start_api(engine)
+
+
+def start_api(engine=None):
+    if engine is not None:
+        # Lido por src.processing.preprocessing nos processos da API
+        os.environ["TITANIC_PREPROCESS_ENGINE"] = engine
     console.print("\n[bold green]🚀 Iniciando a API de predição...[/bold green]")
     console.print(
         "Acesse a documentação interativa em: [cyan]http://127.0.0.1:8000/docs[/cyan]"
@@ -346,28 +535,167 @@ def start_api():
         console.print(f"\n[red]❌ Erro ao iniciar a API: {e}[/red]")
 
 
+@cli.command("bench-api")
+@click.option(
+    "--url",
+    default=None,
+    help="URL de uma API já em execução. Se omitida, sobe uma API local.",
+)
+@click.option(
+    "--concurrency",
+    default="1,2,4,8,16,32",
+    show_default=True,
+    help="Níveis de concorrência separados por vírgula",
+)
+@click.option("--duration", default=5.0, show_default=True, help="Segundos por nível")
+@click.option(
+    "--batch-size",
+    default=1,
+    show_default=True,
+    help="Passageiros por requisição (1 usa /predict, >1 usa /predict/batch)",
+)
+@click.option("--port", default=8001, show_default=True, help="Porta da API local")
+@click.option(
+    "--workers", default=1, show_default=True, help="Workers uvicorn da API local"
+)
+def bench_api_command(url, concurrency, duration, batch_size, port, workers):
+    """📈 Teste de carga da API de predição"""
+    levels = [int(level) for level in concurrency.split(",") if level.strip()]
+    bench_api(url, levels, duration, batch_size, port, workers)
+
+
+def bench_api(url, levels, duration=5.0, batch_size=1, port=8001, workers=1):
+    from rich import box
+    from rich.table import Table
+
+    from src.api.loadtest import start_local_api, sweep
+
+    api_process = None
+    try:
+        if url is None:
+            console.print(
+                f"Iniciando a API local na porta {port} ({workers} worker(s))..."
+            )
+            api_process = start_local_api(port=port, workers=workers)
+            url = f"http://127.0.0.1:{port}"
+
+        endpoint = "/predict" if batch_size == 1 else "/predict/batch"
+        console.print(
+            f"📈 Carga em [cyan]{url}{endpoint}[/cyan] por {duration:.0f}s "
+            f"em cada nível: {', '.join(map(str, levels))}"
+        )
+        with spinner_progress() as progress:
+            progress.add_task("Executando o teste de carga...", total=None)
+            results, saturation = sweep(url, levels, duration, batch_size)
+    except Exception as e:
+        console.print(f"\n[red]❌ Erro no teste de carga: {e}[/red]")
+        return
+    finally:
+        if api_process:
+            api_process.terminate()
+            api_process.wait()
+
+    table = Table(title="📈 Teste de Carga da API", box=box.ROUNDED)
+    table.add_column("Clientes", style="cyan", justify="right")
+    table.add_column("Req/s (200)", justify="right")
+    table.add_column("Passageiros/s", justify="right")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p95 (ms)", justify="right")
+    table.add_column("p99 (ms)", justify="right")
+    table.add_column("Erros", justify="right")
+    table.add_column("Erros por status", justify="right")
+    table.add_column("Erros c/ ausentes", justify="right")
+
+    for result in results:
+        marker = " ⚠️" if result["concurrency"] == saturation else ""
+        errors = f"{result['error_rate']:.1%}"
+        by_status = ", ".join(
+            f"{status}: {count}"
+            for status, count in sorted(result["errors_by_status"].items())
+        )
+        incomplete = f"{result['incomplete_error_rate']:.1%}"
+        table.add_row(
+            f"{result['concurrency']}{marker}",
+            f"{result['throughput_rps']:.1f}",
+            f"{result['passengers_per_s']:.1f}",
+            f"{result['p50_ms']:.1f}",
+            f"{result['p95_ms']:.1f}",
+            f"{result['p99_ms']:.1f}",
+            f"[red]{errors}[/red]" if result["errors"] else errors,
+            by_status or "-",
+            f"[red]{incomplete}[/red]" if result["incomplete_errors"] else incomplete,
+        )
+    console.print(table)
+    if saturation is None:
+        console.print(
+            "[dim]O throughput ainda cresce no último nível; "
+            "aumente a concorrência para encontrar a saturação.[/dim]"
+        )
+    else:
+        console.print(
+            f"[yellow]⚠️  Saturação em {saturation} clientes: acima disso a "
+            "latência cresce sem ganho de throughput.[/yellow]"
+        )
+
+
+# `version` e `info` usam apenas o click para não pagar a importação do rich
 @cli.command()
 def version():
-    console.print(
-        f"[bold blue]Titanic Insights[/bold blue] versão [green]0.1.0[/green]"
+    click.echo(
+        f"{click.style('Titanic Insights', fg='blue', bold=True)} versão "
+        f"{click.style('0.1.0', fg='green')}"
     )
 
 
 @cli.command()
 def info():
-    info_table = Table(title="ℹ️  Informações do Projeto", box=box.ROUNDED)
-    info_table.add_column("Propriedade", style="cyan")
-    info_table.add_column("Valor", style="white")
-
-    info_table.add_row("Nome", "Titanic Insights")
-    info_table.add_row("Versão", "0.1.0")
-    info_table.add_row("Autor", "Lucas")
-    info_table.add_row(
-        "Descrição", "Pipeline de ML para análise de sobrevivência no Titanic"
-    )
-    info_table.add_row("Python", "^3.11")
-
-    console.print(info_table)
+    rows = [
+        ("Nome", "Titanic Insights"),
+        ("Versão", "0.1.0"),
+        ("Autor", "Lucas"),
+        ("Descrição", "Pipeline de ML para análise de sobrevivência no Titanic"),
+        ("Python", "^3.11"),
+    ]
+    click.echo(click.style("ℹ️  Informações do Projeto", bold=True))
+    width = max(len(name) for name, _ in rows)
+    for name, value in rows:
+        click.echo(f"  {click.style(name.ljust(width), fg='cyan')}  {value}")
+
+
+@cli.command("import-budget")
+@click.option("--repeat", default=3, show_default=True, help="Medições por módulo")
+def import_budget_command(repeat):
+    """⏱️  Verifica o tempo de importação dos pontos de entrada"""
+    if not check_import_budget(repeat):
+        sys.exit(1)
+
+
+def check_import_budget(repeat=3):
+    from rich import box
+    from rich.table import Table
+
+    from titanic_insights.importtime import check
+
+    results = check(repeat=repeat)
+
+    table = Table(title="⏱️  Tempo de Importação", box=box.ROUNDED)
+    table.add_column("Ponto de entrada", style="cyan")
+    table.add_column("Medido (ms)", justify="right")
+    table.add_column("Orçamento (ms)", justify="right")
+    table.add_column("Mais pesados", style="dim")
+    table.add_column("Status")
+
+    for result in results:
+        heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in result["heaviest"][:3])
+        table.add_row(
+            result["module"],
+            f"{result['ms']:.1f}",
+            f"{result['budget_ms']:.0f}",
+            heaviest,
+            "[green]✅ OK[/green]" if result["ok"] else "[red]❌ Excedido[/red]",
+        )
+    console.print(table)
+    return all(result["ok"] for result in results)
 
 
 @cli.command("test-suite")
@@ -0,0 +1,88 @@
+"""
+Medição do tempo de importação dos pontos de entrada (`python -X importtime`).
+
+Os orçamentos, em milissegundos, ficam em `[tool.titanic-insights.import-budget]`
+no pyproject.toml, um por módulo de entrada.
+"""
+
+import subprocess
+import sys
+import tomllib
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_budgets(pyproject=PROJECT_ROOT / "pyproject.toml") -> dict:
+    """Lê os orçamentos (ms) de importação por ponto de entrada."""
+    with open(pyproject, "rb") as f:
+        config = tomllib.load(f)
+    return config.get("tool", {}).get("titanic-insights", {}).get("import-budget", {})
+
+
+def _parse(stderr: str, module: str):
+    """Extrai o tempo cumulativo do módulo e o das suas importações diretas."""
+    children = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        if depth == 0:
+            if name == module:
+                return int(cumulative), children
+            children = []
+        elif depth == 1:
+            children.append((name, int(cumulative)))
+    raise RuntimeError(f"Módulo '{module}' não encontrado na saída do importtime.")
+
+
+def measure(module: str, repeat: int = 3) -> dict:
+    """
+    Mede o tempo cumulativo de importação de um módulo em um interpretador limpo.
+
+    Parâmetros:
+    module (str): Módulo a importar, por exemplo 'titanic_insights.cli'.
+    repeat (int): Número de medições; é reportada a menor.
+
+    Retorna:
+    dict: 'ms' com o tempo cumulativo e 'heaviest' com as importações diretas
+    mais caras (nome, ms).
+    """
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        cumulative, children = _parse(result.stderr, module)
+        if best is None or cumulative < best[0]:
+            best = (cumulative, children)
+
+    cumulative, children = best
+    heaviest = sorted(children, key=lambda item: item[1], reverse=True)[:5]
+    return {
+        "ms": cumulative / 1000,
+        "heaviest": [(name, us / 1000) for name, us in heaviest],
+    }
+
+
+def check(budgets: dict | None = None, repeat: int = 3) -> list[dict]:
+    """Mede cada ponto de entrada e compara com o orçamento."""
+    budgets = load_budgets() if budgets is None else budgets
+    results = []
+    for module, budget_ms in budgets.items():
+        measured = measure(module, repeat=repeat)
+        results.append(
+            {
+                "module": module,
+                "budget_ms": float(budget_ms),
+                **measured,
+                "ok": measured["ms"] <= budget_ms,
+            }
+        )
+    return results